@@ -6,13 +6,86 @@
 - 학습 분석 및 예측
 """
 
+import bisect
+import itertools
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Sequence
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, replace
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import json
+import time
+
+from .content_catalog import DEFAULT_DIFFICULTY, ContentCatalog
+
+
+# 엔진 기본 콘텐츠 메타데이터 (엔진마다 ContentCatalog로 색인)
+# 콘텐츠별 주제
+CONTENT_TOPICS = {
+    "stats_basics": "descriptive_statistics",
+    "probability": "probability_theory",
+    "hypothesis_testing": "inferential_statistics",
+    "regression": "regression_analysis",
+    "factor_analysis": "multivariate_analysis"
+}
+
+# 콘텐츠별 예상 완료 시간 (초)
+CONTENT_EXPECTED_DURATIONS = {
+    "stats_basics": 300,  # 5분
+    "probability": 600,   # 10분
+    "hypothesis_testing": 900,  # 15분
+    "regression": 1200,   # 20분
+    "factor_analysis": 1800  # 30분
+}
+
+# 콘텐츠별 전제 콘텐츠
+CONTENT_PREREQUISITES = {
+    "probability": ["stats_basics"],
+    "hypothesis_testing": ["probability", "stats_basics"],
+    "regression": ["hypothesis_testing"],
+    "factor_analysis": ["regression"]
+}
+
+# 콘텐츠별 주된 전달 방식 (학습 스타일)
+CONTENT_LEARNING_STYLES = {
+    "stats_basics": "visual",
+    "probability": "kinesthetic",
+    "hypothesis_testing": "reading",
+    "regression": "visual",
+    "factor_analysis": "reading"
+}
+
+# 학습자 스타일별 콘텐츠 스타일 적합도 (정의되지 않은 조합은 0.5)
+LEARNING_STYLE_COMPATIBILITY = {
+    "visual": {"visual": 1.0, "kinesthetic": 0.7, "auditory": 0.5, "reading": 0.6},
+    "auditory": {"auditory": 1.0, "visual": 0.5, "reading": 0.8, "kinesthetic": 0.4},
+    "kinesthetic": {"kinesthetic": 1.0, "visual": 0.7, "auditory": 0.4, "reading": 0.3},
+    "reading": {"reading": 1.0, "auditory": 0.8, "visual": 0.6, "kinesthetic": 0.3}
+}
+
+# 학습 페이스별 예상 완료 시간 배율
+PACE_TIME_FACTORS = {"slow": 1.3, "medium": 1.0, "fast": 0.7}
+
+# 콘텐츠 숙달 판정에 필요한 최소 채점 상호작용 수
+MASTERY_MIN_GRADED = 3
+
+# 추천 최소 점수
+RECOMMENDATION_SCORE_THRESHOLD = 0.3
+
+# 추천 캐시 기본 설정
+RECOMMENDATION_CACHE_SIZE = 10_000     # 캐시에 보관할 최대 사용자 수
+RECOMMENDATION_REFRESH_INTERVAL = 300  # 일괄 갱신 주기 (초)
+REFRESH_CHUNK_USERS = 256              # 일괄 갱신 시 잠금을 잡고 한 번에 계산하는 사용자 수
+
+# 성공률과 학습 상태 판단에 쓰는 최근 상호작용 수
+SUCCESS_RATE_WINDOW = 10
+STATE_DETECTION_WINDOW = 5
+
+_NS_PER_DAY = 86_400 * 10**9
 
 
 class LearningState(Enum):
@@ -49,6 +122,36 @@ class LearningInteraction:
     confidence_level: Optional[int] = None  # 1-5
 
 
+@dataclass
+class InteractionCounts:
+    """상호작용 누적 집계"""
+    total: int = 0
+    graded: int = 0  # 성공 여부가 기록된 상호작용
+    successes: int = 0
+    
+    def add(self, success: Optional[bool]):
+        """상호작용 하나 반영"""
+        self.total += 1
+        if success is not None:
+            self.graded += 1
+            self.successes += success is True
+
+
+@dataclass
+class KnowledgeState:
+    """(사용자, 주제)별 지식 상태 (베이지안 지식 추적)"""
+    p_known: float     # 주제를 알고 있을 확률
+    last_update: int   # 마지막으로 반영한 상호작용 시각 (ns)
+
+
+@dataclass
+class DecayedSuccess:
+    """시간 감쇠 성공 집계 (last_update 시점 값, 읽을 때 경과 시간만큼 감쇠)"""
+    successes: float  # 감쇠 가중 성공 수
+    graded: float     # 감쇠 가중 채점 상호작용 수 (유효 증거량)
+    last_update: int  # 마지막으로 반영한 상호작용 시각 (ns)
+
+
 @dataclass
 class LearnerProfile:
     """학습자 프로필"""
@@ -65,9 +168,9 @@ class LearnerProfile:
     last_activity: datetime
 
 
-@dataclass
+@dataclass(frozen=True)
 class ContentRecommendation:
-    """콘텐츠 추천"""
+    """콘텐츠 추천 (캐시된 결과를 여러 호출자가 함께 받으므로 수정 불가)"""
     content_id: str
     recommendation_score: float
     reasoning: str
@@ -76,15 +179,590 @@ class ContentRecommendation:
     success_probability: float
 
 
+# 컬럼형 저장소의 상호작용 유형 코드 (int8)
+INTERACTION_TYPES = list(InteractionType)
+_INTERACTION_TYPE_CODES = {t: code for code, t in enumerate(INTERACTION_TYPES)}
+
+
+def validate_interaction(interaction: LearningInteraction) -> LearningInteraction:
+    """상호작용 필드 검증 (문자열 상호작용 유형은 InteractionType으로 바꾼 사본 반환)
+    
+    엔진에 반영하기 전에 호출자에게 바로 오류를 알려야 하는 경로(비동기 수집, 샤드 라우터)에서
+    사용한다. 잘못된 필드가 있으면 ValueError, 타입이 맞지 않으면 TypeError를 일으킨다.
+    """
+    if not isinstance(interaction, LearningInteraction):
+        raise TypeError(f"LearningInteraction이 아닙니다: {type(interaction).__name__}")
+    for name in ('user_id', 'content_id'):
+        value = getattr(interaction, name)
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"{name}은 비어 있지 않은 문자열이어야 합니다: {value!r}")
+    if not isinstance(interaction.timestamp, datetime):
+        raise TypeError(f"timestamp는 datetime이어야 합니다: {interaction.timestamp!r}")
+    
+    interaction_type = interaction.interaction_type
+    if not isinstance(interaction_type, InteractionType):
+        try:
+            interaction_type = InteractionType(interaction_type)
+        except ValueError:
+            raise ValueError(f"알 수 없는 상호작용 유형입니다: {interaction_type!r}") from None
+    
+    ranges = {
+        'duration': (0, np.iinfo(np.int32).max),
+        'difficulty_level': (1, 10),
+        'attempts': (1, np.iinfo(np.int16).max)
+    }
+    for name, (low, high) in ranges.items():
+        value = getattr(interaction, name)
+        if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, np.integer)) or not low <= value <= high:
+            raise ValueError(f"{name}은 {low}~{high} 범위의 정수여야 합니다: {value!r}")
+    if interaction.success not in (True, False, None):
+        raise ValueError(f"success는 True, False, None 중 하나여야 합니다: {interaction.success!r}")
+    if interaction.hint_used not in (True, False):
+        raise ValueError(f"hint_used는 bool이어야 합니다: {interaction.hint_used!r}")
+    confidence = interaction.confidence_level
+    if confidence is not None and (isinstance(confidence, (bool, np.bool_))
+                                   or not isinstance(confidence, (int, np.integer)) or not 1 <= confidence <= 5):
+        raise ValueError(f"confidence_level은 1~5 범위의 정수 또는 None이어야 합니다: {confidence!r}")
+    
+    if interaction_type is not interaction.interaction_type:
+        interaction = replace(interaction, interaction_type=interaction_type)
+    return interaction
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+class InteractionStore(Sequence):
+    """컬럼형 상호작용 저장소
+
+    상호작용 한 건을 numpy 배열의 한 행(약 27바이트)으로 저장한다. 사용자/콘텐츠 ID는
+    int32 코드로 인터닝하고, 시각은 epoch 기준 ns(int64), 성공 여부와 신뢰도는 -1을
+    None으로 쓰는 int8로 저장한다.
+    
+    읽기는 읽기 전용 시퀀스(len, 인덱싱, 슬라이싱, 순회, in, index, count)로 하며, 행마다
+    LearningInteraction 객체를 새로 만들어 반환한다. 추가는 append(한 건)와
+    encode/extend_columns(일괄)로만 하고, 행 수정/삭제/삽입은 지원하지 않는다. 엔진 상태에
+    반영하려면 저장소가 아니라 엔진의 track_interaction(s)를 사용한다. 분석용 전체 표는
+    to_frame(), 수치 계산은 column()을 사용한다.
+    
+    시간대 규칙: 첫 상호작용의 시각이 저장소 전체의 방식을 정한다. 시간대 없는(naive)
+    시각으로 시작한 저장소는 naive 시각만, 시간대 있는(aware) 시각으로 시작한 저장소는
+    aware 시각만 받으며, 섞어 넣으면 ValueError를 일으킨다. aware 시각은 UTC로 저장하고
+    첫 시각의 시간대로 바꿔 반환한다.
+    """
+    
+    COLUMNS = {
+        'timestamp': np.int64,
+        'user': np.int32,
+        'content': np.int32,
+        'interaction_type': np.int8,
+        'duration': np.int32,
+        'success': np.int8,
+        'difficulty_level': np.int8,
+        'hint_used': np.bool_,
+        'attempts': np.int16,
+        'confidence_level': np.int8
+    }
+    
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._arrays = {name: np.empty(capacity, dtype) for name, dtype in self.COLUMNS.items()}
+        self.user_ids: List[str] = []
+        self.content_ids: List[str] = []
+        self._user_codes: Dict[str, int] = {}
+        self._content_codes: Dict[str, int] = {}
+        self._aware: Optional[bool] = None  # 첫 시각이 정한 시간대 방식 (None: 아직 없음)
+        self._tzinfo = None  # 시간대가 있는 시각이면 반환 시 해당 시간대로 복원
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        for row in range(self._size):
+            yield self[row]
+    
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self._size))]
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError("상호작용 인덱스가 범위를 벗어났습니다.")
+        
+        a = self._arrays
+        success = a['success'][row]
+        confidence = a['confidence_level'][row]
+        return LearningInteraction(
+            user_id=self.user_ids[a['user'][row]],
+            timestamp=self.to_datetime(a['timestamp'][row]),
+            interaction_type=INTERACTION_TYPES[a['interaction_type'][row]],
+            content_id=self.content_ids[a['content'][row]],
+            duration=int(a['duration'][row]),
+            success=None if success < 0 else bool(success),
+            difficulty_level=int(a['difficulty_level'][row]),
+            hint_used=bool(a['hint_used'][row]),
+            attempts=int(a['attempts'][row]),
+            confidence_level=None if confidence < 0 else int(confidence)
+        )
+    
+    def column(self, name: str) -> np.ndarray:
+        """컬럼 배열 (저장된 행까지의 뷰, 읽기 전용으로 사용)"""
+        return self._arrays[name][:self._size]
+    
+    def user_code(self, user_id: str) -> Optional[int]:
+        """사용자 ID의 코드 (기록이 없으면 None)"""
+        return self._user_codes.get(user_id)
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], user_ids: List[str], content_ids: List[str],
+                     aware: Optional[bool] = None, tzinfo=None) -> 'InteractionStore':
+        """column() 배열, ID 목록, 시간대 방식으로 저장소 복원"""
+        store = cls(capacity=max(1, len(columns['timestamp'])))
+        store.user_ids = list(user_ids)
+        store.content_ids = list(content_ids)
+        store._user_codes = {value: code for code, value in enumerate(store.user_ids)}
+        store._content_codes = {value: code for code, value in enumerate(store.content_ids)}
+        store._aware = aware
+        store._tzinfo = tzinfo
+        store.extend_columns(columns)
+        return store
+    
+    @property
+    def aware(self) -> Optional[bool]:
+        """저장된 시각이 시간대 있는 시각인지 (기록이 없으면 None)"""
+        return self._aware
+    
+    @property
+    def tzinfo(self):
+        """aware 시각을 반환할 때 쓰는 시간대 (첫 시각의 시간대)"""
+        return self._tzinfo
+    
+    def timestamp_ns(self, timestamp: datetime) -> int:
+        """시각을 epoch 기준 ns로 변환 (aware 시각은 UTC 기준, 저장소 상태는 바꾸지 않음)"""
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return (timestamp - _EPOCH) // _ONE_MICROSECOND * 1000
+    
+    def check_timestamp(self, timestamp: datetime):
+        """저장소의 시간대 방식과 맞지 않는 시각이면 ValueError"""
+        aware = timestamp.tzinfo is not None
+        if self._aware is not None and aware != self._aware:
+            raise ValueError("시간대 있는 시각과 없는 시각을 한 저장소에 섞을 수 없습니다: "
+                             f"{timestamp.isoformat()}")
+    
+    def _adopt_timezone(self, timestamp: datetime):
+        """첫 시각의 시간대 방식을 저장소에 기록"""
+        if self._aware is None:
+            self._aware = timestamp.tzinfo is not None
+            self._tzinfo = timestamp.tzinfo
+    
+    def to_datetime(self, timestamp_ns: int) -> datetime:
+        """epoch 기준 ns를 시각으로 변환"""
+        timestamp = _EPOCH + timedelta(microseconds=int(timestamp_ns) // 1000)
+        if self._tzinfo is not None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc).astimezone(self._tzinfo)
+        return timestamp
+    
+    def append(self, interaction: LearningInteraction) -> int:
+        """상호작용 한 건 추가 후 행 번호 반환"""
+        self.check_timestamp(interaction.timestamp)
+        row = self._size
+        if row == len(self._arrays['timestamp']):
+            self._grow(row + 1)
+        
+        a = self._arrays
+        a['timestamp'][row] = self.timestamp_ns(interaction.timestamp)
+        self._adopt_timezone(interaction.timestamp)
+        a['user'][row] = self._intern(interaction.user_id, self._user_codes, self.user_ids)
+        a['content'][row] = self._intern(interaction.content_id, self._content_codes, self.content_ids)
+        a['interaction_type'][row] = _INTERACTION_TYPE_CODES[interaction.interaction_type]
+        a['duration'][row] = interaction.duration
+        a['success'][row] = -1 if interaction.success is None else int(interaction.success)
+        a['difficulty_level'][row] = interaction.difficulty_level
+        a['hint_used'][row] = interaction.hint_used
+        a['attempts'][row] = interaction.attempts
+        a['confidence_level'][row] = (
+            -1 if interaction.confidence_level is None else interaction.confidence_level
+        )
+        self._size = row + 1
+        return row
+    
+    def encode(self, frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """LearningInteraction 필드명 컬럼의 DataFrame을 저장소 컬럼 배열로 변환
+        
+        ID는 고유값 단위로 인터닝하고, 선택 컬럼(hint_used, attempts, confidence_level)이
+        없으면 LearningInteraction 기본값을 사용한다. 시각이 저장소의 시간대 방식과 맞지
+        않으면 ValueError를 일으킨다.
+        """
+        n = len(frame)
+        columns = {
+            'timestamp': self._encode_timestamps(frame['timestamp']),
+            'user': self._encode_ids(frame['user_id'], self._user_codes, self.user_ids),
+            'content': self._encode_ids(frame['content_id'], self._content_codes, self.content_ids),
+            'duration': frame['duration'].to_numpy(),
+            'difficulty_level': frame['difficulty_level'].to_numpy()
+        }
+        
+        type_codes, type_values = pd.factorize(frame['interaction_type'])
+        columns['interaction_type'] = np.array(
+            [_INTERACTION_TYPE_CODES[InteractionType(t)] for t in type_values], np.int8)[type_codes]
+        
+        columns['success'] = self._encode_optional(frame['success'], bool)
+        columns['hint_used'] = frame['hint_used'].to_numpy() if 'hint_used' in frame else np.zeros(n, bool)
+        columns['attempts'] = frame['attempts'].to_numpy() if 'attempts' in frame else np.ones(n)
+        columns['confidence_level'] = (self._encode_optional(frame['confidence_level'], int)
+                                       if 'confidence_level' in frame else np.full(n, -1))
+        return {name: np.asarray(columns[name], dtype) for name, dtype in self.COLUMNS.items()}
+    
+    def extend_columns(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """encode()로 변환한 컬럼 배열을 한 번에 추가하고 행 번호 배열 반환"""
+        start = self._size
+        end = start + len(columns['timestamp'])
+        if end > len(self._arrays['timestamp']):
+            self._grow(end)
+        for name, array in self._arrays.items():
+            array[start:end] = columns[name]
+        self._size = end
+        return np.arange(start, end)
+    
+    def _encode_timestamps(self, values: pd.Series) -> np.ndarray:
+        """시각 컬럼을 epoch 기준 ns로 변환 (시간대가 섞인 경우 건별 변환)"""
+        if not len(values):
+            return np.empty(0, np.int64)
+        first = values.iloc[0]
+        self.check_timestamp(first)
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            encoded = values.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64)
+        elif values.dtype.kind == 'M':
+            encoded = values.to_numpy('datetime64[ns]').view(np.int64)
+        else:
+            aware = first.tzinfo is not None
+            for timestamp in values:
+                if (timestamp.tzinfo is not None) != aware:
+                    raise ValueError("시간대 있는 시각과 없는 시각을 한 저장소에 섞을 수 없습니다: "
+                                     f"{timestamp.isoformat()}")
+            encoded = np.fromiter((self.timestamp_ns(t) for t in values), np.int64, len(values))
+        self._adopt_timezone(first)
+        return encoded
+    
+    def _encode_ids(self, values: pd.Series, codes: Dict[str, int], ids: List[str]) -> np.ndarray:
+        """ID 컬럼 인터닝 (고유값만 사전 조회)"""
+        value_codes, uniques = pd.factorize(values)
+        lookup = np.array([self._intern(value, codes, ids) for value in uniques], np.int32)
+        return lookup[value_codes]
+    
+    @staticmethod
+    def _encode_optional(values: pd.Series, kind: type) -> np.ndarray:
+        """None/NaN을 -1로 쓰는 선택값 컬럼 변환"""
+        array = values.to_numpy()
+        missing = pd.isna(array)
+        if not missing.any():
+            return array.astype(kind)
+        return np.where(missing, -1, np.where(missing, 0, array).astype(kind))
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # 저장된 행까지만 직렬화 (여유 용량 제외)
+        state = self.__dict__.copy()
+        state['_arrays'] = {name: self.column(name).copy() for name in self.COLUMNS}
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        if '_aware' not in state:
+            # 시간대 방식을 기록하지 않던 이전 형식
+            self._aware = (self._tzinfo is not None) if self._size else None
+    
+    def to_frame(self) -> pd.DataFrame:
+        """분석용 DataFrame (ID 컬럼은 범주형, 수치 컬럼은 저장소 배열 그대로)"""
+        a = {name: self.column(name) for name in self.COLUMNS}
+        return pd.DataFrame({
+            'user_id': pd.Categorical.from_codes(a['user'], categories=self.user_ids),
+            'timestamp': a['timestamp'].view('datetime64[ns]'),
+            'interaction_type': pd.Categorical.from_codes(
+                a['interaction_type'], categories=[t.value for t in INTERACTION_TYPES]),
+            'content_id': pd.Categorical.from_codes(a['content'], categories=self.content_ids),
+            'duration': a['duration'],
+            'success': a['success'],
+            'difficulty_level': a['difficulty_level'],
+            'hint_used': a['hint_used'],
+            'attempts': a['attempts'],
+            'confidence_level': a['confidence_level']
+        })
+    
+    def memory_usage(self) -> int:
+        """저장된 행이 차지하는 바이트 수"""
+        return sum(np.dtype(dtype).itemsize for dtype in self.COLUMNS.values()) * self._size
+    
+    def _grow(self, min_capacity: int):
+        """용량을 두 배씩 늘림"""
+        capacity = max(min_capacity, 2 * len(self._arrays['timestamp']))
+        for name, array in self._arrays.items():
+            grown = np.empty(capacity, array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+    
+    @staticmethod
+    def _intern(value: str, codes: Dict[str, int], values: List[str]) -> int:
+        """문자열 ID를 정수 코드로 변환"""
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+
+def _trace_knowledge(p_known, elapsed_days, correct, params: Dict[str, Any]):
+    """지식 상태 한 단계 갱신 (스칼라와 배열 모두 같은 식으로 계산)
+    
+    1. 망각: 마지막 관측 이후 경과 일수만큼 forgetting_factor로 초기값 쪽으로 감쇠
+    2. 관측: 실수(slip)/추측(guess) 확률로 정답 여부에 대한 사후 확률 계산
+    3. 학습: learning_rate_alpha 확률로 모르던 상태에서 아는 상태로 전이
+    
+    거듭제곱은 스칼라도 numpy로 계산해 순차/일괄 경로의 결과를 일치시킨다.
+    """
+    prior = params["initial_knowledge"]
+    slip = params["slip_probability"]
+    guess = params["guess_probability"]
+    scalar = np.ndim(correct) == 0
+    retention = np.power(params["forgetting_factor"], elapsed_days)
+    if scalar:
+        retention = float(retention)
+    retained = prior + (p_known - prior) * retention
+    if_correct = retained * (1 - slip)
+    if_wrong = retained * slip
+    if scalar:
+        if correct:
+            posterior = if_correct / (if_correct + (1 - retained) * guess)
+        else:
+            posterior = if_wrong / (if_wrong + (1 - retained) * (1 - guess))
+    else:
+        posterior = np.where(correct,
+                             if_correct / (if_correct + (1 - retained) * guess),
+                             if_wrong / (if_wrong + (1 - retained) * (1 - guess)))
+    return posterior + (1 - posterior) * params["learning_rate_alpha"]
+
+
+def _rolling_sums(values: np.ndarray, segment_starts: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """구간(segment)별 끝나는 위치 기준 최근 window개의 합과 개수
+
+    segment_starts[i]는 i가 속한 구간의 시작 위치이며, 윈도우는 구간을 넘지 않는다.
+    """
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    end = np.arange(1, len(values) + 1)
+    begin = np.maximum(segment_starts, end - window)
+    return cumulative[end] - cumulative[begin], end - begin
+
+
+def _mask_bits(masks: List[int], n_bits: int) -> np.ndarray:
+    """정수 비트셋 목록을 (len(masks), n_bits) 0/1 행렬로 펼침"""
+    n_bytes = max(1, (n_bits + 7) // 8)
+    packed = np.frombuffer(b"".join(mask.to_bytes(n_bytes, "little") for mask in masks), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(masks), n_bytes), axis=1, count=n_bits, bitorder="little")
+
+
+@dataclass
+class CachedRecommendations:
+    """캐시된 사용자별 추천 결과"""
+    recommendations: List[ContentRecommendation]
+    depth: int  # 계산 시 요청한 추천 개수 (이하 개수 요청은 이 결과로 응답)
+    catalog_token: int
+    computed_at: float
+
+
+class RecommendationCache:
+    """사용자별 추천 결과 LRU 캐시
+    
+    사용자별 버전으로 무효화를 추적한다. 계산을 시작할 때 version()을 받아 두고 put()에
+    넘기면, 계산 도중 프로필이 바뀌어 무효화된 결과는 저장되지 않는다. max_age를 주면
+    그보다 오래된 결과는 캐시 미스로 취급한다.
+    """
+    
+    def __init__(self, max_entries: int = RECOMMENDATION_CACHE_SIZE, max_age: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: 'OrderedDict[str, CachedRecommendations]' = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._generation = 0  # 전체 무효화 횟수
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._served_age_total = 0.0
+        self._served_age_max = 0.0
+        self._recompute_count = 0
+        self._recompute_users = 0
+        self._recompute_seconds = 0.0
+        self._last_recompute_seconds = 0.0
+        self.last_refresh: Optional[float] = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, user_id: str, depth: int, catalog_token: int) -> Optional[List[ContentRecommendation]]:
+        """캐시된 추천 상위 depth개 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (entry is None or entry.depth < depth or entry.catalog_token != catalog_token
+                    or (self.max_age is not None and now - entry.computed_at > self.max_age)):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            age = now - entry.computed_at
+            self._served_age_total += age
+            self._served_age_max = max(self._served_age_max, age)
+            return entry.recommendations[:depth]
+    
+    def version(self, user_id: str) -> Tuple[int, int]:
+        """사용자 추천 버전 (사용자 또는 전체가 무효화될 때마다 바뀜)"""
+        return (self._generation, self._versions.get(user_id, 0))
+    
+    def put(self, user_id: str, recommendations: List[ContentRecommendation], depth: int,
+            catalog_token: int, version: Tuple[int, int]) -> bool:
+        """추천 결과 저장 (계산 중 무효화되었으면 저장하지 않고 False)"""
+        with self._lock:
+            if self.version(user_id) != version:
+                return False
+            self._entries[user_id] = CachedRecommendations(list(recommendations), depth, catalog_token,
+                                                           time.time())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+    
+    def invalidate(self, user_id: Optional[str] = None):
+        """사용자(또는 전체) 추천 무효화"""
+        with self._lock:
+            if user_id is None:
+                self._generation += 1
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+    
+    def record_recompute(self, seconds: float, n_users: int):
+        """추천 재계산 소요 시간 기록"""
+        with self._lock:
+            self._recompute_count += 1
+            self._recompute_users += n_users
+            self._recompute_seconds += seconds
+            self._last_recompute_seconds = seconds
+    
+    def metrics(self) -> Dict[str, Any]:
+        """적중률, 결과 나이(staleness), 재계산 지연 시간"""
+        now = time.time()
+        with self._lock:
+            requests = self.hits + self.misses
+            ages = [now - entry.computed_at for entry in self._entries.values()]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "mean_served_age_seconds": self._served_age_total / self.hits if self.hits else 0.0,
+                "max_served_age_seconds": self._served_age_max,
+                "oldest_entry_age_seconds": max(ages) if ages else 0.0,
+                "recomputes": self._recompute_count,
+                "mean_recompute_seconds_per_user": (self._recompute_seconds / self._recompute_users
+                                                    if self._recompute_users else 0.0),
+                "last_recompute_seconds": self._last_recompute_seconds,
+                "seconds_since_refresh": None if self.last_refresh is None else now - self.last_refresh
+            }
+
+
 class AdaptiveLearningEngine:
     """적응형 학습 엔진"""
     
     def __init__(self):
         self.learner_profiles: Dict[str, LearnerProfile] = {}
-        self.interaction_history: List[LearningInteraction] = []
-        self.content_difficulty_map: Dict[str, int] = {}
+        self.interaction_history = InteractionStore()
         self.learning_objectives_map: Dict[str, List[str]] = {}
+        self.content_catalog = self._create_content_catalog()
         self.adaptation_parameters = self._initialize_adaptation_parameters()
+        
+        # 사용자별 최근 상호작용 행 번호 (시간 오름차순, 최대 recent_interaction_window개)
+        self._recent_capacity = self.adaptation_parameters["recent_interaction_window"]
+        self._recent_by_user: Dict[str, Deque[int]] = {}
+        self._recent_successes: Dict[str, int] = {}  # 최근 윈도우 내 성공 횟수
+        self._visible_rows: Optional[int] = None  # 일괄 추적 중 전체 로그 탐색 범위 (None이면 전체)
+        
+        # (사용자, 주제)별, (사용자, 콘텐츠)별 누적 집계
+        self._topic_counts: Dict[Tuple[str, str], InteractionCounts] = {}
+        self._content_counts: Dict[str, Dict[str, InteractionCounts]] = {}  # 사용자 -> 콘텐츠별 집계
+        self._mastered: Dict[str, int] = {}  # 사용자별 숙달한 카탈로그 콘텐츠 비트셋
+        self._mastered_basis = (self.adaptation_parameters["mastery_threshold"],  # 비트셋 계산 기준
+                                len(self.content_catalog))
+        self._knowledge: Dict[Tuple[str, str], KnowledgeState] = {}  # (사용자, 주제)별 지식 상태
+        self._decayed_success: Dict[str, Dict[str, DecayedSuccess]] = {}  # 사용자 -> 주제별 감쇠 성공 집계
+        
+        # 사용자별 추천 캐시와 주기적 일괄 갱신
+        self.recommendation_cache = RecommendationCache()
+        self.recommendation_depth = 5  # 캐시에 계산해 두는 추천 개수
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+        
+        # 상호작용 반영과 추천 계산(백그라운드 갱신 포함)이 함께 쓰는 잠금
+        self._lock = threading.RLock()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # 추천 캐시, 갱신 스레드, 잠금은 파생 상태이므로 제외
+        state = self.__dict__.copy()
+        for name in ('recommendation_cache', '_refresh_thread', '_refresh_stop', '_lock'):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self.recommendation_cache = RecommendationCache()
+        self._refresh_thread = None
+        self._refresh_stop = threading.Event()
+        if 'content_catalog' not in state:
+            self.content_catalog = self._create_content_catalog()
+        self.__dict__.pop('_user_counts', None)  # 이전 형식의 사용자별 전체 집계 (더 이상 쓰지 않음)
+        # 이전 형식의 콘텐츠 난이도 사전은 카탈로그로 옮김
+        for content_id, difficulty in self.__dict__.pop('content_difficulty_map', {}).items():
+            self.content_catalog.register(content_id, difficulty=difficulty)
+        if '_mastered' not in state:
+            self._mastered = {}
+            self._mastered_basis = None  # 처음 조회할 때 콘텐츠별 집계로 계산
+        for name, value in self._initialize_adaptation_parameters().items():
+            self.adaptation_parameters.setdefault(name, value)
+        if '_knowledge' not in state or '_decayed_success' not in state:
+            # 이전 형식으로 저장된 상태는 상호작용 기록으로 주제별 추정치 재구성
+            self._knowledge = {}
+            self._decayed_success = {}
+            self._rebuild_skill_estimates()
+    
+    def _create_content_catalog(self) -> ContentCatalog:
+        """기본 콘텐츠 메타데이터 카탈로그 생성"""
+        catalog = ContentCatalog()
+        for content_id, topic in CONTENT_TOPICS.items():
+            catalog.register(
+                content_id,
+                topic=topic,
+                expected_duration=CONTENT_EXPECTED_DURATIONS.get(content_id),
+                learning_style=CONTENT_LEARNING_STYLES.get(content_id),
+                prerequisites=CONTENT_PREREQUISITES.get(content_id, [])
+            )
+        return catalog
+    
+    def register_content(self, content_id: str, **metadata) -> int:
+        """콘텐츠 메타데이터 등록 (ContentCatalog.register 인자: difficulty, topic, prerequisites 등)
+        
+        등록하면 카탈로그 버전이 바뀌어 캐시된 추천이 모두 무효화된다.
+        """
+        with self._lock:
+            return self.content_catalog.register(content_id, **metadata)
     
     def _initialize_adaptation_parameters(self) -> Dict[str, Any]:
         """적응 매개변수 초기화"""
@@ -97,13 +775,27 @@ class AdaptiveLearningEngine:
             "time_weight": 0.2,                     # 시간 가중치
             "attempt_weight": 0.5,                  # 시도 횟수 가중치
             "recent_interaction_window": 10,        # 최근 상호작용 윈도우
-            "learning_rate_alpha": 0.1,             # 학습률
-            "forgetting_factor": 0.95               # 망각 계수
+            "learning_rate_alpha": 0.1,             # 학습률 (지식 추적의 학습 전이 확률)
+            "forgetting_factor": 0.95,              # 망각 계수 (하루당 지식 유지율)
+            "success_decay_per_day": 0.95,          # 성공 집계 감쇠 계수 (하루당 가중치 유지율)
+            "initial_knowledge": 0.3,               # 처음 보는 주제를 알고 있을 확률
+            "slip_probability": 0.1,                # 알고도 틀릴 확률
+            "guess_probability": 0.2,               # 모르고도 맞힐 확률
+            "difficulty_logit_scale": 0.3           # 선호 난이도와 한 단계 차이당 성공 로짓 차이
         }
     
     def track_interaction(self, interaction: LearningInteraction):
         """학습 상호작용 추적"""
-        self.interaction_history.append(interaction)
+        with self._lock:
+            row = self.interaction_history.append(interaction)
+            self._ingest(interaction, row)
+    
+    def _ingest(self, interaction: LearningInteraction, row: int):
+        """저장소에 추가된 상호작용 한 건을 인덱스, 집계, 프로필에 반영"""
+        scoring_state = self._scoring_state(interaction.user_id)
+        self._index_interaction(interaction, row)
+        self._count_interaction(interaction)
+        self._trace_interaction(interaction, row)
         
         # 학습자 프로필 업데이트
         if interaction.user_id in self.learner_profiles:
@@ -113,6 +805,305 @@ class AdaptiveLearningEngine:
         
         # 실시간 적응 수행
         self._perform_real_time_adaptation(interaction)
+        
+        if self._scoring_state(interaction.user_id) != scoring_state:
+            self.recommendation_cache.invalidate(interaction.user_id)
+    
+    def track_interactions_batch(self, interactions) -> Dict[str, Any]:
+        """학습 상호작용 일괄 추적
+        
+        interactions는 LearningInteraction 목록 또는 같은 필드명 컬럼을 가진 DataFrame
+        (DataFrame으로 변환 가능한 배열 포함)이다. 배치를 시각 순으로 안정 정렬해 저장소에
+        한 번에 추가한 뒤, 사용자별로 윈도우 성공률과 학습 상태를 벡터 연산으로 계산하고
+        프로필은 사용자당 한 번만 갱신한다. 결과는 정렬된 배치를 track_interaction으로
+        하나씩 추적한 것과 같다. 배치 안에 같은 시각이 있거나 기존 기록보다 늦지 않은
+        상호작용이 있는 사용자는 순차 경로로 처리한다.
+        
+        처리 건수, 사용자 수, 순차 처리 사용자 수, 소요 시간, 초당 처리 건수를 반환한다.
+        """
+        with self._lock:
+            return self._track_batch(interactions)
+    
+    def _track_batch(self, interactions) -> Dict[str, Any]:
+        """track_interactions_batch 본체 (잠금을 잡은 상태에서 호출)"""
+        started = time.perf_counter()
+        store = self.interaction_history
+        columns = store.encode(self._interaction_frame(interactions))
+        order = np.argsort(columns['timestamp'], kind='stable')
+        columns = {name: values[order] for name, values in columns.items()}
+        n_events = len(order)
+        
+        # 사용자별 묶음 (묶음 안에서는 시각 순서 유지)
+        users = columns['user']
+        timestamps = columns['timestamp']
+        by_user = np.argsort(users, kind='stable')
+        grouped_users = users[by_user]
+        grouped_timestamps = timestamps[by_user]
+        new_group = np.ones(n_events, dtype=bool)
+        new_group[1:] = grouped_users[1:] != grouped_users[:-1]
+        starts = np.flatnonzero(new_group)
+        ends = np.append(starts[1:], n_events)
+        group_of = np.cumsum(new_group) - 1
+        
+        # 배치 안의 같은 시각, 기존 기록과의 순서 역전은 순차 경로로 처리
+        sequential = np.zeros(len(starts), dtype=bool)
+        sequential[group_of[1:][~new_group[1:] & (grouped_timestamps[1:] == grouped_timestamps[:-1])]] = True
+        stored_timestamps = store.column('timestamp')
+        for group, code in enumerate(grouped_users[starts]):
+            recent = self._recent_by_user.get(store.user_ids[code])
+            if recent and stored_timestamps[recent[-1]] >= grouped_timestamps[starts[group]]:
+                sequential[group] = True
+        
+        # 벡터 경로 사용자의 기존 최근 기록 (저장소에 배치를 추가하기 전에 조회)
+        vectorized = np.flatnonzero(~sequential)
+        window = max(self._recent_capacity, self.adaptation_parameters["recent_interaction_window"],
+                     SUCCESS_RATE_WINDOW, STATE_DETECTION_WINDOW)
+        priors = [self._get_recent_rows(store.user_ids[code], window - 1)[::-1]
+                  for code in grouped_users[starts[vectorized]].tolist()]
+        
+        scoring_states = [self._scoring_state(store.user_ids[code])
+                          for code in grouped_users[starts[vectorized]].tolist()]
+        
+        rows = store.extend_columns(columns)
+        event_group = np.empty(n_events, dtype=np.intp)
+        event_group[by_user] = group_of
+        try:
+            for row in rows[sequential[event_group]].tolist():
+                self._visible_rows = row + 1  # 이후 행은 아직 추적되지 않은 상호작용
+                self._ingest(store[row], row)
+        finally:
+            self._visible_rows = None
+        
+        if len(vectorized):
+            self._ingest_groups(rows[by_user], grouped_users, starts[vectorized], ends[vectorized], priors)
+        for code, scoring_state in zip(grouped_users[starts[vectorized]].tolist(), scoring_states):
+            if self._scoring_state(store.user_ids[code]) != scoring_state:
+                self.recommendation_cache.invalidate(store.user_ids[code])
+        
+        elapsed = time.perf_counter() - started
+        return {
+            "events": n_events,
+            "users": len(starts),
+            "sequential_users": int(sequential.sum()),
+            "seconds": elapsed,
+            "events_per_second": n_events / elapsed if elapsed > 0 else float('inf')
+        }
+    
+    def _ingest_groups(self, rows: np.ndarray, users: np.ndarray, starts: np.ndarray,
+                       ends: np.ndarray, priors: List[np.ndarray]):
+        """사용자별 새 상호작용 묶음(rows[start:end], 시각 오름차순)을 한 번에 반영
+        
+        priors는 사용자별 기존 최근 기록 행(시각 오름차순)이다. 기존 기록 뒤에 새 행을
+        이어 붙인 시퀀스에서 롤링 합으로 상호작용마다의 윈도우 성공률과 학습 상태를
+        구하고, 난이도/강약점처럼 순서에 의존하는 갱신만 해당 상호작용들에 대해
+        순서대로 적용한다.
+        """
+        store = self.interaction_history
+        params = self.adaptation_parameters
+        capacity = self._recent_capacity
+        
+        # 사용자별 시퀀스 = 기존 최근 기록 + 새 행
+        user_ids, had_profile, parts, is_new, lengths = [], [], [], [], []
+        for start, end, prior in zip(starts.tolist(), ends.tolist(), priors):
+            user_id = store.user_ids[users[start]]
+            user_ids.append(user_id)
+            had_profile.append(user_id in self.learner_profiles)
+            parts.extend((prior, rows[start:end]))
+            is_new.extend((np.zeros(len(prior), dtype=bool), np.ones(end - start, dtype=bool)))
+            lengths.append(len(prior) + end - start)
+        sequence = np.concatenate(parts)
+        is_new = np.concatenate(is_new)
+        lengths = np.array(lengths)
+        sequence_ends = np.cumsum(lengths)
+        segment_starts = np.repeat(sequence_ends - lengths, lengths)
+        
+        success = store.column('success')[sequence]
+        succeeded = success == 1
+        graded = success >= 0
+        new = np.flatnonzero(is_new)
+        segment = np.repeat(np.arange(len(user_ids)), lengths)[new]
+        
+        def rolling(values, size):
+            total, count = _rolling_sums(values, segment_starts, size)
+            return total[new], count[new]
+        
+        rate_successes, rate_count = rolling(succeeded, SUCCESS_RATE_WINDOW)
+        state_successes, _ = rolling(succeeded, STATE_DETECTION_WINDOW)
+        state_graded, _ = rolling(graded, STATE_DETECTION_WINDOW)
+        state_attempts, state_count = rolling(store.column('attempts')[sequence], STATE_DETECTION_WINDOW)
+        durations, duration_count = rolling(store.column('duration')[sequence],
+                                            params["recent_interaction_window"])
+        
+        # 프로필이 있던 상태에서 들어온 상호작용 (사용자의 첫 상호작용이면 프로필 생성만)
+        first = np.ones(len(new), dtype=bool)
+        first[1:] = segment[1:] != segment[:-1]
+        existed = ~first | np.asarray(had_profile)[segment]
+        known = graded[new]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            success_rate = rate_successes / rate_count
+            state_rate = state_successes / state_graded
+            avg_attempts = state_attempts / state_count
+        
+        boredom = params["boredom_detection_threshold"]
+        struggle = params["struggle_detection_threshold"]
+        rate_adjust = np.where(existed & known,
+                               np.where(success_rate > boredom, 1, np.where(success_rate < struggle, -1, 0)), 0)
+        struggling = state_rate < struggle
+        bored = ~struggling & (state_rate > boredom) & (avg_attempts < 1.5)
+        mastered = ~struggling & ~bored & (state_rate > params["mastery_threshold"])
+        state_adjust = np.where(struggling, -1, np.where(bored, 1, 0))
+        
+        profiles = []
+        for index, user_id in enumerate(user_ids):
+            if not had_profile[index]:
+                first_row = int(rows[starts[index]])
+                self._create_initial_profile(store[first_row])
+            profiles.append(self.learner_profiles[user_id])
+        
+        # 선호 난이도: 조정이 있는 상호작용만 순서대로 적용 (1~10 범위)
+        changed = np.flatnonzero((rate_adjust != 0) | (state_adjust != 0))
+        for profile, first_adjust, second_adjust in zip(
+                [profiles[i] for i in segment[changed].tolist()],
+                rate_adjust[changed].tolist(), state_adjust[changed].tolist()):
+            for adjust in (first_adjust, second_adjust):
+                if adjust > 0:
+                    profile.preferred_difficulty = min(10, profile.preferred_difficulty + 1)
+                elif adjust < 0:
+                    profile.preferred_difficulty = max(1, profile.preferred_difficulty - 1)
+        
+        # 강약점: (사용자, 주제)별 누적 성공률 (기존 집계 포함)
+        topic_names = [self._get_content_topic(content_id) for content_id in store.content_ids]
+        topics = list(dict.fromkeys(topic_names))
+        topic_index = {topic: code for code, topic in enumerate(topics)}
+        content_topics = np.array([topic_index[topic] for topic in topic_names], dtype=np.intp)
+        event_topics = content_topics[store.column('content')[sequence[new]]]
+        keys = segment * len(topics) + event_topics
+        by_key = np.argsort(keys, kind='stable')
+        sorted_keys = keys[by_key]
+        key_start = np.ones(len(keys), dtype=bool)
+        key_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        key_offsets = np.flatnonzero(key_start)
+        key_index = np.cumsum(key_start) - 1
+        key_successes, key_total = _rolling_sums(succeeded[new][by_key], key_offsets[key_index], len(keys))
+        
+        topic_counts, pairs = [], []
+        prior_total = np.zeros(len(key_offsets), dtype=np.int64)
+        prior_successes = np.zeros(len(key_offsets), dtype=np.int64)
+        for i, key in enumerate(sorted_keys[key_offsets].tolist()):
+            pair = (user_ids[key // len(topics)], topics[key % len(topics)])
+            counts = self._topic_counts.get(pair)
+            if counts is None:
+                counts = self._topic_counts[pair] = InteractionCounts()
+            prior_total[i], prior_successes[i] = counts.total, counts.successes
+            topic_counts.append(counts)
+            pairs.append(pair)
+        topic_rate = np.empty(len(keys))
+        topic_rate[by_key] = ((prior_successes[key_index] + key_successes)
+                              / (prior_total[key_index] + key_total))
+        
+        candidates = np.flatnonzero(existed & known & ((topic_rate > 0.8) | (topic_rate < 0.4)))
+        for index, topic_code, rate in zip(segment[candidates].tolist(), event_topics[candidates].tolist(),
+                                           topic_rate[candidates].tolist()):
+            profile = profiles[index]
+            topic = topics[topic_code]
+            if rate > 0.8 and topic not in profile.strengths:
+                profile.strengths.append(topic)
+                if topic in profile.weaknesses:
+                    profile.weaknesses.remove(topic)
+            elif rate < 0.4 and topic not in profile.weaknesses:
+                profile.weaknesses.append(topic)
+                if topic in profile.strengths:
+                    profile.strengths.remove(topic)
+        
+        # 지식 추적: 채점된 상호작용을 (사용자, 주제)별 시각 순으로 반영
+        event_keys = np.empty(len(keys), dtype=np.intp)
+        event_keys[by_key] = key_index
+        traced = np.flatnonzero(known)
+        traced_timestamps = store.column('timestamp')[sequence[new[traced]]]
+        self._trace_knowledge_batch(pairs, event_keys[traced], traced_timestamps, succeeded[new][traced])
+        self._decay_success_batch(pairs, event_keys[traced], traced_timestamps, succeeded[new][traced])
+        
+        # 누적 집계 갱신
+        graded_new = known.astype(np.int64)
+        succeeded_new = succeeded[new].astype(np.int64)
+        for counts, total, graded_count, successes in zip(
+                topic_counts, np.diff(np.append(key_offsets, len(keys))).tolist(),
+                np.add.reduceat(graded_new[by_key], key_offsets).tolist(),
+                np.add.reduceat(succeeded_new[by_key], key_offsets).tolist()):
+            counts.total += total
+            counts.graded += graded_count
+            counts.successes += successes
+        
+        content_codes = store.column('content')[sequence[new]]
+        content_keys, key_events = np.unique(segment * len(store.content_ids) + content_codes,
+                                             return_inverse=True)
+        for key, total, graded_count, successes in zip(
+                content_keys.tolist(), np.bincount(key_events).tolist(),
+                np.bincount(key_events, weights=graded_new).astype(np.int64).tolist(),
+                np.bincount(key_events, weights=succeeded_new).astype(np.int64).tolist()):
+            content_counts = self._content_counts.setdefault(user_ids[key // len(store.content_ids)], {})
+            content_id = store.content_ids[key % len(store.content_ids)]
+            counts = content_counts.get(content_id)
+            if counts is None:
+                counts = content_counts[content_id] = InteractionCounts()
+            counts.total += total
+            counts.graded += graded_count
+            counts.successes += successes
+            self._update_mastered(user_ids[key // len(store.content_ids)], content_id, counts)
+        
+        segment_offsets = np.flatnonzero(first)
+        segment_ends = np.append(segment_offsets[1:], len(new))
+        last = segment_ends - 1
+        any_struggling = np.logical_or.reduceat(struggling, segment_offsets)
+        any_bored = np.logical_or.reduceat(bored, segment_offsets)
+        any_mastered = np.logical_or.reduceat(mastered, segment_offsets)
+        all_success = store.column('success')
+        
+        for index, user_id in enumerate(user_ids):
+            profile = profiles[index]
+            
+            # 학습 상태 플래그
+            if any_struggling[index]:
+                profile.needs_support = True
+            if any_bored[index]:
+                profile.needs_challenge = True
+            if any_mastered[index]:
+                profile.ready_for_next_level = True
+            
+            # 마지막 상호작용 기준 활동 시각과 학습 페이스
+            last_event = last[index]
+            last_row = int(sequence[new[last_event]])
+            if existed[last_event]:
+                profile.last_activity = store.to_datetime(store.column('timestamp')[last_row])
+                expected_duration = self._get_expected_duration(
+                    store.content_ids[store.column('content')[last_row]])
+                avg_duration = durations[last_event] / duration_count[last_event]
+                pace_ratio = avg_duration / expected_duration if expected_duration > 0 else 1.0
+                if pace_ratio > 1.3:
+                    profile.learning_pace = "slow"
+                elif pace_ratio < 0.7:
+                    profile.learning_pace = "fast"
+                else:
+                    profile.learning_pace = "medium"
+            
+            # 최근 상호작용 인덱스
+            recent_rows = sequence[max(sequence_ends[index] - lengths[index],
+                                       sequence_ends[index] - capacity):sequence_ends[index]]
+            self._recent_by_user[user_id] = deque(recent_rows.tolist(), maxlen=capacity)
+            self._recent_successes[user_id] = int(np.count_nonzero(all_success[recent_rows] == 1))
+    
+    @staticmethod
+    def _interaction_frame(interactions) -> pd.DataFrame:
+        """일괄 추적 입력을 LearningInteraction 필드명 컬럼의 DataFrame으로 변환"""
+        if isinstance(interactions, pd.DataFrame):
+            return interactions
+        if isinstance(interactions, np.ndarray):
+            return pd.DataFrame(interactions)  # 구조화 배열
+        interactions = list(interactions)
+        if interactions and isinstance(interactions[0], dict):
+            return pd.DataFrame(interactions)
+        return pd.DataFrame({name: [getattr(interaction, name) for interaction in interactions]
+                             for name in LearningInteraction.__dataclass_fields__})
     
     def _update_learner_profile(self, interaction: LearningInteraction):
         """학습자 프로필 업데이트"""
@@ -147,11 +1138,11 @@ class AdaptiveLearningEngine:
     
     def _update_learning_pace(self, profile: LearnerProfile, interaction: LearningInteraction):
         """학습 페이스 업데이트"""
-        recent_interactions = self._get_recent_interactions(
+        recent_rows = self._get_recent_rows(
             interaction.user_id, self.adaptation_parameters["recent_interaction_window"]
         )
         
-        avg_duration = np.mean([i.duration for i in recent_interactions])
+        avg_duration = np.mean(self.interaction_history.column('duration')[recent_rows])
         expected_duration = self._get_expected_duration(interaction.content_id)
         
         pace_ratio = avg_duration / expected_duration if expected_duration > 0 else 1.0
@@ -208,14 +1199,16 @@ class AdaptiveLearningEngine:
     
     def _detect_learning_state(self, user_id: str) -> LearningState:
         """학습 상태 감지"""
-        recent_interactions = self._get_recent_interactions(user_id, 5)
+        recent_rows = self._get_recent_rows(user_id, STATE_DETECTION_WINDOW)
         
-        if not recent_interactions:
+        if len(recent_rows) == 0:
             return LearningState.PROGRESSING
         
-        success_rate = np.mean([i.success for i in recent_interactions if i.success is not None])
-        avg_attempts = np.mean([i.attempts for i in recent_interactions])
-        hint_usage_rate = np.mean([i.hint_used for i in recent_interactions])
+        store = self.interaction_history
+        success = store.column('success')[recent_rows]
+        success_rate = np.mean(success[success >= 0] == 1)
+        avg_attempts = np.mean(store.column('attempts')[recent_rows])
+        hint_usage_rate = np.mean(store.column('hint_used')[recent_rows])
         
         # 학습 상태 판단 로직
         if success_rate < self.adaptation_parameters["struggle_detection_threshold"]:
@@ -265,102 +1258,209 @@ class AdaptiveLearningEngine:
         if user_id not in self.learner_profiles:
             return []
         
-        profile = self.learner_profiles[user_id]
+        catalog_token = self._catalog_token()
+        cached = self.recommendation_cache.get(user_id, num_recommendations, catalog_token)
+        if cached is not None:
+            return cached
         
-        # 사용 가능한 모든 콘텐츠 가져오기
-        available_content = self._get_available_content(user_id)
+        with self._lock:
+            version = self.recommendation_cache.version(user_id)
+            depth = max(num_recommendations, self.recommendation_depth)
+            started = time.perf_counter()
+            recommendations = self.generate_recommendations_batch([user_id], depth)[user_id]
+            self.recommendation_cache.record_recompute(time.perf_counter() - started, 1)
+            self.recommendation_cache.put(user_id, recommendations, depth, catalog_token, version)
+        return recommendations[:num_recommendations]
+    
+    def refresh_recommendations(self, user_ids: Optional[List[str]] = None) -> int:
+        """추천 캐시 일괄 갱신 (기본값: 최근 활동 순으로 캐시 크기만큼의 사용자)
         
-        # 각 콘텐츠에 대한 추천 점수 계산
-        recommendations = []
-        for content_id in available_content:
-            score = self._calculate_recommendation_score(user_id, content_id)
-            
-            if score > 0.3:  # 최소 임계값
-                recommendation = ContentRecommendation(
-                    content_id=content_id,
-                    recommendation_score=score,
-                    reasoning=self._generate_recommendation_reasoning(user_id, content_id),
-                    difficulty_adjustment=self._calculate_difficulty_adjustment(user_id, content_id),
-                    estimated_time=self._estimate_completion_time(user_id, content_id),
-                    success_probability=self._predict_success_probability(user_id, content_id)
+        갱신한 사용자 수를 반환한다. 상호작용 반영과 같은 잠금을 잡고 REFRESH_CHUNK_USERS명씩
+        계산하므로, 갱신 도중에도 반영이 오래 막히지 않고 계산 중에는 상태가 바뀌지 않는다.
+        """
+        cache = self.recommendation_cache
+        if user_ids is None:
+            with self._lock:
+                profiles = sorted(self.learner_profiles.values(),
+                                  key=lambda profile: profile.last_activity, reverse=True)
+            # 가장 최근 활동한 사용자가 LRU 순서상 마지막이 되도록 역순으로 저장
+            user_ids = [profile.user_id for profile in profiles[:cache.max_entries]][::-1]
+        
+        refreshed = 0
+        for start in range(0, len(user_ids), REFRESH_CHUNK_USERS):
+            chunk = user_ids[start:start + REFRESH_CHUNK_USERS]
+            with self._lock:
+                catalog_token = self._catalog_token()
+                versions = [cache.version(user_id) for user_id in chunk]
+                started = time.perf_counter()
+                recommendations = self.generate_recommendations_batch(chunk, self.recommendation_depth)
+                cache.record_recompute(time.perf_counter() - started, len(recommendations))
+                refreshed += sum(
+                    cache.put(user_id, recommendations[user_id], self.recommendation_depth, catalog_token, version)
+                    for user_id, version in zip(chunk, versions) if user_id in recommendations
                 )
-                recommendations.append(recommendation)
+        cache.last_refresh = time.time()
+        return refreshed
+    
+    def start_recommendation_refresh(self, interval: float = RECOMMENDATION_REFRESH_INTERVAL):
+        """백그라운드 스레드에서 interval초마다 추천 캐시 일괄 갱신"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
         
-        # 추천 점수 순으로 정렬
-        recommendations.sort(key=lambda x: x.recommendation_score, reverse=True)
+        def run():
+            while True:
+                self.refresh_recommendations()
+                if self._refresh_stop.wait(interval):
+                    break
         
-        return recommendations[:num_recommendations]
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(target=run, name="recommendation-refresh", daemon=True)
+        self._refresh_thread.start()
     
-    def _calculate_recommendation_score(self, user_id: str, content_id: str) -> float:
-        """추천 점수 계산"""
-        profile = self.learner_profiles[user_id]
+    def stop_recommendation_refresh(self):
+        """추천 캐시 일괄 갱신 중지"""
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+    
+    def get_recommendation_cache_metrics(self) -> Dict[str, Any]:
+        """추천 캐시 지표 (적중률, 결과 나이, 재계산 지연 시간)"""
+        return self.recommendation_cache.metrics()
+    
+    def generate_recommendations_batch(self, user_ids: Optional[List[str]] = None,
+                                       num_recommendations: int = 5) -> Dict[str, List[ContentRecommendation]]:
+        """여러 사용자의 콘텐츠 추천을 한 번에 생성 (기본값: 전체 사용자)
         
-        # 기본 점수 요소들
-        difficulty_match = self._calculate_difficulty_match(profile, content_id)
-        prerequisite_readiness = self._check_prerequisite_readiness(user_id, content_id)
-        learning_style_match = self._calculate_learning_style_match(profile, content_id)
-        topic_interest = self._calculate_topic_interest(profile, content_id)
+        점수 행렬에서 사용자별 상위 k개를 argpartition으로 고르고, 추천 근거와 예상 시간 등
+        설명 항목은 선택된 콘텐츠에 대해서만 계산한다. 같은 점수는 카탈로그 순서를 따른다.
+        """
+        with self._lock:
+            return self._recommend_batch(user_ids, num_recommendations)
+    
+    def _recommend_batch(self, user_ids: Optional[List[str]],
+                         num_recommendations: int) -> Dict[str, List[ContentRecommendation]]:
+        """generate_recommendations_batch 본체 (잠금을 잡은 상태에서 호출)"""
+        if user_ids is None:
+            user_ids = list(self.learner_profiles)
+        user_ids = [user_id for user_id in user_ids if user_id in self.learner_profiles]
+        recommendations = {user_id: [] for user_id in user_ids}
         
-        # 가중 평균으로 최종 점수 계산
-        score = (
-            0.3 * difficulty_match +
-            0.3 * prerequisite_readiness +
-            0.2 * learning_style_match +
-            0.2 * topic_interest
-        )
+        scores = self.score_content_matrix(user_ids)
+        content_ids = scores["content_ids"]
+        k = min(num_recommendations, len(content_ids))
+        if not user_ids or k <= 0:
+            return recommendations
         
-        return max(0.0, min(1.0, score))
-    
-    def _calculate_difficulty_match(self, profile: LearnerProfile, content_id: str) -> float:
-        """난이도 일치도 계산"""
-        content_difficulty = self.content_difficulty_map.get(content_id, 5)
-        difficulty_diff = abs(profile.preferred_difficulty - content_difficulty)
+        # 숙달한 콘텐츠와 최소 점수 이하는 제외
+        ranked = np.where(~scores["mastered"] & (scores["score"] > RECOMMENDATION_SCORE_THRESHOLD),
+                          scores["score"], -np.inf)
         
-        # 차이가 클수록 점수 감소
-        return max(0.0, 1.0 - (difficulty_diff / 10.0))
-    
-    def _check_prerequisite_readiness(self, user_id: str, content_id: str) -> float:
-        """전제조건 준비도 확인"""
-        prerequisites = self._get_content_prerequisites(content_id)
+        # k번째 점수를 argpartition으로 구하고, 그보다 높은 콘텐츠 + 동점은 카탈로그 순서로 채움
+        kth = np.take_along_axis(ranked, np.argpartition(-ranked, k - 1, axis=1)[:, k - 1:k], axis=1)
+        above = ranked > kth
+        tied = ranked == kth
+        selected = above | (tied & (np.cumsum(tied, axis=1) <= k - above.sum(axis=1, keepdims=True)))
+        winners = np.nonzero(selected)[1].reshape(len(user_ids), k)
+        order = np.argsort(-np.take_along_axis(ranked, winners, axis=1), axis=1, kind='stable')
+        winners = np.take_along_axis(winners, order, axis=1)
         
-        if not prerequisites:
-            return 1.0
+        success_probability = self.predict_success_batch(
+            np.repeat(np.array(user_ids, dtype=object), k).tolist(),
+            [content_ids[j] for j in winners.ravel().tolist()]).reshape(len(user_ids), k)
         
-        mastered_prerequisites = [
-            prereq for prereq in prerequisites
-            if self._is_content_mastered(user_id, prereq)
-        ]
+        for i, user_id in enumerate(user_ids):
+            for rank, j in enumerate(winners[i].tolist()):
+                if ranked[i, j] == -np.inf:
+                    break
+                content_id = content_ids[j]
+                difficulty_match = float(scores["difficulty_match"][i, j])
+                prerequisite_readiness = float(scores["prerequisite_readiness"][i, j])
+                recommendations[user_id].append(ContentRecommendation(
+                    content_id=content_id,
+                    recommendation_score=float(ranked[i, j]),
+                    reasoning=self._describe_recommendation(
+                        difficulty_match, prerequisite_readiness,
+                        float(scores["style_match"][i, j]), float(scores["topic_interest"][i, j])),
+                    difficulty_adjustment=self._calculate_difficulty_adjustment(user_id, content_id),
+                    estimated_time=self._estimate_completion_time(user_id, content_id),
+                    success_probability=float(success_probability[i, rank])
+                ))
         
-        return len(mastered_prerequisites) / len(prerequisites)
+        return recommendations
     
-    def _calculate_learning_style_match(self, profile: LearnerProfile, content_id: str) -> float:
-        """학습 스타일 일치도 계산"""
-        content_style = self._get_content_learning_style(content_id)
+    def score_content_matrix(self, user_ids: List[str],
+                             content_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """사용자 x 콘텐츠 추천 점수 행렬
         
-        style_compatibility = {
-            "visual": {"visual": 1.0, "kinesthetic": 0.7, "auditory": 0.5, "reading": 0.6},
-            "auditory": {"auditory": 1.0, "visual": 0.5, "reading": 0.8, "kinesthetic": 0.4},
-            "kinesthetic": {"kinesthetic": 1.0, "visual": 0.7, "auditory": 0.4, "reading": 0.3},
-            "reading": {"reading": 1.0, "auditory": 0.8, "visual": 0.6, "kinesthetic": 0.3}
-        }
+        난이도 일치도, 전제조건 준비도, 학습 스타일 일치도, 주제 관심도와 가중합 점수를
+        (사용자 수, 콘텐츠 수) 배열로 반환한다. 점수는 난이도 일치도와 전제조건 준비도 각 0.3,
+        스타일 일치도와 주제 관심도 각 0.2의 가중합이며, 'mastered'는 콘텐츠 숙달 여부이다.
+        """
+        catalog = self.content_catalog
+        content_ids = self._get_content_catalog() if content_ids is None else list(content_ids)
+        profiles = [self.learner_profiles[user_id] for user_id in user_ids]
+        n_users, n_content = len(profiles), len(content_ids)
         
-        return style_compatibility.get(profile.learning_style, {}).get(content_style, 0.5)
-    
-    def _calculate_topic_interest(self, profile: LearnerProfile, content_id: str) -> float:
-        """주제 관심도 계산"""
-        content_topic = self._get_content_topic(content_id)
-        
-        # 강점 영역에 대한 관심도 높음
-        if content_topic in profile.strengths:
-            return 0.8
-        # 약점 영역이지만 목표에 포함된 경우
-        elif content_topic in profile.weaknesses and content_topic in profile.goals:
-            return 0.9
-        # 목표에 포함된 경우
-        elif content_topic in profile.goals:
-            return 0.7
-        else:
-            return 0.5
+        # 카탈로그 번호 (등록되지 않은 콘텐츠는 -1)
+        indices = self._catalog_indices(content_ids)
+        known = indices >= 0
+        
+        # 난이도 일치도
+        preferred = np.array([profile.preferred_difficulty for profile in profiles], dtype=np.int64)
+        difficulty = self._content_difficulties(indices)
+        difficulty_match = np.maximum(0.0, 1.0 - np.abs(preferred[:, None] - difficulty) / 10.0)
+        
+        # 전제조건 준비도
+        prerequisite_readiness, mastered_bits = self._prerequisite_readiness(user_ids, content_ids)
+        
+        # 콘텐츠 숙달 여부 (카탈로그 밖의 콘텐츠는 집계로 확인)
+        mastered = np.zeros((n_users, n_content), dtype=bool)
+        mastered[:, known] = mastered_bits[:, indices[known]].astype(bool)
+        for j in np.flatnonzero(~known).tolist():
+            mastered[:, j] = [self._is_content_mastered(user_id, content_ids[j]) for user_id in user_ids]
+        
+        # 학습 스타일 일치도 (정의되지 않은 스타일은 마지막 행/열 = 0.5)
+        styles = {style: code for code, style in enumerate(LEARNING_STYLE_COMPATIBILITY)}
+        compatibility = np.full((len(styles) + 1, len(styles) + 1), 0.5)
+        for style, row in LEARNING_STYLE_COMPATIBILITY.items():
+            for content_style, value in row.items():
+                compatibility[styles[style], styles[content_style]] = value
+        user_styles = [styles.get(profile.learning_style, len(styles)) for profile in profiles]
+        content_styles = [styles.get(self._get_content_learning_style(content_id), len(styles))
+                          for content_id in content_ids]
+        style_match = compatibility[np.ix_(user_styles, content_styles)]
+        
+        # 주제 관심도 (강점 > 목표인 약점 > 목표 > 기본 순으로 적용)
+        content_topics = [self._get_content_topic(content_id) for content_id in content_ids]
+        topics = {topic: code for code, topic in enumerate(dict.fromkeys(content_topics))}
+        interest = np.full((n_users, len(topics)), 0.5)
+        for i, profile in enumerate(profiles):
+            for topic in profile.goals:
+                if topic in topics:
+                    interest[i, topics[topic]] = 0.9 if topic in profile.weaknesses else 0.7
+            for topic in profile.strengths:
+                if topic in topics:
+                    interest[i, topics[topic]] = 0.8
+        topic_interest = interest[:, [topics[topic] for topic in content_topics]]
+        
+        score = np.clip(
+            0.3 * difficulty_match +
+            0.3 * prerequisite_readiness +
+            0.2 * style_match +
+            0.2 * topic_interest,
+            0.0, 1.0
+        )
+        
+        return {
+            "content_ids": content_ids,
+            "score": score,
+            "difficulty_match": difficulty_match,
+            "prerequisite_readiness": prerequisite_readiness,
+            "style_match": style_match,
+            "topic_interest": topic_interest,
+            "mastered": mastered
+        }
     
     def predict_learning_outcome(self, user_id: str, content_id: str) -> Dict[str, Any]:
         """학습 결과 예측"""
@@ -389,30 +1489,197 @@ class AdaptiveLearningEngine:
             "confidence_interval": self._calculate_prediction_confidence(user_id, content_id)
         }
     
+    def predict_success_batch(self, user_ids: List[str], content_ids: List[str],
+                              as_of: Optional[datetime] = None) -> np.ndarray:
+        """(사용자, 콘텐츠) 쌍별 성공 확률 (user_ids[i], content_ids[i] 쌍마다 하나)
+        
+        주제 지식 상태 p에 콘텐츠별 항목을 더해 한 번에 계산한다.
+        
+        1. 난이도: 콘텐츠 난이도가 학습자의 선호 난이도보다 한 단계 높을 때마다 p의 로짓을
+           difficulty_logit_scale만큼 낮춤 (IRT/Elo 방식, 같은 난이도면 p 그대로)
+        2. 전제조건: 직접 전제조건 중 숙달한 비율 r만큼만 아는 것으로 보고
+           P(성공) = guess + r * p' * (1 - slip - guess)
+           (r = 1이면 p'(1 - slip) + (1 - p')guess, 전제조건을 하나도 모르면 guess)
+        
+        as_of를 주면 마지막 학습 이후 그 시점까지의 망각을 반영한다.
+        """
+        params = self.adaptation_parameters
+        slip, guess = params["slip_probability"], params["guess_probability"]
+        p_known = np.clip(self._knowledge_levels(user_ids, content_ids, as_of), 1e-9, 1 - 1e-9)
+        
+        # 고유 사용자/콘텐츠 단위로 계산한 뒤 쌍으로 펼침
+        user_codes, unique_users = pd.factorize(pd.Series(user_ids, dtype=object))
+        content_codes, unique_contents = pd.factorize(pd.Series(content_ids, dtype=object))
+        unique_users, unique_contents = unique_users.tolist(), unique_contents.tolist()
+        
+        profiles = [self.learner_profiles.get(user_id) for user_id in unique_users]
+        preferred = np.array([DEFAULT_DIFFICULTY if profile is None else profile.preferred_difficulty
+                              for profile in profiles], dtype=np.float64)
+        difficulty = self._content_difficulties(self._catalog_indices(unique_contents))
+        offset = params["difficulty_logit_scale"] * (difficulty[content_codes] - preferred[user_codes])
+        p_item = 1.0 / (1.0 + np.exp(offset - np.log(p_known / (1 - p_known))))
+        
+        readiness, _ = self._prerequisite_readiness(unique_users, unique_contents)
+        return guess + readiness[user_codes, content_codes] * p_item * (1 - slip - guess)
+    
+    def _catalog_indices(self, content_ids: List[str]) -> np.ndarray:
+        """콘텐츠별 카탈로그 번호 (등록되지 않은 콘텐츠는 -1)"""
+        return np.array([-1 if index is None else index
+                         for index in map(self.content_catalog.index, content_ids)], dtype=np.intp)
+    
+    def _content_difficulties(self, indices: np.ndarray) -> np.ndarray:
+        """카탈로그 번호별 난이도 (카탈로그 난이도 배열, 등록되지 않은 난이도는 기본값)"""
+        difficulty = np.full(len(indices), DEFAULT_DIFFICULTY, dtype=np.int64)
+        known = indices >= 0
+        if known.any():
+            registered = np.frombuffer(self.content_catalog.difficulties, dtype=np.int8)[indices[known]]
+            difficulty[known] = np.where(registered > 0, registered, DEFAULT_DIFFICULTY)
+        return difficulty
+    
+    def _prerequisite_readiness(self, user_ids: List[str],
+                                content_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(사용자 수, 콘텐츠 수) 직접 전제조건 준비도와 사용자별 숙달 비트 행렬
+        
+        준비도 = (숙달 비트 @ 전제조건 비트) / 전제조건 수 (전제조건이 없으면 1.0)
+        """
+        catalog = self.content_catalog
+        n_bits = len(catalog)
+        mastered_bits = _mask_bits([self._mastered_mask(user_id) for user_id in user_ids], n_bits)
+        requires = _mask_bits([catalog.prerequisite_mask(content_id) for content_id in content_ids], n_bits)
+        n_prerequisites = requires.sum(axis=1, dtype=np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            readiness = np.where(
+                n_prerequisites > 0,
+                (mastered_bits.astype(np.float64) @ requires.T.astype(np.float64)) / n_prerequisites, 1.0)
+        return readiness, mastered_bits
+    
+    def _knowledge_levels(self, user_ids: List[str], content_ids: List[str],
+                          as_of: Optional[datetime] = None) -> np.ndarray:
+        """(사용자, 콘텐츠) 쌍별 콘텐츠 주제의 지식 상태 (기록이 없으면 초기값)"""
+        topics = {content_id: self._get_content_topic(content_id) for content_id in set(content_ids)}
+        initial = self.adaptation_parameters["initial_knowledge"]
+        prior = KnowledgeState(initial, 0)
+        knowledge = self._knowledge
+        states = [knowledge.get((user_id, topics[content_id]), prior)
+                  for user_id, content_id in zip(user_ids, content_ids)]
+        p_known = np.fromiter((state.p_known for state in states), dtype=np.float64, count=len(states))
+        if as_of is None:
+            return p_known
+        
+        # 읽는 시점까지의 망각 (초기값 쪽으로 감쇠)
+        last_update = np.fromiter((state.last_update for state in states), dtype=np.int64, count=len(states))
+        elapsed_days = np.maximum(0, self._as_of_ns(as_of) - last_update) / _NS_PER_DAY
+        retention = np.where(last_update > 0,
+                             np.power(self.adaptation_parameters["forgetting_factor"], elapsed_days), 1.0)
+        return initial + (p_known - initial) * retention
+    
+    def get_skill_estimates(self, user_id: str, as_of: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """주제별 최근성 반영 추정치 (as_of 시점 기준, 기본값: 현재 시각)
+        
+        주제마다 감쇠 성공률, 유효 증거량(감쇠 가중 채점 수), 숙련도(망각을 반영한 지식 상태),
+        마지막 학습 이후 경과 일수를 반환한다. 성공 집계와 증거량은 success_decay_per_day로,
+        숙련도는 forgetting_factor로 감쇠한다. 저장된 (값, 마지막 시각) 쌍을 읽을 때만
+        감쇠하므로 학습 기록 길이와 무관하게 주제 수에 비례하는 비용으로 계산된다.
+        """
+        now = self._as_of_ns(as_of)
+        forgetting_factor = self.adaptation_parameters["forgetting_factor"]
+        success_decay = self.adaptation_parameters["success_decay_per_day"]
+        initial = self.adaptation_parameters["initial_knowledge"]
+        
+        estimates = {}
+        for topic, stats in self._decayed_success.get(user_id, {}).items():
+            elapsed_days = max(0, now - stats.last_update) / _NS_PER_DAY
+            retention = float(np.power(success_decay, elapsed_days))
+            state = self._knowledge.get((user_id, topic))
+            proficiency = initial if state is None else initial + (state.p_known - initial) * float(
+                np.power(forgetting_factor, max(0, now - state.last_update) / _NS_PER_DAY))
+            estimates[topic] = {
+                "success_rate": stats.successes / stats.graded if stats.graded > 0 else 0.5,
+                "evidence": stats.graded * retention,
+                "proficiency": proficiency,
+                "days_since_practice": elapsed_days
+            }
+        return estimates
+    
+    def _as_of_ns(self, as_of: Optional[datetime]) -> int:
+        """추정 기준 시각 (ns, 기본값: 현재 시각)
+        
+        저장소의 시간대 방식을 따른다. 시간대 없는 시각은 로컬 시각으로 보므로, 시간대 없는
+        저장소에는 aware as_of를 로컬 시각으로 바꾸고 aware 저장소에는 naive as_of를 로컬
+        시간대로 해석해 비교한다.
+        """
+        aware = bool(self.interaction_history.aware)
+        if as_of is None:
+            as_of = datetime.now(timezone.utc) if aware else datetime.now()
+        elif aware and as_of.tzinfo is None:
+            as_of = as_of.astimezone()
+        elif not aware and as_of.tzinfo is not None:
+            as_of = as_of.astimezone().replace(tzinfo=None)
+        return self.interaction_history.timestamp_ns(as_of)
+    
     def _predict_success_probability(self, user_id: str, content_id: str) -> float:
-        """성공 확률 예측"""
-        profile = self.learner_profiles[user_id]
+        """성공 확률 예측 (주제 지식 상태, 콘텐츠 난이도, 전제조건 준비도 기반)"""
+        return float(self.predict_success_batch([user_id], [content_id])[0])
+    
+    def _predict_help_requirement(self, user_id: str, content_id: str) -> str:
+        """필요한 도움 수준 예측 (high, medium, low)"""
+        success_probability = self._predict_success_probability(user_id, content_id)
         
-        # 특성 기반 예측
-        difficulty_factor = self._calculate_difficulty_match(profile, content_id)
-        prerequisite_factor = self._check_prerequisite_readiness(user_id, content_id)
+        if success_probability < 0.4:
+            return "high"
+        elif success_probability < 0.7:
+            return "medium"
+        else:
+            return "low"
+    
+    def _predict_learning_gain(self, user_id: str, content_id: str) -> float:
+        """학습 효과 예측 (성공 확률 x 해당 주제의 미숙달 정도)"""
+        p_known = float(self._knowledge_levels([user_id], [content_id])[0])
         
-        # 과거 성과 기반 예측
-        historical_performance = self._get_historical_performance(user_id)
+        return self._predict_success_probability(user_id, content_id) * (1.0 - p_known)
+    
+    def _calculate_prediction_confidence(self, user_id: str, content_id: str) -> Tuple[float, float]:
+        """성공 확률의 95% 신뢰구간 (콘텐츠 주제의 감쇠 가중 채점 수 기준)"""
+        success_probability = self._predict_success_probability(user_id, content_id)
+        stats = self._decayed_success.get(user_id, {}).get(self._get_content_topic(content_id))
         
-        # 주제별 성과 기반 예측
-        topic = self._get_content_topic(content_id)
-        topic_performance = self._calculate_topic_success_rate(user_id, topic)
+        if stats is None or stats.graded <= 0:
+            return (0.0, 1.0)
         
-        # 종합 예측
-        prediction = (
-            0.3 * difficulty_factor +
-            0.3 * prerequisite_factor +
-            0.2 * historical_performance +
-            0.2 * topic_performance
-        )
+        margin = 1.96 * float(np.sqrt(success_probability * (1 - success_probability) / stats.graded))
+        return (max(0.0, success_probability - margin), min(1.0, success_probability + margin))
+    
+    def _describe_recommendation(self, difficulty_match: float, prerequisite_readiness: float,
+                                 style_match: float, topic_interest: float) -> str:
+        """점수 요소별 추천 근거 문장"""
+        reasons = []
+        if difficulty_match >= 0.8:
+            reasons.append("선호 난이도에 잘 맞습니다")
+        if prerequisite_readiness >= 1.0:
+            reasons.append("전제 학습을 모두 마쳤습니다")
+        elif prerequisite_readiness < 0.5:
+            reasons.append("전제 학습을 함께 복습하면 좋습니다")
+        if style_match >= 0.8:
+            reasons.append("학습 스타일에 적합한 형식입니다")
+        if topic_interest >= 0.8:
+            reasons.append("강점이나 목표와 관련된 주제입니다")
+        
+        if not reasons:
+            return "현재 학습 수준에 적합한 콘텐츠입니다."
+        return ". ".join(reasons) + "."
+    
+    def _calculate_difficulty_adjustment(self, user_id: str, content_id: str) -> int:
+        """콘텐츠 난이도 조정 폭 (선호 난이도 방향으로 최대 ±2)"""
+        profile = self.learner_profiles[user_id]
+        content_difficulty = self.content_catalog.difficulty(content_id)
+        
+        return max(-2, min(2, profile.preferred_difficulty - content_difficulty))
+    
+    def _estimate_completion_time(self, user_id: str, content_id: str) -> int:
+        """예상 완료 시간 (초, 학습 페이스 반영)"""
+        pace = self.learner_profiles[user_id].learning_pace
         
-        return max(0.0, min(1.0, prediction))
+        return int(round(self._get_expected_duration(content_id) * PACE_TIME_FACTORS.get(pace, 1.0)))
     
     def generate_adaptive_feedback(self, user_id: str, 
                                  interaction: LearningInteraction) -> Dict[str, Any]:
@@ -477,58 +1744,339 @@ class AdaptiveLearningEngine:
         
         return feedback
     
+    def get_interaction_analytics(self) -> pd.DataFrame:
+        """사용자별 상호작용 요약 (컬럼 저장소에서 벡터 연산으로 계산)
+
+        상호작용 수, 성공률(성공 여부가 기록된 상호작용 기준), 평균 소요 시간,
+        평균 시도 횟수, 힌트 사용률, 마지막 활동 시각을 반환한다.
+        """
+        store = self.interaction_history
+        n_users = len(store.user_ids)
+        users = store.column('user')
+        success = store.column('success')
+        graded = success >= 0
+        
+        counts = np.bincount(users, minlength=n_users)
+        graded_counts = np.bincount(users, weights=graded, minlength=n_users)
+        successes = np.bincount(users, weights=success == 1, minlength=n_users)
+        last_activity = np.full(n_users, np.iinfo(np.int64).min)
+        np.maximum.at(last_activity, users, store.column('timestamp'))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            analytics = pd.DataFrame({
+                'interactions': counts,
+                'success_rate': successes / graded_counts,
+                'avg_duration': np.bincount(users, weights=store.column('duration'),
+                                            minlength=n_users) / counts,
+                'avg_attempts': np.bincount(users, weights=store.column('attempts'),
+                                            minlength=n_users) / counts,
+                'hint_usage_rate': np.bincount(users, weights=store.column('hint_used'),
+                                               minlength=n_users) / counts,
+                'last_activity': last_activity.view('datetime64[ns]')
+            }, index=pd.Index(store.user_ids, name='user_id'))
+        return analytics
+    
     # 유틸리티 메서드들
-    def _get_recent_interactions(self, user_id: str, count: int) -> List[LearningInteraction]:
-        """최근 상호작용 가져오기"""
-        user_interactions = [i for i in self.interaction_history if i.user_id == user_id]
-        return sorted(user_interactions, key=lambda x: x.timestamp, reverse=True)[:count]
+    def _index_interaction(self, interaction: LearningInteraction, row: int):
+        """사용자별 최근 상호작용 인덱스에 저장소 행 번호 추가
+
+        시간 오름차순을 유지하며, 같은 시각이면 먼저 기록된 상호작용을 더 최근으로
+        취급한다 (전체 로그를 시간 역순으로 안정 정렬한 결과와 동일).
+        """
+        user_id = interaction.user_id
+        recent = self._recent_by_user.get(user_id)
+        if recent is None:
+            recent = deque(maxlen=self._recent_capacity)
+            self._recent_by_user[user_id] = recent
+            self._recent_successes[user_id] = 0
+        
+        timestamps = self.interaction_history.column('timestamp')
+        timestamp = timestamps[row]
+        if not recent or timestamps[recent[-1]] < timestamp:
+            position = len(recent)
+        else:
+            # 시간 순서가 어긋난 상호작용은 정렬 위치에 삽입
+            position = bisect.bisect_left(recent, timestamp, key=timestamps.__getitem__)
+        
+        if len(recent) == recent.maxlen:
+            if position == 0:
+                return  # 윈도우보다 오래된 상호작용
+            evicted = recent.popleft()
+            self._recent_successes[user_id] -= self.interaction_history.column('success')[evicted] == 1
+            position -= 1
+        recent.insert(position, row)
+        self._recent_successes[user_id] += interaction.success is True
+    
+    def _count_interaction(self, interaction: LearningInteraction):
+        """(사용자, 주제)별, (사용자, 콘텐츠)별 누적 집계 갱신"""
+        user_id = interaction.user_id
+        topic = self._get_content_topic(interaction.content_id)
+        
+        counts = self._topic_counts.get((user_id, topic))
+        if counts is None:
+            counts = self._topic_counts[(user_id, topic)] = InteractionCounts()
+        counts.add(interaction.success)
+        
+        content_counts = self._content_counts.setdefault(user_id, {})
+        counts = content_counts.get(interaction.content_id)
+        if counts is None:
+            counts = content_counts[interaction.content_id] = InteractionCounts()
+        counts.add(interaction.success)
+        self._update_mastered(user_id, interaction.content_id, counts)
+    
+    def _trace_interaction(self, interaction: LearningInteraction, row: int):
+        """채점된 상호작용 한 건을 (사용자, 주제)별 지식 상태와 감쇠 성공 집계에 반영 (O(1))"""
+        if interaction.success is None:
+            return
+        
+        key = (interaction.user_id, self._get_content_topic(interaction.content_id))
+        timestamp = int(self.interaction_history.column('timestamp')[row])
+        self._decay_success(key, timestamp, interaction.success)
+        state = self._knowledge.get(key)
+        if state is None:
+            state = self._knowledge[key] = KnowledgeState(self.adaptation_parameters["initial_knowledge"], timestamp)
+        elapsed_days = float(max(0, timestamp - state.last_update)) / _NS_PER_DAY
+        state.p_known = _trace_knowledge(state.p_known, elapsed_days, interaction.success,
+                                         self.adaptation_parameters)
+        state.last_update = max(state.last_update, timestamp)
+    
+    def _trace_knowledge_batch(self, pairs: List[Tuple[str, str]], keys: np.ndarray,
+                               timestamps: np.ndarray, correct: np.ndarray):
+        """채점된 상호작용 묶음을 (사용자, 주제)별 지식 상태에 반영
+        
+        keys는 상호작용별 pairs 인덱스이며, 같은 키의 상호작용은 반영할 순서대로 주어진다.
+        키마다 k번째 상호작용을 모든 키에 대해 한 번에 갱신하므로 배열 연산 횟수는
+        키당 최대 상호작용 수에 비례한다.
+        """
+        if len(keys) == 0:
+            return
+        order = np.argsort(keys, kind='stable')
+        keys, timestamps, correct = keys[order], timestamps[order], correct[order]
+        key_start = np.ones(len(keys), dtype=bool)
+        key_start[1:] = keys[1:] != keys[:-1]
+        key_offsets = np.flatnonzero(key_start)
+        rank = np.arange(len(keys)) - key_offsets[np.cumsum(key_start) - 1]
+        
+        # 키별 현재 상태 (처음 보는 키는 초기값, 첫 상호작용 시각부터 시작)
+        params = self.adaptation_parameters
+        states = [self._knowledge.get(pair) for pair in pairs]
+        p_known = np.array([params["initial_knowledge"] if state is None else state.p_known
+                            for state in states])
+        last_update = np.array([-1 if state is None else state.last_update for state in states], dtype=np.int64)
+        first = keys[key_offsets]
+        last_update[first] = np.where(last_update[first] < 0, timestamps[key_offsets], last_update[first])
+        
+        by_rank = np.argsort(rank, kind='stable')
+        bounds = np.cumsum(np.bincount(rank))
+        for begin, end in zip(np.append(0, bounds[:-1]).tolist(), bounds.tolist()):
+            events = by_rank[begin:end]
+            level_keys = keys[events]
+            elapsed_days = np.maximum(0, timestamps[events] - last_update[level_keys]).astype(np.float64) / _NS_PER_DAY
+            p_known[level_keys] = _trace_knowledge(p_known[level_keys], elapsed_days, correct[events], params)
+            last_update[level_keys] = np.maximum(last_update[level_keys], timestamps[events])
+        
+        for key, p, timestamp in zip(first.tolist(), p_known[first].tolist(), last_update[first].tolist()):
+            state = states[key]
+            if state is None:
+                self._knowledge[pairs[key]] = KnowledgeState(p, timestamp)
+            else:
+                state.p_known, state.last_update = p, timestamp
+    
+    def _decay_success(self, key: Tuple[str, str], timestamp: int, success: bool):
+        """(사용자, 주제) 감쇠 성공 집계에 채점된 상호작용 한 건 반영
+        
+        집계는 마지막 시각 기준 값이므로 새 상호작용이면 기존 값을 경과 시간만큼 감쇠한 뒤
+        더하고, 그보다 오래된 상호작용이면 그 차이만큼 감쇠한 가중치로 더한다.
+        """
+        user_id, topic = key
+        topics = self._decayed_success.setdefault(user_id, {})
+        stats = topics.get(topic)
+        if stats is None:
+            stats = topics[topic] = DecayedSuccess(0.0, 0.0, timestamp)
+        
+        success_decay = self.adaptation_parameters["success_decay_per_day"]
+        if timestamp >= stats.last_update:
+            factor = float(np.power(success_decay, (timestamp - stats.last_update) / _NS_PER_DAY))
+            stats.successes = stats.successes * factor + success
+            stats.graded = stats.graded * factor + 1.0
+            stats.last_update = timestamp
+        else:
+            weight = float(np.power(success_decay, (stats.last_update - timestamp) / _NS_PER_DAY))
+            stats.successes += weight * success
+            stats.graded += weight
+    
+    def _decay_success_batch(self, pairs: List[Tuple[str, str]], keys: np.ndarray,
+                             timestamps: np.ndarray, correct: np.ndarray):
+        """채점된 상호작용 묶음을 감쇠 성공 집계에 반영 (키별 가중합을 한 번에 계산)
+        
+        키별 기준 시각 T(기존 집계와 새 상호작용 중 가장 늦은 시각)에서 각 상호작용의
+        가중치는 success_decay_per_day ** (T - 시각)이므로 순서와 무관하게 합할 수 있다.
+        """
+        if len(keys) == 0:
+            return
+        success_decay = self.adaptation_parameters["success_decay_per_day"]
+        present = np.unique(keys).tolist()
+        latest = np.full(len(pairs), np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(latest, keys, timestamps)
+        existing = {}
+        for key in present:
+            user_id, topic = pairs[key]
+            stats = self._decayed_success.get(user_id, {}).get(topic)
+            if stats is not None:
+                existing[key] = stats
+                latest[key] = max(latest[key], stats.last_update)
+        
+        weights = np.power(success_decay, (latest[keys] - timestamps) / _NS_PER_DAY)
+        successes = np.bincount(keys, weights=weights * correct, minlength=len(pairs))
+        graded = np.bincount(keys, weights=weights, minlength=len(pairs))
+        for key in present:
+            stats = existing.get(key)
+            if stats is None:
+                user_id, topic = pairs[key]
+                self._decayed_success.setdefault(user_id, {})[topic] = DecayedSuccess(
+                    float(successes[key]), float(graded[key]), int(latest[key]))
+            else:
+                factor = float(np.power(success_decay, (latest[key] - stats.last_update) / _NS_PER_DAY))
+                stats.successes = stats.successes * factor + float(successes[key])
+                stats.graded = stats.graded * factor + float(graded[key])
+                stats.last_update = int(latest[key])
     
-    def _calculate_success_rate(self, user_id: str, window_size: int = 10) -> float:
-        """성공률 계산"""
-        recent_interactions = self._get_recent_interactions(user_id, window_size)
-        successful_interactions = [i for i in recent_interactions if i.success is True]
+    def _rebuild_skill_estimates(self):
+        """저장소의 채점된 상호작용 전체(시각 순)로 지식 상태와 감쇠 성공 집계 재구성"""
+        store = self.interaction_history
+        success = store.column('success')
+        rows = np.flatnonzero(success >= 0)
+        rows = rows[np.argsort(store.column('timestamp')[rows], kind='stable')]
+        topics = [self._get_content_topic(content_id) for content_id in store.content_ids]
+        pair_keys, keys = np.unique(
+            store.column('user')[rows].astype(np.int64) * len(topics) + store.column('content')[rows],
+            return_inverse=True)
+        pairs = [(store.user_ids[key // len(topics)], topics[key % len(topics)]) for key in pair_keys.tolist()]
         
-        if not recent_interactions:
+        # 같은 주제의 콘텐츠는 하나의 키로 합침
+        merged = {pair: index for index, pair in enumerate(dict.fromkeys(pairs))}
+        keys = np.array([merged[pair] for pair in pairs], dtype=np.intp)[keys]
+        self._trace_knowledge_batch(list(merged), keys, store.column('timestamp')[rows], success[rows] == 1)
+        self._decay_success_batch(list(merged), keys, store.column('timestamp')[rows], success[rows] == 1)
+    
+    def _get_recent_rows(self, user_id: str, count: int) -> np.ndarray:
+        """최근 상호작용의 저장소 행 번호 (최신순)"""
+        if count <= self._recent_capacity:
+            recent = self._recent_by_user.get(user_id, ())
+            return np.fromiter(itertools.islice(reversed(recent), count), dtype=np.intp)
+        
+        # 인덱스 윈도우보다 많이 요청하면 전체 로그 탐색 (시각 역순, 같은 시각은 기록 순)
+        code = self.interaction_history.user_code(user_id)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        rows = np.flatnonzero(self.interaction_history.column('user')[:self._visible_rows] == code)
+        timestamps = self.interaction_history.column('timestamp')[rows]
+        return rows[np.lexsort((rows, -timestamps))][:count]
+    
+    def _get_recent_interactions(self, user_id: str, count: int) -> List[LearningInteraction]:
+        """최근 상호작용 가져오기 (최신순)"""
+        return [self.interaction_history[row] for row in self._get_recent_rows(user_id, count)]
+    
+    def _calculate_success_rate(self, user_id: str, window_size: int = SUCCESS_RATE_WINDOW) -> float:
+        """성공률 계산 (최근 window_size개 상호작용 기준)"""
+        recent = self._recent_by_user.get(user_id)
+        if not recent:
             return 0.5  # 기본값
         
-        return len(successful_interactions) / len(recent_interactions)
+        if window_size >= len(recent) and (window_size <= self._recent_capacity
+                                           or len(recent) < recent.maxlen):
+            # 윈도우 전체에 대한 누적 합 사용
+            return self._recent_successes[user_id] / len(recent)
+        
+        rows = self._get_recent_rows(user_id, window_size)
+        if len(rows) == 0:
+            return 0.5
+        
+        return np.count_nonzero(self.interaction_history.column('success')[rows] == 1) / len(rows)
     
     def _get_content_topic(self, content_id: str) -> str:
         """콘텐츠 주제 가져오기"""
-        # 실제 구현에서는 콘텐츠 메타데이터에서 가져옴
-        topic_map = {
-            "stats_basics": "descriptive_statistics",
-            "probability": "probability_theory",
-            "hypothesis_testing": "inferential_statistics",
-            "regression": "regression_analysis",
-            "factor_analysis": "multivariate_analysis"
-        }
-        return topic_map.get(content_id, "general")
+        return self.content_catalog.topic(content_id)
+    
+    def _get_content_catalog(self) -> List[str]:
+        """전체 콘텐츠 ID (카탈로그 등록 순서)"""
+        return list(self.content_catalog.ids)
+    
+    def _catalog_token(self) -> int:
+        """콘텐츠 카탈로그 상태 (바뀌면 캐시된 추천 전체가 무효)"""
+        return self.content_catalog.version
+    
+    def _scoring_state(self, user_id: str) -> Optional[tuple]:
+        """추천 결과에 영향을 주는 사용자 상태 (바뀌면 캐시된 추천 무효화)
+        
+        점수 요소(선호 난이도, 학습 스타일, 강약점, 목표, 숙달 콘텐츠)와 예상 시간에 쓰는
+        학습 페이스를 포함한다. 성공 확률의 누적 성과 요소는 상호작용마다 조금씩 바뀌므로
+        포함하지 않으며, 그 차이는 캐시 결과 나이(staleness)로 관리한다.
+        """
+        profile = self.learner_profiles.get(user_id)
+        if profile is None:
+            return None
+        mastered = self._mastered_mask(user_id)
+        return (profile.preferred_difficulty, profile.learning_style, profile.learning_pace,
+                tuple(profile.strengths), tuple(profile.weaknesses), tuple(profile.goals), mastered)
+    
+    def _get_available_content(self, user_id: str) -> List[str]:
+        """추천 가능한 콘텐츠 (숙달한 콘텐츠 제외)"""
+        return [content_id for content_id in self._get_content_catalog()
+                if not self._is_content_mastered(user_id, content_id)]
+    
+    def _get_content_prerequisites(self, content_id: str) -> List[str]:
+        """전제 콘텐츠 목록"""
+        return self.content_catalog.prerequisites(content_id)
+    
+    def _get_content_learning_style(self, content_id: str) -> str:
+        """콘텐츠 학습 스타일"""
+        return self.content_catalog.learning_style(content_id, "visual")
+    
+    def _is_content_mastered(self, user_id: str, content_id: str) -> bool:
+        """콘텐츠 숙달 여부"""
+        return self._is_mastered(self._content_counts.get(user_id, {}).get(content_id))
+    
+    def _mastered_mask(self, user_id: str) -> int:
+        """사용자가 숙달한 카탈로그 콘텐츠 비트셋
+        
+        비트셋은 집계를 갱신할 때 함께 갱신한다. 숙달 임계값이 바뀌거나 카탈로그에
+        콘텐츠가 추가되면 처음 조회할 때 콘텐츠별 집계로 전체를 다시 계산한다.
+        """
+        basis = (self.adaptation_parameters["mastery_threshold"], len(self.content_catalog))
+        if basis != self._mastered_basis:
+            self._mastered = {user_id: self.content_catalog.mask(
+                content_id for content_id, counts in content_counts.items() if self._is_mastered(counts))
+                for user_id, content_counts in self._content_counts.items()}
+            self._mastered_basis = basis
+        return self._mastered.get(user_id, 0)
+    
+    def _update_mastered(self, user_id: str, content_id: str, counts: InteractionCounts):
+        """콘텐츠 집계가 바뀐 뒤 사용자의 숙달 비트셋 갱신"""
+        index = self.content_catalog.index(content_id)
+        if index is None:
+            return
+        bit = 1 << index
+        mask = self._mastered.get(user_id, 0)
+        mask = mask | bit if self._is_mastered(counts) else mask & ~bit
+        if mask or user_id in self._mastered:
+            self._mastered[user_id] = mask
+    
+    def _is_mastered(self, counts: Optional[InteractionCounts]) -> bool:
+        """채점된 상호작용이 충분하고 성공률이 숙달 임계값 이상인지"""
+        return (counts is not None and counts.graded >= MASTERY_MIN_GRADED
+                and counts.successes / counts.graded >= self.adaptation_parameters["mastery_threshold"])
     
     def _calculate_topic_success_rate(self, user_id: str, topic: str) -> float:
         """주제별 성공률 계산"""
-        topic_interactions = [
-            i for i in self.interaction_history
-            if i.user_id == user_id and self._get_content_topic(i.content_id) == topic
-        ]
-        
-        if not topic_interactions:
+        counts = self._topic_counts.get((user_id, topic))
+        if counts is None:
             return 0.5
-        
-        successful = [i for i in topic_interactions if i.success is True]
-        return len(successful) / len(topic_interactions)
+        return counts.successes / counts.total
     
     def _get_expected_duration(self, content_id: str) -> int:
         """예상 완료 시간 가져오기"""
-        # 실제 구현에서는 콘텐츠 메타데이터에서 가져옴
-        duration_map = {
-            "stats_basics": 300,  # 5분
-            "probability": 600,   # 10분
-            "hypothesis_testing": 900,  # 15분
-            "regression": 1200,   # 20분
-            "factor_analysis": 1800  # 30분
-        }
-        return duration_map.get(content_id, 600)
+        return self.content_catalog.expected_duration(content_id)
 
 
 # 전역 적응형 학습 엔진
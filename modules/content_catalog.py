@@ -0,0 +1,252 @@
+"""
+콘텐츠 메타데이터 카탈로그
+- 콘텐츠 ID를 등록 순서대로 정수 번호로 관리 (주제, 예상 시간, 난이도는 번호로 찾는 배열)
+- 직접 전제조건과 전이적 전제조건(전제의 전제 포함)을 정수 비트셋으로 미리 계산
+- 전제조건 확인은 학습자의 숙달 콘텐츠 비트셋과의 비트 연산으로 수행
+- 표준 라이브러리만 사용 (의존성 없는 독립 실행 데모에서도 사용)
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+# 메타데이터가 등록되지 않은 콘텐츠의 기본값
+DEFAULT_TOPIC = "general"
+DEFAULT_EXPECTED_DURATION = 600  # 초
+DEFAULT_DIFFICULTY = 5
+
+_UNSET = -1
+
+
+def _bit_indices(mask: int) -> List[int]:
+    """비트셋에서 켜진 비트 번호 (오름차순)"""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+
+class ContentCatalog:
+    """콘텐츠 메타데이터와 전제조건 비트셋
+
+    콘텐츠 번호 i는 비트셋의 i번째 비트에 대응한다. 전이적 전제조건은 전제조건이 바뀐
+    뒤 처음 조회할 때 위상 정렬 순서로 한 번 계산하며, 순환 전제조건은 ValueError로
+    알린다. 번호는 등록 순서로 고정되므로 비트셋은 콘텐츠가 추가되어도 유효하다.
+    version은 콘텐츠나 메타데이터가 바뀔 때마다 증가한다 (캐시 무효화용).
+    """
+
+    version = 0
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.titles: List[Optional[str]] = []
+        self.levels: List[Optional[str]] = []
+        self.learning_styles: List[Optional[str]] = []
+        self.topic_names: List[str] = []
+        self._topic_codes: Dict[str, int] = {}
+        self.topics = array('i')        # 주제 번호 (topic_names 인덱스)
+        self.durations = array('l')     # 예상 완료 시간 (초)
+        self.difficulties = array('b')  # 난이도 (1-10)
+        self._prerequisites: List[List[str]] = []
+        self._direct: List[int] = []
+        self._closure: List[int] = []
+        self._rank: List[int] = []      # 위상 정렬 순위 (전제조건이 먼저)
+        self._closure_valid = True
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, content_id: str) -> bool:
+        return content_id in self._index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    # 등록
+    def intern(self, content_id: str) -> int:
+        """콘텐츠 번호 (처음 보는 ID는 메타데이터 없이 등록)"""
+        index = self._index.get(content_id)
+        if index is None:
+            index = self._index[content_id] = len(self.ids)
+            self.ids.append(content_id)
+            self.titles.append(None)
+            self.levels.append(None)
+            self.learning_styles.append(None)
+            self.topics.append(_UNSET)
+            self.durations.append(_UNSET)
+            self.difficulties.append(_UNSET)
+            self._prerequisites.append([])
+            self._direct.append(0)
+            self._closure.append(0)
+            self._rank.append(index)
+            self.version += 1
+        return index
+
+    def register(self, content_id: str, title: Optional[str] = None, topic: Optional[str] = None,
+                 level: Optional[str] = None, expected_duration: Optional[int] = None,
+                 difficulty: Optional[int] = None, learning_style: Optional[str] = None,
+                 prerequisites: Optional[Sequence[str]] = None) -> int:
+        """콘텐츠 메타데이터 등록 (None이 아닌 항목만 갱신) 후 콘텐츠 번호 반환"""
+        index = self.intern(content_id)
+        self.version += 1
+        if title is not None:
+            self.titles[index] = title
+        if topic is not None:
+            code = self._topic_codes.get(topic)
+            if code is None:
+                code = self._topic_codes[topic] = len(self.topic_names)
+                self.topic_names.append(topic)
+            self.topics[index] = code
+        if level is not None:
+            self.levels[index] = level
+        if expected_duration is not None:
+            self.durations[index] = int(expected_duration)
+        if difficulty is not None:
+            self.difficulties[index] = int(difficulty)
+        if learning_style is not None:
+            self.learning_styles[index] = learning_style
+        if prerequisites is not None:
+            prerequisites = list(dict.fromkeys(prerequisites))
+            self._prerequisites[index] = prerequisites
+            self._direct[index] = self.mask(self.intern(prereq) for prereq in prerequisites)
+            self._closure_valid = False
+        return index
+
+    # 메타데이터 조회
+    def index(self, content_id: str) -> Optional[int]:
+        """콘텐츠 번호 (등록되지 않았으면 None)"""
+        return self._index.get(content_id)
+
+    def topic(self, content_id: str, default: str = DEFAULT_TOPIC) -> str:
+        """콘텐츠 주제"""
+        index = self._index.get(content_id)
+        if index is None or self.topics[index] == _UNSET:
+            return default
+        return self.topic_names[self.topics[index]]
+
+    def expected_duration(self, content_id: str, default: int = DEFAULT_EXPECTED_DURATION) -> int:
+        """예상 완료 시간 (초)"""
+        index = self._index.get(content_id)
+        if index is None or self.durations[index] == _UNSET:
+            return default
+        return self.durations[index]
+
+    def difficulty(self, content_id: str, default: int = DEFAULT_DIFFICULTY) -> int:
+        """난이도"""
+        index = self._index.get(content_id)
+        if index is None or self.difficulties[index] == _UNSET:
+            return default
+        return self.difficulties[index]
+
+    def learning_style(self, content_id: str, default: Optional[str] = None) -> Optional[str]:
+        """주된 전달 방식 (학습 스타일)"""
+        index = self._index.get(content_id)
+        if index is None or self.learning_styles[index] is None:
+            return default
+        return self.learning_styles[index]
+
+    def level(self, content_id: str) -> Optional[str]:
+        """콘텐츠가 속한 레벨"""
+        index = self._index.get(content_id)
+        return None if index is None else self.levels[index]
+
+    def title(self, content_id: str) -> Optional[str]:
+        """콘텐츠 제목"""
+        index = self._index.get(content_id)
+        return None if index is None else self.titles[index]
+
+    def prerequisites(self, content_id: str) -> List[str]:
+        """직접 전제 콘텐츠 목록 (등록 순서)"""
+        index = self._index.get(content_id)
+        return [] if index is None else list(self._prerequisites[index])
+
+    # 비트셋
+    def mask(self, contents: Iterable) -> int:
+        """콘텐츠 ID(또는 번호) 목록의 비트셋 (등록되지 않은 ID는 무시)"""
+        mask = 0
+        for content in contents:
+            index = content if isinstance(content, int) else self._index.get(content)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def ids_of(self, mask: int) -> List[str]:
+        """비트셋에 포함된 콘텐츠 ID (등록 순서)"""
+        return [self.ids[index] for index in _bit_indices(mask)]
+
+    def prerequisite_mask(self, content_id: str, transitive: bool = False) -> int:
+        """전제조건 비트셋 (transitive=True면 전제의 전제까지 포함)"""
+        index = self._index.get(content_id)
+        if index is None:
+            return 0
+        if not transitive:
+            return self._direct[index]
+        self._ensure_closure()
+        return self._closure[index]
+
+    def readiness(self, content_id: str, mastered: int) -> float:
+        """직접 전제조건 중 숙달한 비율 (전제조건이 없으면 1.0)"""
+        required = self.prerequisite_mask(content_id)
+        if not required:
+            return 1.0
+        return bin(required & mastered).count('1') / bin(required).count('1')
+
+    def prerequisites_met(self, content_id: str, mastered: int, transitive: bool = False) -> bool:
+        """전제조건을 모두 숙달했는지"""
+        required = self.prerequisite_mask(content_id, transitive)
+        return required & ~mastered == 0
+
+    def missing_prerequisites(self, content_id: str, mastered: int = 0, transitive: bool = True) -> List[str]:
+        """숙달하지 않은 전제 콘텐츠 (학습할 순서 = 전제조건이 먼저)"""
+        missing = self.prerequisite_mask(content_id, transitive) & ~mastered
+        self._ensure_closure()
+        return [self.ids[index] for index in sorted(_bit_indices(missing), key=self._rank.__getitem__)]
+
+    def dependents(self, content_id: str, transitive: bool = False) -> List[str]:
+        """이 콘텐츠를 전제조건으로 하는 콘텐츠 (등록 순서)"""
+        index = self._index.get(content_id)
+        if index is None:
+            return []
+        if transitive:
+            self._ensure_closure()
+        masks = self._closure if transitive else self._direct
+        bit = 1 << index
+        return [self.ids[other] for other, mask in enumerate(masks) if mask & bit]
+
+    def _ensure_closure(self):
+        """전이적 전제조건 비트셋과 위상 정렬 순위 계산 (전제조건이 바뀐 경우에만)"""
+        if self._closure_valid:
+            return
+        n = len(self.ids)
+        closure = [0] * n
+        rank = [0] * n
+        state = [0] * n  # 0: 미방문, 1: 방문 중, 2: 완료
+        order = 0
+        for root in range(n):
+            if state[root]:
+                continue
+            stack = [(root, iter(_bit_indices(self._direct[root])))]
+            state[root] = 1
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    state[node] = 2
+                    rank[node] = order
+                    order += 1
+                    mask = self._direct[node]
+                    for prereq in _bit_indices(mask):
+                        mask |= closure[prereq]
+                    closure[node] = mask
+                elif state[child] == 1:
+                    raise ValueError(f"순환 전제조건: {self.ids[child]} <-> {self.ids[node]}")
+                elif state[child] == 0:
+                    state[child] = 1
+                    stack.append((child, iter(_bit_indices(self._direct[child]))))
+        self._closure = closure
+        self._rank = rank
+        self._closure_valid = True
@@ -3,18 +3,174 @@
 - 중복 내용 통합
 - 콘텐츠 일관성 관리
 - 레벨 간 연결성 제공
+- 코호트별 데이터셋 관리 (메모리 한도, LRU 방출)
 """
 
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
-from . import data_processing, visualization
+from . import data_processing
+from .dataset_snapshot import DatasetSnapshot, SnapshotHolder
+from .dataset_store import dataset_store
+from .static_content import StaticContentCache, static_content
+
+
+# 코호트 데이터셋이 함께 머무를 수 있는 메모리 한도 (MB)
+DEFAULT_COHORT_MEMORY_MB = float(os.environ.get('COHORT_MEMORY_LIMIT_MB', 512))
+
+# 코호트 정의 JSON 파일 경로 ({"이름": {"n_subjects": 500, "random_state": 7}, ...})
+COHORT_CONFIG = os.environ.get('COHORT_CONFIG')
+
+
+class CohortDatasetManager:
+    """코호트별 통합 데이터셋 스냅샷 관리
+
+    코호트마다 생성기와 매개변수(피험자 수, 시드 등)를 등록해 두고, 요청 시
+    디스크 저장소에서 불러온 스냅샷을 LRU로 유지한다. 메모리 한도를 넘으면
+    가장 오래 사용하지 않은 코호트부터 방출하고, 다시 요청되면 저장소에서 다시 읽는다.
+    현재 게시된 통합 데이터셋도 고정(pin)된 코호트로 함께 계산되며, 고정된 코호트는
+    방출하지 않는다.
+    """
+    
+    def __init__(self, store=None, memory_limit_mb=DEFAULT_COHORT_MEMORY_MB):
+        self.store = store or dataset_store
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.cohorts = {}
+        self._snapshots = OrderedDict()
+        self._sizes = {}
+        self._pinned = set()
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name, generator=None, **params):
+        """코호트 등록 (generator 생략 시 연구 방법론 데이터셋)"""
+        generator = generator or data_processing.generate_research_dataset
+        key = self.store.key_for(generator, params)
+        with self._lock:
+            self.cohorts[name] = {'generator': generator, 'params': params, 'key': key}
+            self._metrics.setdefault(name, {'hits': 0, 'misses': 0, 'evictions': 0})
+            # 정의가 바뀐 코호트는 이전 스냅샷을 버림
+            if name in self._snapshots and self._snapshots[name].snapshot_id != key[:12]:
+                self._drop(name)
+    
+    def register_config(self, config):
+        """JSON 설정(경로 또는 dict)의 코호트를 연구 방법론 데이터셋으로 등록
+
+        각 항목은 generate_research_dataset의 매개변수만 가질 수 있다.
+        """
+        if not isinstance(config, dict):
+            with open(config, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        allowed = set(inspect.signature(data_processing.generate_research_dataset).parameters)
+        for name, params in config.items():
+            unknown = set(params) - allowed
+            if unknown:
+                raise ValueError(f"코호트 {name}의 알 수 없는 매개변수: {sorted(unknown)}")
+        for name, params in config.items():
+            self.register(name, **params)
+    
+    def names(self):
+        """등록된 코호트 이름 목록"""
+        return list(self.cohorts)
+    
+    def find(self, snapshot_id):
+        """스냅샷 ID에 해당하는 코호트 이름 (없으면 None)"""
+        for name, cohort in list(self.cohorts.items()):
+            if cohort['key'][:12] == snapshot_id:
+                return name
+        return None
+    
+    def snapshot(self, name, pin=False):
+        """코호트 스냅샷 (메모리에 없으면 저장소에서 로드, pin=True면 방출 대상에서 제외)"""
+        if name not in self.cohorts:
+            raise KeyError(f"등록되지 않은 코호트입니다: {name}")
+        
+        with self._lock:
+            if pin:
+                self._pinned.add(name)
+            snapshot = self._snapshots.get(name)
+            if snapshot is not None:
+                self._snapshots.move_to_end(name)
+                self._metrics[name]['hits'] += 1
+                return snapshot
+            self._metrics[name]['misses'] += 1
+        
+        cohort = self.cohorts[name]
+        snapshot = DatasetSnapshot(self._load(cohort), cohort['key'][:12])
+        size = int(snapshot.data.memory_usage(deep=True).sum())
+        
+        with self._lock:
+            if name in self._snapshots:
+                # 다른 스레드가 먼저 로드함
+                return self._snapshots[name]
+            self._snapshots[name] = snapshot
+            self._sizes[name] = size
+            self._evict()
+        return snapshot
+    
+    def unpin(self, name):
+        """고정 해제 (한도를 넘으면 다시 방출 대상이 됨)"""
+        with self._lock:
+            self._pinned.discard(name)
+            self._evict()
+    
+    def metrics(self):
+        """코호트별 적중/실패/방출 횟수와 메모리 사용량"""
+        with self._lock:
+            return {
+                'memory_bytes': sum(self._sizes.values()),
+                'memory_limit_bytes': self.memory_limit,
+                'resident': list(self._snapshots),
+                'pinned': sorted(self._pinned),
+                'cohorts': {name: dict(m, resident=name in self._snapshots)
+                            for name, m in self._metrics.items()}
+            }
+    
+    def _load(self, cohort):
+        """저장소에서 데이터셋 로드 (없으면 생성해 저장)
+
+        저장소의 프로세스 내 메모이즈를 거치지 않아야 방출된 데이터가 실제로 해제된다.
+        """
+        key = cohort['key']
+        if not self.store.contains(key):
+            self.store.save(key, cohort['generator'](**cohort['params']),
+                            meta={'cohort_params': cohort['params']})
+        return self.store.load(key)
+    
+    def _evict(self):
+        """메모리 한도를 넘는 동안 가장 오래 사용하지 않은 코호트 방출
+
+        고정된 코호트는 방출하지 않고, 최소 하나는 유지한다.
+        """
+        while len(self._snapshots) > 1 and sum(self._sizes.values()) > self.memory_limit:
+            name = next((name for name in self._snapshots if name not in self._pinned), None)
+            if name is None:
+                break
+            self._drop(name)
+            self._metrics[name]['evictions'] += 1
+    
+    def _drop(self, name):
+        """코호트 스냅샷 제거 (요청이 고정한 스냅샷은 요청이 끝날 때까지 유지됨)"""
+        self._snapshots.pop(name, None)
+        self._sizes.pop(name, None)
 
 
 class ContentIntegrator:
     """콘텐츠 통합 및 관리 클래스"""
     
-    def __init__(self):
-        self.unified_dataset = None
+    def __init__(self, cohort_memory_mb=DEFAULT_COHORT_MEMORY_MB, cohort_config=COHORT_CONFIG):
+        self.snapshots = SnapshotHolder()
+        self.cohorts = CohortDatasetManager(memory_limit_mb=cohort_memory_mb)
+        self.cohorts.register('default', n_subjects=300)
+        if cohort_config:
+            self.cohorts.register_config(cohort_config)
+        self._unified_cohort = None
+        self.static_content = StaticContentCache()
         self.content_mapping = {
             'beginner': {
                 'focus': 'qualitative_research',
@@ -33,37 +189,89 @@ class ContentIntegrator:
             }
         }
     
+    @property
+    def snapshot(self):
+        """현재 게시된 데이터셋 스냅샷"""
+        return self.snapshots.current()
+    
+    @property
+    def unified_dataset(self):
+        """현재 스냅샷의 통합 데이터셋"""
+        snapshot = self.snapshots.current()
+        return None if snapshot is None else snapshot.data
+    
+    @unified_dataset.setter
+    def unified_dataset(self, data):
+        self._publish_unified(DatasetSnapshot(data), None)
+    
     def generate_unified_dataset(self, n_subjects=300):
-        """모든 레벨에서 사용할 통합 데이터셋 생성"""
-        self.unified_dataset = data_processing.generate_research_dataset(n_subjects)
-        return self.unified_dataset
+        """모든 레벨에서 사용할 통합 데이터셋 생성 후 스냅샷으로 게시
+
+        통합 데이터셋은 코호트 관리자에 고정된 코호트로 로드되어 메모리 한도에 포함된다.
+        """
+        generator = data_processing.generate_research_dataset
+        # 같은 데이터는 어느 프로세스에서든 같은 스냅샷 ID를 갖도록 저장소 키 사용
+        snapshot_id = dataset_store.key_for(generator, {'n_subjects': n_subjects})[:12]
+        snapshot = self.snapshots.current()
+        if snapshot is None or snapshot.snapshot_id != snapshot_id:
+            cohort = self.cohorts.find(snapshot_id)
+            if cohort is None:
+                cohort = f'unified-{n_subjects}'
+                self.cohorts.register(cohort, n_subjects=n_subjects)
+            snapshot = self._publish_unified(self.cohorts.snapshot(cohort, pin=True), cohort)
+        return snapshot.data
     
-    def get_level_specific_data(self, level='beginner', analysis_focus=None):
-        """레벨별 특화 데이터 반환"""
-        if self.unified_dataset is None:
-            self.generate_unified_dataset()
-        
-        if level == 'beginner':
-            # 연구방법론: 기본 인구통계 + 그룹 정보
-            cols = ['subject_id', 'age', 'gender', 'education', 'group', 'success']
-            if analysis_focus == 'demographics':
-                cols.extend(['performance_score'])
-            return self.unified_dataset[cols]
+    def _publish_unified(self, snapshot, cohort):
+        """통합 스냅샷 게시 후 이전 통합 코호트의 고정 해제"""
+        snapshot = self.snapshots.publish(snapshot)
+        previous, self._unified_cohort = self._unified_cohort, cohort
+        if previous is not None and previous != cohort:
+            self.cohorts.unpin(previous)
+        return snapshot
+    
+    def resolve(self, snapshot_id):
+        """ID로 스냅샷 조회 (없으면 None)
+
+        스냅샷 ID는 저장소 키에서 정해지므로, 이 프로세스에 게시된 적이 없거나 이미
+        해제된 스냅샷도 코호트 등록 정보나 저장소에 기록된 연구 데이터셋에서 다시
+        만든다. 다시 만든 스냅샷은 현재 스냅샷을 바꾸지 않고 조회용으로만 등록한다.
+        """
+        snapshot = self.snapshots.get(snapshot_id)
+        if snapshot is not None:
+            return snapshot
         
-        elif level == 'intermediate':
-            # 요인분석: 심리측정 문항들
-            psychometric_cols = [col for col in self.unified_dataset.columns if col.startswith('Q')]
-            base_cols = ['subject_id']
-            return self.unified_dataset[base_cols + psychometric_cols]
+        cohort = self.cohorts.find(snapshot_id)
+        if cohort is not None:
+            return self.snapshots.register(self.cohorts.snapshot(cohort))
         
-        elif level == 'advanced':
-            # 머신러닝: 전체 데이터
-            return self.unified_dataset
+        key = dataset_store.find(snapshot_id)
+        if key is not None and dataset_store.generated_by(key, data_processing.generate_research_dataset):
+            return self.snapshots.register(DatasetSnapshot(dataset_store.load_cached(key), snapshot_id))
+        return None
+    
+    def pin(self, cohort=None):
+        """요청 동안 사용할 스냅샷 (없으면 생성해 게시)
+
+        cohort를 지정하면 해당 코호트의 스냅샷을 반환한다.
+        """
+        if cohort is not None:
+            return self.snapshots.register(self.cohorts.snapshot(cohort))
         
-        else:
-            return self.unified_dataset
+        snapshot = self.snapshots.current()
+        if snapshot is None:
+            self.generate_unified_dataset()
+            snapshot = self.snapshots.current()
+        return snapshot
+    
+    def get_level_specific_data(self, level='beginner', analysis_focus=None, snapshot=None):
+        """레벨별 특화 데이터 반환 (스냅샷에 미리 계산된 뷰의 호출자 전용 사본)"""
+        return (snapshot or self.pin()).view(level, analysis_focus)
     
-    def create_bridge_content(self, from_level, to_level):
+    def _dataset_handle(self, level, analysis_focus=None, snapshot=None):
+        """응답에 담을 레벨별 데이터 핸들 (데이터 자체는 /api/data로 조회)"""
+        return (snapshot or self.pin()).handle(level, analysis_focus).to_dict()
+    
+    def create_bridge_content(self, from_level, to_level, snapshot=None):
         """레벨 간 연결 콘텐츠 생성"""
         bridges = {
             ('beginner', 'intermediate'): self._create_qualitative_to_quantitative_bridge,
@@ -73,11 +281,11 @@ class ContentIntegrator:
         
         bridge_func = bridges.get((from_level, to_level))
         if bridge_func:
-            return bridge_func()
+            return bridge_func(snapshot)
         else:
             return f"직접 연결: {from_level} -> {to_level}"
     
-    def _create_qualitative_to_quantitative_bridge(self):
+    def _create_qualitative_to_quantitative_bridge(self, snapshot=None):
         """질적 연구 -> 양적 분석 연결"""
         return {
             'title': '질적 연구에서 양적 분석으로의 전환',
@@ -93,10 +301,10 @@ interview_responses = ['매우 동의', '동의', '보통', '비동의', '매우
 likert_scale = {'매우 동의': 5, '동의': 4, '보통': 3, '비동의': 2, '매우 비동의': 1}
 quantified_data = [likert_scale[response] for response in interview_responses]
             """,
-            'dataset': self.get_level_specific_data('beginner', 'demographics')
+            'dataset': self._dataset_handle('beginner', 'demographics', snapshot)
         }
     
-    def _create_statistical_to_ml_bridge(self):
+    def _create_statistical_to_ml_bridge(self, snapshot=None):
         """통계적 분석 -> 머신러닝 연결"""
         return {
             'title': '전통적 통계 분석에서 머신러닝으로의 확장',
@@ -119,10 +327,10 @@ factor_scores = fa.fit_transform(scaled_data)
 model = RandomForestClassifier()
 model.fit(factor_scores, target_variable)
             """,
-            'dataset': self.get_level_specific_data('intermediate')
+            'dataset': self._dataset_handle('intermediate', snapshot=snapshot)
         }
     
-    def _create_research_to_analytics_bridge(self):
+    def _create_research_to_analytics_bridge(self, snapshot=None):
         """연구방법론 -> 데이터 분석 연결"""
         return {
             'title': '연구 설계에서 데이터 분석까지의 전 과정',
@@ -139,9 +347,10 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
 # -> 성과 지표 정의 및 측정
 # -> 통계적 검정 수행
             """,
-            'dataset': self.get_level_specific_data('advanced')
+            'dataset': self._dataset_handle('advanced', snapshot=snapshot)
         }
     
+    @static_content
     def consolidate_duplicate_content(self):
         """중복 콘텐츠 통합"""
         duplicates = {
@@ -202,6 +411,7 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
         }
         return next_steps.get(level, [])
     
+    @static_content
     def _create_unified_examples(self, category):
         """통합 예시 생성"""
         examples = {
@@ -235,10 +445,9 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
         }
         return examples.get(category, {})
     
-    def create_comprehensive_example(self):
+    def create_comprehensive_example(self, snapshot=None):
         """전체 레벨을 아우르는 종합 예시 생성"""
-        if self.unified_dataset is None:
-            self.generate_unified_dataset()
+        snapshot = snapshot or self.pin()
         
         comprehensive_example = {
             'title': '온라인 교육 효과성 연구: 질적 연구에서 머신러닝까지',
@@ -246,21 +455,24 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
             'research_progression': {
                 'beginner_stage': {
                     'method': '사례 연구 및 인터뷰',
-                    'data': self.get_level_specific_data('beginner'),
+                    'data': self._dataset_handle('beginner', snapshot=snapshot),
                     'analysis': '참여자 특성 분석 및 질적 피드백 수집',
-                    'visualization': visualization.plot_research_methodology
+                    'visualization': 'plot_research_methodology',
+                    'visualization_href': '/api/visualization/beginner'
                 },
                 'intermediate_stage': {
                     'method': '심리측정 및 요인분석',
-                    'data': self.get_level_specific_data('intermediate'),
+                    'data': self._dataset_handle('intermediate', snapshot=snapshot),
                     'analysis': '학습동기, 만족도, 성취도 요인 구조 분석',
-                    'visualization': visualization.plot_factor_analysis
+                    'visualization': 'plot_factor_analysis',
+                    'visualization_href': '/api/visualization/intermediate'
                 },
                 'advanced_stage': {
                     'method': '예측 모델링 및 분류',
-                    'data': self.get_level_specific_data('advanced'),
+                    'data': self._dataset_handle('advanced', snapshot=snapshot),
                     'analysis': '성공 예측 모델 개발 및 개인화 추천',
-                    'visualization': visualization.plot_advanced_analytics
+                    'visualization': 'plot_advanced_analytics',
+                    'visualization_href': '/api/visualization/advanced'
                 }
             },
             'integration_points': [
@@ -272,6 +484,7 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
         
         return comprehensive_example
     
+    @static_content
     def generate_content_roadmap(self):
         """학습 로드맵 생성"""
         roadmap = {
@@ -319,6 +532,7 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
         
         return roadmap
     
+    @static_content
     def _create_skill_matrix(self):
         """기술 역량 매트릭스 생성"""
         skills = {
@@ -345,6 +559,7 @@ research_question = "교육 프로그램이 학습 성과에 미치는 영향"
         }
         return skills
     
+    @static_content
     def _create_assessment_criteria(self):
         """평가 기준 생성"""
         criteria = {
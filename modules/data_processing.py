@@ -1,9 +1,35 @@
+import base64
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-import seaborn as sns
 import numpy as np
+import scipy.sparse as sp
 from sklearn.datasets import make_classification, make_regression
 from sklearn.preprocessing import StandardScaler
 
+from .dataset_snapshot import DatasetSnapshot
+from .dataset_store import DatasetStore, dataset_store
+from .public_datasets import public_datasets
+from .summary_statistics import summary_statistics
+
+
+# 범주형 변수의 수준 (compact 모드에서 고정된 categories로 사용)
+GENDER_LEVELS = ['Male', 'Female']
+EDUCATION_LEVELS = ['High School', 'Bachelor', 'Master', 'PhD']
+GROUP_LEVELS = ['Control', 'Treatment_A', 'Treatment_B']
+ML_CLASS_NAMES = ['Class_A', 'Class_B', 'Class_C']
+
+
+def _categorical_column(codes, levels, compact):
+    """정수 코드를 compact 모드면 범주형, 아니면 문자열 배열로 변환"""
+    if compact:
+        return pd.Categorical.from_codes(codes, categories=levels)
+    return np.asarray(levels)[codes]
+
 
 def generate_statistics_data(size=50):
     """평균, 분산, 상관관계를 설명하기 위한 예제 데이터 생성"""
@@ -15,21 +41,32 @@ def generate_statistics_data(size=50):
     return data
 
 
-def generate_research_dataset(n_subjects=200, random_state=42):
-    """연구 방법론 교육용 종합 데이터셋 생성"""
+def generate_research_dataset(n_subjects=200, random_state=42, compact=False):
+    """연구 방법론 교육용 종합 데이터셋 생성
+
+    compact=True 이면 범주형 변수는 pandas categorical, 리커트 문항은 int8,
+    subject_id는 uint32, 연속형 점수는 float32로 저장한다.
+    """
     np.random.seed(random_state)
-    
+    return _research_frame(np.random, n_subjects, compact)
+
+
+def _research_frame(rng, n_subjects, compact):
+    """난수 생성기 rng로 연구 데이터셋 생성
+
+    rng는 np.random 모듈(전역 상태), RandomState 또는 Generator이다.
+    """
     # 기본 인구통계 정보
-    ages = np.random.normal(35, 12, n_subjects).astype(int)
+    ages = rng.normal(35, 12, n_subjects).astype(int)
     ages = np.clip(ages, 18, 80)
     
-    gender = np.random.choice(['Male', 'Female'], n_subjects)
-    education = np.random.choice(['High School', 'Bachelor', 'Master', 'PhD'], 
-                               n_subjects, p=[0.3, 0.4, 0.2, 0.1])
+    gender_codes = rng.choice(len(GENDER_LEVELS), n_subjects)
+    education_codes = rng.choice(len(EDUCATION_LEVELS), n_subjects,
+                                 p=[0.3, 0.4, 0.2, 0.1])
     
     # 심리측정 변수 (요인분석용)
     # 5개 요인, 각각 3개 문항
-    factor_data = np.random.multivariate_normal(
+    factor_data = rng.multivariate_normal(
         mean=[0, 0, 0, 0, 0],
         cov=[[1, 0.3, 0.2, 0.1, 0.1],
              [0.3, 1, 0.1, 0.2, 0.1],
@@ -40,37 +77,45 @@ def generate_research_dataset(n_subjects=200, random_state=42):
     )
     
     # 리커트 척도로 변환 (1-7)
+    item_dtype = np.int8 if compact else int
     items = {}
     for i in range(5):
         for j in range(3):
             item_name = f'Q{i+1}_{j+1}'
             items[item_name] = np.clip(
                 np.round(factor_data[:, i] * 1.5 + 4), 1, 7
-            ).astype(int)
+            ).astype(item_dtype)
     
     # 연속형 결과 변수
     performance = (
         0.3 * factor_data[:, 0] + 
         0.2 * factor_data[:, 1] + 
         0.1 * (ages - 35) / 12 +
-        np.random.normal(0, 0.5, n_subjects)
+        rng.normal(0, 0.5, n_subjects)
     )
     
     # 범주형 결과 변수
     success_prob = 1 / (1 + np.exp(-performance))
-    success = np.random.binomial(1, success_prob, n_subjects)
+    success = rng.binomial(1, success_prob, n_subjects)
     
     # 그룹 변수 (실험 조건)
-    group = np.random.choice(['Control', 'Treatment_A', 'Treatment_B'], 
-                           n_subjects, p=[0.4, 0.3, 0.3])
+    group_codes = rng.choice(len(GROUP_LEVELS), n_subjects, p=[0.4, 0.3, 0.3])
+    
+    if compact:
+        subject_id = np.arange(1, n_subjects + 1, dtype=np.uint32)
+        ages = ages.astype(np.int8)
+        performance = performance.astype(np.float32)
+        success = success.astype(np.int8)
+    else:
+        subject_id = range(1, n_subjects + 1)
     
     # 데이터프레임 생성
     data = pd.DataFrame({
-        'subject_id': range(1, n_subjects + 1),
+        'subject_id': subject_id,
         'age': ages,
-        'gender': gender,
-        'education': education,
-        'group': group,
+        'gender': _categorical_column(gender_codes, GENDER_LEVELS, compact),
+        'education': _categorical_column(education_codes, EDUCATION_LEVELS, compact),
+        'group': _categorical_column(group_codes, GROUP_LEVELS, compact),
         'performance_score': performance,
         'success': success,
         **items
@@ -79,10 +124,117 @@ def generate_research_dataset(n_subjects=200, random_state=42):
     return data
 
 
-def generate_factor_analysis_data(n_subjects=300, n_factors=4, random_state=42):
-    """요인분석 교육용 데이터셋 생성"""
+# 기본 교육용 측정도구의 요인 로딩 행렬 (4요인, 요인당 4개 문항)
+CLASSIC_LOADINGS = np.array([
+    [0.8, 0.1, 0.1, 0.1],  # Factor 1 items
+    [0.7, 0.2, 0.1, 0.1],
+    [0.6, 0.1, 0.2, 0.1],
+    [0.8, 0.1, 0.1, 0.2],
+    [0.1, 0.8, 0.1, 0.1],  # Factor 2 items
+    [0.2, 0.7, 0.1, 0.1],
+    [0.1, 0.6, 0.2, 0.1],
+    [0.1, 0.8, 0.1, 0.1],
+    [0.1, 0.1, 0.8, 0.1],  # Factor 3 items
+    [0.1, 0.2, 0.7, 0.1],
+    [0.2, 0.1, 0.6, 0.1],
+    [0.1, 0.1, 0.8, 0.2],
+    [0.1, 0.1, 0.1, 0.8],  # Factor 4 items
+    [0.1, 0.1, 0.2, 0.7],
+    [0.1, 0.2, 0.1, 0.6],
+    [0.2, 0.1, 0.1, 0.8],
+])
+CLASSIC_LOADINGS.setflags(write=False)
+
+# 블록 행렬곱 한 번에 만드는 관찰 점수 원소 수 (float64 기준 약 32MB)
+_SCORE_BLOCK_ELEMENTS = 4_000_000
+
+
+def build_factor_loadings(n_items, n_factors, primary_loading=(0.6, 0.8), cross_loading=0.2,
+                          cross_loading_density=0.1, random_state=42, sparse=True):
+    """단순 구조와 교차 적재를 갖는 요인 로딩 행렬 생성
+
+    문항은 연속된 블록 단위로 하나의 주 요인에 배정되어 primary_loading 범위의
+    적재를 갖고, 나머지 요인에는 cross_loading_density 확률로 0~cross_loading 크기의
+    교차 적재를 갖는다. sparse=True 이면 scipy.sparse CSR 행렬(n_items x n_factors)을 반환한다.
+    """
+    rng = np.random.default_rng(random_state)
+    items = np.arange(n_items)
+    primary_factor = items * n_factors // n_items
+    
+    # 문항별 교차 적재 요인: 주 요인을 제외한 요인 중 무작위로 n_cross개 선택
+    n_cross = rng.binomial(n_factors - 1, cross_loading_density, n_items)
+    keys = rng.random((n_items, n_factors))
+    keys[items, primary_factor] = np.inf
+    chosen = np.argsort(keys, axis=1)
+    cross_mask = np.arange(n_factors)[None, :] < n_cross[:, None]
+    
+    rows = np.concatenate([items, np.repeat(items, n_cross)])
+    cols = np.concatenate([primary_factor, chosen[cross_mask]])
+    values = np.concatenate([
+        rng.uniform(*primary_loading, n_items),
+        rng.uniform(0, cross_loading, n_cross.sum())
+    ])
+    
+    loadings = sp.csr_matrix((values, (rows, cols)), shape=(n_items, n_factors))
+    return loadings if sparse else loadings.toarray()
+
+
+def _blocked_likert_scores(factor_scores, loadings, noise_sd, dtype, block_rows=None):
+    """관찰 점수 = 요인 점수 x 로딩 + 오차를 행 블록 단위로 계산해 리커트 척도로 변환
+
+    전체 크기의 float64 중간 행렬을 만들지 않고, 최종 정수 배열에 블록별로 기록한다.
+    오차는 행 순서대로 전역 난수 상태에서 뽑으므로 한 번에 계산한 결과와 같다.
+    """
+    n_subjects = factor_scores.shape[0]
+    n_items = loadings.shape[0]
+    if block_rows is None:
+        block_rows = max(1, _SCORE_BLOCK_ELEMENTS // n_items)
+    
+    observed = np.empty((n_subjects, n_items), dtype=dtype)
+    for start in range(0, n_subjects, block_rows):
+        stop = min(start + block_rows, n_subjects)
+        if sp.issparse(loadings):
+            block = np.asarray(loadings @ factor_scores[start:stop].T).T
+        else:
+            block = factor_scores[start:stop] @ loadings.T
+        block += np.random.normal(0, noise_sd, block.shape)
+        block *= 1.5
+        block += 4
+        np.round(block, out=block)
+        observed[start:stop] = np.clip(block, 1, 7, out=block)
+    
+    return observed
+
+
+def generate_factor_analysis_data(n_subjects=300, n_factors=4, random_state=42, compact=False,
+                                  n_items=None, loadings=None, noise_sd=0.5,
+                                  primary_loading=(0.6, 0.8), cross_loading=0.2,
+                                  cross_loading_density=0.1, block_rows=None):
+    """요인분석 교육용 데이터셋 생성
+
+    n_items와 loadings를 모두 생략하고 n_factors=4 이면 기본 16문항 측정도구를 사용한다.
+    그 외에는 build_factor_loadings로 로딩 행렬을 만들거나(n_items 생략 시 요인당 4문항)
+    전달된 loadings(밀집 또는 희소, n_items x n_factors)를 사용한다.
+    관찰 점수는 블록 단위로 계산되므로 대규모(예: 10^6명 x 1000문항)에서도
+    compact=True 와 함께 사용하면 int8 결과 배열 크기의 메모리만 필요하다.
+    compact=True 이면 문항 점수는 int8, 요인 점수는 float32로 저장한다.
+    """
     np.random.seed(random_state)
     
+    # 요인 로딩 행렬
+    if loadings is None:
+        if n_items is None and n_factors == CLASSIC_LOADINGS.shape[1]:
+            loadings = CLASSIC_LOADINGS.copy()
+        else:
+            loadings = build_factor_loadings(
+                n_items or 4 * n_factors, n_factors,
+                primary_loading=primary_loading,
+                cross_loading=cross_loading,
+                cross_loading_density=cross_loading_density,
+                random_state=random_state
+            )
+    n_items, n_factors = loadings.shape
+    
     # 요인 점수 생성
     factor_scores = np.random.multivariate_normal(
         mean=np.zeros(n_factors),
@@ -90,50 +242,30 @@ def generate_factor_analysis_data(n_subjects=300, n_factors=4, random_state=42):
         size=n_subjects
     )
     
-    # 요인 로딩 행렬 (각 요인당 4개 문항)
-    loadings = np.array([
-        [0.8, 0.1, 0.1, 0.1],  # Factor 1 items
-        [0.7, 0.2, 0.1, 0.1],
-        [0.6, 0.1, 0.2, 0.1],
-        [0.8, 0.1, 0.1, 0.2],
-        [0.1, 0.8, 0.1, 0.1],  # Factor 2 items
-        [0.2, 0.7, 0.1, 0.1],
-        [0.1, 0.6, 0.2, 0.1],
-        [0.1, 0.8, 0.1, 0.1],
-        [0.1, 0.1, 0.8, 0.1],  # Factor 3 items
-        [0.1, 0.2, 0.7, 0.1],
-        [0.2, 0.1, 0.6, 0.1],
-        [0.1, 0.1, 0.8, 0.2],
-        [0.1, 0.1, 0.1, 0.8],  # Factor 4 items
-        [0.1, 0.1, 0.2, 0.7],
-        [0.1, 0.2, 0.1, 0.6],
-        [0.2, 0.1, 0.1, 0.8],
-    ])
-    
-    # 관찰 변수 생성
-    observed_scores = factor_scores @ loadings.T
-    
-    # 오차 추가
-    error = np.random.normal(0, 0.5, observed_scores.shape)
-    observed_scores += error
-    
-    # 리커트 척도로 변환
-    observed_scores = np.clip(
-        np.round(observed_scores * 1.5 + 4), 1, 7
-    ).astype(int)
+    # 관찰 변수 생성 (블록 행렬곱 + 오차) 후 리커트 척도로 변환
+    observed_scores = _blocked_likert_scores(
+        factor_scores, loadings, noise_sd, np.int8 if compact else int, block_rows
+    )
     
     # 데이터프레임 생성
-    item_names = [f'Item_{i+1:02d}' for i in range(16)]
-    data = pd.DataFrame(observed_scores, columns=item_names)
+    width = max(2, len(str(n_items)))
+    item_names = [f'Item_{i+1:0{width}d}' for i in range(n_items)]
+    data = pd.DataFrame(observed_scores, columns=item_names, copy=False)
     
     # 요인 정보 추가
+    if compact:
+        factor_scores = factor_scores.astype(np.float32)
     factor_info = pd.DataFrame(factor_scores, columns=[f'Factor_{i+1}' for i in range(n_factors)])
     
     return data, factor_info, loadings
 
 
-def generate_ml_dataset(n_samples=1000, n_features=10, task='classification', random_state=42):
-    """머신러닝 교육용 데이터셋 생성"""
+def generate_ml_dataset(n_samples=1000, n_features=10, task='classification', random_state=42,
+                        compact=False):
+    """머신러닝 교육용 데이터셋 생성
+
+    compact=True 이면 특성은 float32, 분류 타깃은 범주형, 회귀 타깃은 float32로 저장한다.
+    """
     if task == 'classification':
         X, y = make_classification(
             n_samples=n_samples,
@@ -143,8 +275,10 @@ def generate_ml_dataset(n_samples=1000, n_features=10, task='classification', ra
             n_classes=3,
             random_state=random_state
         )
-        target_names = ['Class_A', 'Class_B', 'Class_C']
-        y = [target_names[i] for i in y]
+        if compact:
+            y = pd.Categorical.from_codes(y, categories=ML_CLASS_NAMES)
+        else:
+            y = [ML_CLASS_NAMES[i] for i in y]
     else:
         X, y = make_regression(
             n_samples=n_samples,
@@ -153,6 +287,11 @@ def generate_ml_dataset(n_samples=1000, n_features=10, task='classification', ra
             random_state=random_state
         )
     
+    if compact:
+        X = X.astype(np.float32)
+        if task != 'classification':
+            y = y.astype(np.float32)
+    
     # 특성 이름 생성
     feature_names = [f'Feature_{i+1:02d}' for i in range(n_features)]
     
@@ -163,96 +302,361 @@ def generate_ml_dataset(n_samples=1000, n_features=10, task='classification', ra
     return data
 
 
+def _time_call(func, repeat):
+    """함수를 repeat회 실행한 최소 소요 시간(ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def compare_compact_footprint(n_subjects=10000, repeat=5, random_state=42):
+    """기본 dtype과 compact dtype의 메모리 사용량 및 groupby/corr 처리 시간 비교 보고서"""
+    generators = {
+        'research': lambda compact: generate_research_dataset(
+            n_subjects, random_state, compact=compact),
+        'factor_analysis': lambda compact: generate_factor_analysis_data(
+            n_subjects, random_state=random_state, compact=compact)[0],
+        'ml': lambda compact: generate_ml_dataset(
+            n_subjects, random_state=random_state, compact=compact)
+    }
+    group_keys = {'research': 'group', 'factor_analysis': 'Item_01', 'ml': 'target'}
+    
+    rows = []
+    for name, generate in generators.items():
+        row = {'dataset': name}
+        for mode, compact in (('default', False), ('compact', True)):
+            df = generate(compact)
+            key = group_keys[name]
+            row[f'memory_kb_{mode}'] = df.memory_usage(deep=True).sum() / 1024
+            row[f'groupby_ms_{mode}'] = _time_call(
+                lambda: df.groupby(key, observed=True).mean(numeric_only=True), repeat)
+            row[f'corr_ms_{mode}'] = _time_call(
+                lambda: df.corr(numeric_only=True), repeat)
+        row['memory_ratio'] = row['memory_kb_default'] / row['memory_kb_compact']
+        rows.append(row)
+    
+    return pd.DataFrame(rows).set_index('dataset')
+
+
+# 샤드 하나가 생성하는 기본 행 수
+DEFAULT_SHARD_ROWS = 1_000_000
+
+
+def _shard_seeds(random_state, n_shards):
+    """마스터 시드에서 파생한 샤드별 독립 시드 (작업자 수와 무관)"""
+    children = np.random.SeedSequence(random_state).spawn(n_shards)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _build_ml_model(n_features, task, random_state):
+    """모든 샤드가 공유하는 ML 데이터 생성 모델 (make_classification / make_regression 방식)"""
+    rng = np.random.default_rng(random_state)
+    model = {'task': task, 'n_features': n_features,
+             'permutation': rng.permutation(n_features)}
+    
+    if task == 'classification':
+        n_informative = n_features // 2
+        n_redundant = n_features // 4
+        n_classes, n_clusters_per_class = 3, 2
+        n_clusters = n_classes * n_clusters_per_class
+        # 군집 중심은 하이퍼큐브 꼭짓점, 군집마다 임의의 선형 변환으로 공분산 부여
+        vertices = rng.choice(2 ** n_informative, n_clusters, replace=False)
+        bits = (vertices[:, None] >> np.arange(n_informative)) & 1
+        model.update(
+            n_informative=n_informative,
+            n_classes=n_classes,
+            centroids=(2.0 * bits - 1.0),
+            transforms=2 * rng.random((n_clusters, n_informative, n_informative)) - 1,
+            redundant=2 * rng.random((n_informative, n_redundant)) - 1,
+            flip_y=0.01
+        )
+    else:
+        n_informative = min(n_features, 10)
+        coef = np.zeros(n_features)
+        coef[:n_informative] = 100 * rng.random(n_informative)
+        model.update(coef=coef, noise=0.1)
+    
+    return model
+
+
+def _ml_shard(model, n_rows, seed, compact):
+    """공유 모델에서 n_rows개의 ML 표본 생성"""
+    rng = np.random.default_rng(seed)
+    n_features = model['n_features']
+    
+    if model['task'] == 'classification':
+        k = model['n_informative']
+        n_clusters = len(model['centroids'])
+        clusters = rng.integers(n_clusters, size=n_rows)
+        X = rng.standard_normal((n_rows, n_features))
+        for c in range(n_clusters):
+            members = clusters == c
+            X[members, :k] = X[members, :k] @ model['transforms'][c] + model['centroids'][c]
+        n_redundant = model['redundant'].shape[1]
+        X[:, k:k + n_redundant] = X[:, :k] @ model['redundant']
+        
+        y = clusters % model['n_classes']
+        flip = rng.random(n_rows) < model['flip_y']
+        y[flip] = rng.integers(model['n_classes'], size=flip.sum())
+        if compact:
+            y = pd.Categorical.from_codes(y, categories=ML_CLASS_NAMES)
+        else:
+            y = np.asarray(ML_CLASS_NAMES)[y]
+    else:
+        X = rng.standard_normal((n_rows, n_features))
+        y = X @ model['coef'] + rng.normal(0, model['noise'], n_rows)
+        if compact:
+            y = y.astype(np.float32)
+    
+    X = X[:, model['permutation']]
+    if compact:
+        X = X.astype(np.float32)
+    
+    data = pd.DataFrame(X, columns=[f'Feature_{i+1:02d}' for i in range(n_features)], copy=False)
+    data['target'] = y
+    return data
+
+
+def _research_shard(start, n_rows, seed, compact):
+    """연구 데이터셋 샤드 (subject_id는 전체 구간 기준으로 이어짐, 전역 난수 상태는 건드리지 않음)"""
+    data = _research_frame(np.random.default_rng(seed), n_rows, compact)
+    data['subject_id'] += data['subject_id'].dtype.type(start)
+    return data
+
+
+def _write_shard(kind, writer, start, stop, seed, compact, model):
+    """샤드 하나를 생성해 저장소의 미리 할당된 구간에 직접 기록"""
+    if kind == 'research':
+        shard = _research_shard(start, stop - start, seed, compact)
+    else:
+        shard = _ml_shard(model, stop - start, seed, compact)
+    writer.write(start, shard)
+    return stop - start
+
+
+def generate_sharded_dataset(kind='research', n_rows=1_000_000, n_jobs=None,
+                             shard_rows=DEFAULT_SHARD_ROWS, random_state=42, compact=True,
+                             store=None, n_features=10, task='classification'):
+    """대규모 합성 데이터셋을 샤드 단위로 병렬 생성해 데이터셋 저장소에 기록
+
+    행 구간을 shard_rows 크기로 나누고, 샤드마다 random_state에서 SeedSequence로
+    파생한 시드를 사용하므로 결과는 n_jobs와 무관하게 같다. 각 작업자 프로세스는
+    저장소에 미리 할당된 컬럼 파일의 자기 구간에 직접 기록하고, 결과는 메모리 매핑된
+    DataFrame으로 반환된다 (같은 매개변수로 다시 호출하면 생성 없이 로드).
+    
+    kind='research'는 generate_research_dataset을 샤드마다 실행하고 subject_id를 이어 붙인다.
+    kind='ml'은 generate_ml_dataset과 같은 방식의 생성 모델을 마스터 시드로 한 번 만들고
+    모든 샤드가 이를 공유한다 (샘플별 결과는 generate_ml_dataset과 다름).
+    """
+    if kind not in ('research', 'ml'):
+        raise ValueError(f"지원하지 않는 데이터셋 종류입니다: {kind}")
+    
+    store = store or dataset_store
+    params = {'kind': kind, 'n_rows': n_rows, 'shard_rows': shard_rows,
+              'random_state': random_state, 'compact': compact}
+    if kind == 'ml':
+        params.update(n_features=n_features, task=task)
+    key = store.key_for(generate_sharded_dataset, params,
+                        depends_on=(_research_frame, _research_shard,
+                                    _build_ml_model, _ml_shard))
+    if store.contains(key):
+        return store.load_cached(key)
+    
+    model = _build_ml_model(n_features, task, random_state) if kind == 'ml' else None
+    bounds = [(start, min(start + shard_rows, n_rows)) for start in range(0, n_rows, shard_rows)]
+    seeds = _shard_seeds(random_state, len(bounds))
+    
+    # 스키마 확인용 소규모 샘플 (문자열 범주는 고정된 수준 목록 사용)
+    if kind == 'research':
+        template = _research_shard(0, 8, random_state, compact)
+        categories = {'gender': GENDER_LEVELS, 'education': EDUCATION_LEVELS,
+                      'group': GROUP_LEVELS}
+    else:
+        template = _ml_shard(model, 8, random_state, compact)
+        categories = {'target': ML_CLASS_NAMES}
+    
+    staging, writer = store.begin_frame(key, template, n_rows, categories)
+    tasks = [(kind, writer, start, stop, seed, compact, model)
+             for (start, stop), seed in zip(bounds, seeds)]
+    
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+    try:
+        if n_jobs <= 1:
+            for task_args in tasks:
+                _write_shard(*task_args)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                list(executor.map(_write_shard, *zip(*tasks)))
+    except BaseException:
+        # 실패한 작업자가 남긴 임시 디렉토리 정리
+        store.discard(staging)
+        raise
+    
+    store.commit_frame(key, staging, writer,
+                       meta={'generator': 'generate_sharded_dataset', 'params': params})
+    return store.load_cached(key)
+
+
+def benchmark_sharded_dataset(kind='research', n_rows=2_000_000, jobs=(1, 2, 4),
+                              shard_rows=250_000, random_state=42):
+    """작업자 수별 샤드 생성 시간과 처리량 비교 보고서
+
+    매번 임시 저장소에 새로 생성하므로 캐시의 영향을 받지 않는다. 속도 향상은 사용 가능한
+    코어 수(cpu_count 컬럼)를 넘지 않으므로 실제 배포 환경에서 측정해야 한다.
+    """
+    rows = []
+    for n_jobs in jobs:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            generate_sharded_dataset(kind, n_rows, n_jobs=n_jobs, shard_rows=shard_rows,
+                                     random_state=random_state, store=DatasetStore(directory))
+            seconds = time.perf_counter() - start
+        rows.append({'n_jobs': n_jobs, 'cpu_count': os.cpu_count(), 'seconds': seconds,
+                     'rows_per_second': n_rows / seconds})
+    
+    report = pd.DataFrame(rows).set_index('n_jobs')
+    report['speedup'] = report['seconds'].iloc[0] / report['seconds']
+    return report
+
+
 def load_public_dataset():
-    """공개된 Iris 데이터셋을 로드"""
-    return sns.load_dataset('iris')
+    """공개된 Iris 데이터셋을 로드 (로컬 레지스트리, 메모이즈)"""
+    return public_datasets.load('iris')
 
 
 def sample_public_dataset(size=50):
-    """Iris 데이터셋에서 일부 행을 무작위로 샘플링"""
-    df = load_public_dataset()
-    size = min(size, len(df))
-    return df.sample(n=size, random_state=42).reset_index(drop=True)
+    """Iris 데이터셋에서 품종별 비율을 유지하며 일부 행을 샘플링"""
+    return public_datasets.sample('iris', size)
 
 
 def load_titanic_dataset():
-    """Seaborn의 타이타닉 데이터셋 로드"""
-    return sns.load_dataset('titanic')
+    """타이타닉 데이터셋 로드 (로컬 레지스트리, 메모이즈)"""
+    return public_datasets.load('titanic')
 
 
 def sample_titanic_dataset(size=50):
-    """타이타닉 데이터셋에서 일부 행을 무작위로 샘플링"""
-    df = load_titanic_dataset()
-    size = min(size, len(df))
-    return df.sample(n=size, random_state=42).reset_index(drop=True)
+    """타이타닉 데이터셋에서 생존 여부 비율을 유지하며 일부 행을 샘플링"""
+    return public_datasets.sample('titanic', size)
 
 
-def prepare_scatter_datasets(df, x_col, y_col, color_map, group_col='species'):
-    """주어진 컬럼 쌍으로 차트용 데이터셋을 준비"""
-    datasets = []
-    if group_col in df.columns:
-        for group_name, group in df.groupby(group_col):
-            sample = group[[x_col, y_col]].rename(columns={x_col: 'x', y_col: 'y'})
-            datasets.append({
-                'label': str(group_name),
-                'data': sample.to_dict(orient='records'),
-                'backgroundColor': color_map.get(group_name, 'rgba(0,0,0,0.6)')
-            })
-    else:
-        # 그룹 컬럼이 없을 경우 전체 데이터 사용
-        sample = df[[x_col, y_col]].rename(columns={x_col: 'x', y_col: 'y'})
-        datasets.append({
-            'label': 'Data',
-            'data': sample.to_dict(orient='records'),
-            'backgroundColor': 'rgba(54,162,235,0.6)'
-        })
-    return datasets
+# 기본 그룹별 차트 색상
+GROUP_COLORS = {
+    'Control': 'rgba(255,99,132,0.6)',
+    'Treatment_A': 'rgba(54,162,235,0.6)',
+    'Treatment_B': 'rgba(75,192,192,0.6)',
+    'Male': 'rgba(255,159,64,0.6)',
+    'Female': 'rgba(153,102,255,0.6)'
+}
 
 
-def get_unified_dataset(level='all', size=None):
-    """모든 레벨에서 사용할 수 있는 통합 데이터셋 반환"""
-    research_data = generate_research_dataset(n_subjects=200)
-    
-    if level == 'beginner':
-        # 질적 연구용 - 인구통계와 그룹 정보 중심
-        return research_data[['subject_id', 'age', 'gender', 'education', 'group', 'success']]
-    
-    elif level == 'intermediate':
-        # 요인분석용 - 심리측정 문항들
-        factor_cols = [col for col in research_data.columns if col.startswith('Q')]
-        return research_data[['subject_id'] + factor_cols]
+def _encode_float32(values):
+    """float32 배열을 base64 문자열로 변환 (브라우저에서 Float32Array로 복원)"""
+    return base64.b64encode(np.ascontiguousarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+
+def build_chart_payload(df, x_col, y_col, color_map=None, group_col=None, group_codes=None,
+                        encoding='list', sort_groups=False):
+    """그룹별 컬럼형 차트 데이터셋 생성
+
+    각 데이터셋은 {'label', 'x': [...], 'y': [...], 'backgroundColor'} 형태이며,
+    점마다 dict를 만들지 않고 그룹 코드로 한 번 정렬한 배열을 잘라 사용한다.
+    encoding='float32-base64' 이면 x, y를 float32 바이트의 base64 문자열로 담는다.
+    group_codes에 미리 계산한 (codes, uniques)를 넘기면 factorize를 생략한다.
+    """
+    color_map = color_map or {}
+    x = df[x_col].to_numpy()
+    y = df[y_col].to_numpy()
     
-    elif level == 'advanced':
-        # 머신러닝용 - 전체 데이터
-        return research_data
+    if group_codes is None and group_col is not None and group_col in df.columns:
+        group_codes = pd.factorize(df[group_col], sort=sort_groups)
     
+    if group_codes is None:
+        groups = [('Data', 'rgba(54,162,235,0.6)', x, y)]
     else:
-        return research_data
+        codes, uniques = group_codes
+        # 그룹 수에 맞는 작은 정수형이면 안정 정렬이 기수 정렬로 수행됨
+        codes = np.asarray(codes).astype(np.min_scalar_type(-len(uniques) - 1), copy=False)
+        # 결측 그룹(-1)을 제외하고 코드 순서로 안정 정렬한 뒤 그룹 경계에서 분할
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = order[len(codes) - counts.sum():]
+        bounds = np.cumsum(counts)[:-1]
+        groups = [
+            (str(name), color_map.get(name, 'rgba(0,0,0,0.6)'), gx, gy)
+            for name, gx, gy in zip(uniques, np.split(x[order], bounds), np.split(y[order], bounds))
+        ]
+    
+    datasets = []
+    for label, color, gx, gy in groups:
+        if encoding == 'float32-base64':
+            dataset = {'label': label, 'encoding': encoding,
+                       'x': _encode_float32(gx), 'y': _encode_float32(gy)}
+        else:
+            dataset = {'label': label, 'x': gx.tolist(), 'y': gy.tolist()}
+        dataset['backgroundColor'] = color
+        datasets.append(dataset)
+    return datasets
+
+
+def prepare_scatter_datasets(df, x_col, y_col, color_map, group_col='species'):
+    """주어진 컬럼 쌍으로 차트용 데이터셋을 준비 ({'x', 'y'} 레코드 형식, 호환용)"""
+    datasets = build_chart_payload(df, x_col, y_col, color_map, group_col, sort_groups=True)
+    for dataset in datasets:
+        dataset['data'] = [{'x': a, 'y': b} for a, b in zip(dataset.pop('x'), dataset.pop('y'))]
+        dataset['backgroundColor'] = dataset.pop('backgroundColor')
+    return datasets
+
+
+# 통합 데이터셋 피험자 수
+UNIFIED_SUBJECTS = 200
+
+# 통합 데이터셋 스냅샷 (최초 요청 시 한 번 생성)
+_unified_snapshot = None
+_unified_lock = threading.Lock()
+
+
+def _unified_dataset_snapshot():
+    """기반 데이터셋의 스냅샷 (레벨별 뷰는 스냅샷 생성 시 한 번 계산)"""
+    global _unified_snapshot
+    if _unified_snapshot is None:
+        with _unified_lock:
+            if _unified_snapshot is None:
+                research_data = dataset_store.load_or_generate(generate_research_dataset,
+                                                               n_subjects=UNIFIED_SUBJECTS)
+                _unified_snapshot = DatasetSnapshot(research_data)
+    return _unified_snapshot
+
+
+def get_unified_dataset(level='all', size=None):
+    """모든 레벨에서 사용할 수 있는 통합 데이터셋 반환
+
+    레벨별 컬럼 구성은 dataset_snapshot 모듈의 정의를 따른다 (알 수 없는 레벨이나
+    'all'은 전체 데이터). 뷰는 프로세스당 한 번 만들고, 호출자에게는 Copy-on-Write
+    얕은 사본을 반환하므로 수정해도 다른 호출자에게 영향이 없다.
+    """
+    return _unified_dataset_snapshot().view(level)
 
 
 def prepare_visualization_data(df, chart_type='scatter', x_col=None, y_col=None, group_col=None):
     """시각화를 위한 데이터 준비"""
     if chart_type == 'scatter':
         if x_col and y_col:
-            return prepare_scatter_datasets(df, x_col, y_col, 
-                                          {'Control': 'rgba(255,99,132,0.6)',
-                                           'Treatment_A': 'rgba(54,162,235,0.6)',
-                                           'Treatment_B': 'rgba(75,192,192,0.6)',
-                                           'Male': 'rgba(255,159,64,0.6)',
-                                           'Female': 'rgba(153,102,255,0.6)'},
-                                          group_col or 'group')
+            return build_chart_payload(df, x_col, y_col, GROUP_COLORS, group_col or 'group')
     
     elif chart_type == 'histogram':
         if x_col:
+            counts = summary_statistics(df).value_counts(df, x_col)
             return {
                 'data': df[x_col].tolist(),
-                'labels': df[x_col].value_counts().index.tolist(),
-                'counts': df[x_col].value_counts().tolist()
+                'labels': counts.index.tolist(),
+                'counts': counts.tolist()
             }
     
     elif chart_type == 'correlation':
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        corr_matrix = df[numeric_cols].corr()
+        corr_matrix = summary_statistics(df).corr()
         return {
             'labels': corr_matrix.columns.tolist(),
             'data': corr_matrix.values.tolist()
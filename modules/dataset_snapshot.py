@@ -0,0 +1,186 @@
+"""
+데이터셋 스냅샷 모듈
+- 통합 데이터셋 한 버전과 레벨별 컬럼 구성을 묶어 관리
+- 레벨/분석 초점별 뷰를 스냅샷 생성 시 한 번만 계산
+- 차트용 그룹 코드(factorize 결과)를 컬럼별로 한 번만 계산해 재사용
+- 뷰는 기반 데이터의 블록을 공유하고, 호출자에게는 Copy-on-Write 얕은 사본으로 전달
+- 스냅샷 교체는 원자적 참조 교체로 수행 (읽기 경로에 잠금 없음)
+- 응답에는 데이터 대신 데이터 API로 조회할 수 있는 가벼운 핸들을 담음
+"""
+
+import math
+import threading
+import uuid
+import weakref
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+from .summary_statistics import summary_statistics
+
+
+# 레벨별 기본 컬럼 (None이면 전체 컬럼)
+BEGINNER_COLUMNS = ['subject_id', 'age', 'gender', 'education', 'group', 'success']
+
+# (레벨, 분석 초점)별 추가 컬럼
+FOCUS_EXTRA_COLUMNS = {
+    ('beginner', 'demographics'): ['performance_score']
+}
+
+
+def _level_column_sets(columns: pd.Index) -> Dict[Tuple[str, Optional[str]], List[str]]:
+    """(레벨, 분석 초점)별 컬럼 목록"""
+    psychometric_cols = [col for col in columns if str(col).startswith('Q')]
+    column_sets = {
+        # 연구방법론: 기본 인구통계 + 그룹 정보
+        ('beginner', None): BEGINNER_COLUMNS,
+        # 요인분석: 심리측정 문항들
+        ('intermediate', None): ['subject_id'] + psychometric_cols,
+        # 머신러닝: 전체 데이터
+        ('advanced', None): list(columns)
+    }
+    for (level, focus), extra in FOCUS_EXTRA_COLUMNS.items():
+        column_sets[(level, focus)] = column_sets[(level, None)] + extra
+    return column_sets
+
+
+@dataclass(frozen=True)
+class DatasetHandle:
+    """스냅샷의 레벨별 데이터를 가리키는 핸들 (데이터 API로 필요할 때 조회)"""
+    snapshot_id: str
+    level: str
+    analysis_focus: Optional[str]
+    columns: List[str]
+    n_rows: int
+    summary: Dict[str, Dict[str, Optional[float]]]
+    href: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 직렬화용 딕셔너리"""
+        return asdict(self)
+
+
+def _finite_or_none(values: pd.Series) -> Dict[str, Optional[float]]:
+    """JSON에 담을 수 있도록 NaN은 None으로 변환"""
+    return {str(k): (None if math.isnan(v) else float(v)) for k, v in values.items()}
+
+
+class DatasetSnapshot:
+    """통합 데이터셋의 불변 스냅샷과 레벨별 뷰"""
+
+    def __init__(self, data: pd.DataFrame, snapshot_id: Optional[str] = None):
+        self.data = data
+        self.snapshot_id = snapshot_id or uuid.uuid4().hex[:12]
+        self.column_sets = _level_column_sets(data.columns)
+        # 열 선택은 컬럼 블록을 공유 (Copy-on-Write로 수정 시에만 복사)
+        self._views = {
+            key: data if len(cols) == data.shape[1] else data[cols]
+            for key, cols in self.column_sets.items()
+        }
+        self._handles: Dict[Tuple[str, Optional[str]], DatasetHandle] = {}
+        self._group_codes: Dict[Tuple[str, bool], Tuple[np.ndarray, pd.Index]] = {}
+
+    @property
+    def n_rows(self) -> int:
+        """행 수"""
+        return len(self.data)
+
+    def columns_for(self, level: str = 'beginner', analysis_focus: Optional[str] = None) -> List[str]:
+        """레벨별 컬럼 목록"""
+        key = self._resolve(level, analysis_focus)
+        return self.column_sets[key] if key else list(self.data.columns)
+
+    def view(self, level: str = 'beginner', analysis_focus: Optional[str] = None) -> pd.DataFrame:
+        """레벨별 데이터 뷰 (호출자 전용 얕은 사본, 수정해도 스냅샷은 바뀌지 않음)"""
+        return self._view(level, analysis_focus).copy(deep=False)
+
+    def _view(self, level: str, analysis_focus: Optional[str]) -> pd.DataFrame:
+        """스냅샷이 보관하는 공유 뷰 (핸들과 요약 통계 계산용)"""
+        view = self._views.get((level, analysis_focus))
+        if view is None:
+            view = self._views.get((level, None), self.data)
+        return view
+
+    def group_codes(self, column: str, sort: bool = False) -> Optional[Tuple[np.ndarray, pd.Index]]:
+        """컬럼의 (그룹 코드, 그룹 값) (build_chart_payload의 group_codes, 컬럼이 없으면 None)
+
+        뷰는 기반 데이터와 행 순서가 같으므로 어느 레벨의 뷰에도 그대로 사용할 수 있다.
+        """
+        if column not in self.data.columns:
+            return None
+        key = (column, sort)
+        codes = self._group_codes.get(key)
+        if codes is None:
+            codes = self._group_codes.setdefault(key, pd.factorize(self.data[column], sort=sort))
+        return codes
+
+    def handle(self, level: str = 'beginner', analysis_focus: Optional[str] = None) -> DatasetHandle:
+        """레벨별 데이터 핸들 (컬럼, 행 수, 요약 통계, 데이터 API 주소)"""
+        key = (level, analysis_focus)
+        handle = self._handles.get(key)
+        if handle is None:
+            view = self._view(level, analysis_focus)
+            stats = summary_statistics(view)
+            query = {'snapshot': self.snapshot_id}
+            if analysis_focus is not None:
+                query['focus'] = analysis_focus
+            handle = DatasetHandle(
+                snapshot_id=self.snapshot_id,
+                level=level,
+                analysis_focus=analysis_focus,
+                columns=[str(col) for col in view.columns],
+                n_rows=len(view),
+                summary={'mean': _finite_or_none(stats.mean()),
+                         'std': _finite_or_none(stats.std())},
+                href=f'/api/data/{level}?{urlencode(query)}'
+            )
+            self._handles[key] = handle
+        return handle
+
+    def _resolve(self, level: str, analysis_focus: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        """등록된 (레벨, 분석 초점) 키 (없으면 None = 전체 데이터)"""
+        if (level, analysis_focus) in self.column_sets:
+            return (level, analysis_focus)
+        if (level, None) in self.column_sets:
+            return (level, None)
+        return None
+
+
+class SnapshotHolder:
+    """현재 스냅샷 참조와 살아 있는 스냅샷 레지스트리
+
+    읽는 쪽은 current()로 받은 스냅샷을 요청이 끝날 때까지 보관(pin)해 사용하고,
+    쓰는 쪽은 새 스냅샷을 완성한 뒤 publish()로 참조만 교체한다. 이전 스냅샷은
+    고정한 요청이 모두 끝나 참조가 사라지면 레지스트리에서도 제거된다.
+    """
+
+    def __init__(self):
+        self._current: Optional[DatasetSnapshot] = None
+        self._live = weakref.WeakValueDictionary()
+        self._write_lock = threading.Lock()
+
+    def current(self) -> Optional[DatasetSnapshot]:
+        """현재 게시된 스냅샷 (참조 읽기는 원자적이므로 잠금 불필요)"""
+        return self._current
+
+    def publish(self, snapshot: DatasetSnapshot) -> DatasetSnapshot:
+        """새 스냅샷 게시 (같은 ID가 이미 게시되어 있으면 기존 스냅샷 유지)"""
+        with self._write_lock:
+            current = self._current
+            if current is not None and current.snapshot_id == snapshot.snapshot_id:
+                return current
+            self._live[snapshot.snapshot_id] = snapshot
+            self._current = snapshot
+            return snapshot
+
+    def register(self, snapshot: DatasetSnapshot) -> DatasetSnapshot:
+        """현재 스냅샷은 바꾸지 않고 ID 조회만 가능하도록 등록 (코호트 스냅샷 등)"""
+        with self._write_lock:
+            return self._live.setdefault(snapshot.snapshot_id, snapshot)
+
+    def get(self, snapshot_id: str) -> Optional[DatasetSnapshot]:
+        """ID로 아직 살아 있는 스냅샷 조회 (해제되었으면 None)"""
+        return self._live.get(snapshot_id)
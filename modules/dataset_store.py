@@ -0,0 +1,350 @@
+"""
+데이터셋 저장소 모듈
+- 생성된 합성 데이터셋을 컬럼 단위 .npy 파일로 디스크에 저장
+- (생성기, 매개변수, 시드, 코드 버전) 키 기반 캐시
+- 메모리 매핑 로딩으로 여러 프로세스가 같은 물리 페이지를 공유
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+# 저장 형식이 바뀌면 올려서 기존 캐시를 무효화
+STORE_FORMAT_VERSION = 1
+
+DEFAULT_STORE_DIR = os.environ.get(
+    'DATASET_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.dataset_store')
+)
+
+
+def _generator_name(generator: Callable) -> str:
+    """생성기 함수의 정규화된 이름"""
+    return f"{generator.__module__}.{generator.__qualname__}"
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version(generator: Callable) -> str:
+    """생성기 소스 코드 해시 (코드가 바뀌면 캐시 키도 바뀜)"""
+    try:
+        source = inspect.getsource(generator)
+    except (OSError, TypeError):
+        source = _generator_name(generator)
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+
+
+def _bind_params(generator: Callable, params: Dict[str, Any]) -> Dict[str, Any]:
+    """기본값을 포함한 전체 매개변수 (명시 여부와 무관하게 같은 키 생성)"""
+    bound = inspect.signature(generator).bind(**params)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def _private_copy(result: Any) -> Any:
+    """메모이즈된 결과의 호출자 전용 사본
+
+    DataFrame은 Copy-on-Write 얕은 복사라 복사 비용이 거의 없고, 호출자가 수정하면
+    그 호출자 쪽에만 사본이 생긴다. 배열과 희소 행렬(로딩 행렬 등 작은 결과)은 복사한다.
+    """
+    if isinstance(result, tuple):
+        return tuple(_private_copy(part) for part in result)
+    if isinstance(result, pd.DataFrame):
+        return result.copy(deep=False)
+    if isinstance(result, np.ndarray) or sp.issparse(result):
+        return result.copy()
+    return result
+
+
+def _column_spec(name: Any, series: pd.Series, filename: str,
+                 categories: Optional[list] = None) -> Dict[str, Any]:
+    """컬럼 저장 명세 (문자열 컬럼은 categories가 없으면 값에서 추출)
+
+    숫자, 범주형, 문자열만으로 된 컬럼만 저장할 수 있다. 그 밖의 값이 섞인 object 컬럼은
+    범주 코드로 되돌릴 수 없으므로 TypeError를 발생시킨다.
+    """
+    spec = {'name': name, 'file': filename, 'dtype': str(series.dtype)}
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        spec.update(kind='categorical', categories=series.cat.categories.tolist(),
+                    ordered=bool(series.cat.ordered), storage=str(series.cat.codes.dtype))
+    elif series.dtype.kind in 'biufcmM':
+        spec.update(kind='numeric', storage=str(series.dtype))
+    else:
+        # 문자열 컬럼은 코드 + 범주 목록으로 저장
+        if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+            raise TypeError(f"문자열이 아닌 값이 섞인 컬럼은 저장할 수 없습니다: {name!r} "
+                            f"({pd.api.types.infer_dtype(series, skipna=True)})")
+        if categories is None:
+            categories = pd.unique(series.dropna()).tolist()
+        spec.update(kind='string', categories=list(categories), storage='int32')
+    return spec
+
+
+def _encode_column(series: pd.Series, spec: Dict[str, Any]) -> np.ndarray:
+    """명세에 맞춰 컬럼을 저장용 ndarray로 변환"""
+    if spec['kind'] == 'numeric':
+        return series.to_numpy(dtype=spec['storage'])
+    if spec['kind'] == 'categorical' and list(series.cat.categories) == spec['categories']:
+        return series.cat.codes.to_numpy()
+    categorical = pd.Categorical(series, categories=spec['categories'])
+    codes = categorical.codes.astype(spec['storage'])
+    if spec['kind'] == 'string' and ((codes < 0) & series.notna().to_numpy()).any():
+        raise ValueError(f"범주 목록에 없는 값이 있는 컬럼은 저장할 수 없습니다: {spec['name']!r}")
+    return codes
+
+
+class ColumnarFrameWriter:
+    """미리 할당한 컬럼별 .npy 파일에 행 구간을 기록 (프로세스 간 전달 가능)"""
+
+    def __init__(self, frame_dir: str, columns: List[Dict[str, Any]], n_rows: int):
+        self.frame_dir = frame_dir
+        self.columns = columns
+        self.n_rows = n_rows
+
+    def allocate(self):
+        """전체 행 수만큼 컬럼 파일을 할당"""
+        os.makedirs(self.frame_dir, exist_ok=True)
+        for spec in self.columns:
+            np.lib.format.open_memmap(os.path.join(self.frame_dir, spec['file']), mode='w+',
+                                      dtype=np.dtype(spec['storage']), shape=(self.n_rows,))
+
+    def write(self, start: int, df: pd.DataFrame):
+        """start 행부터 df의 행들을 기록 (서로 다른 구간은 동시에 기록 가능)"""
+        stop = start + len(df)
+        for spec in self.columns:
+            target = np.load(os.path.join(self.frame_dir, spec['file']), mmap_mode='r+')
+            target[start:stop] = _encode_column(df[spec['name']], spec)
+            target.flush()
+            del target
+
+    def manifest_part(self, name: str) -> Dict[str, Any]:
+        """매니페스트 항목"""
+        return {'type': 'frame', 'name': name, 'columns': self.columns,
+                'index': [0, self.n_rows, 1]}
+
+
+class DatasetStore:
+    """디스크 기반 합성 데이터셋 캐시"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or DEFAULT_STORE_DIR
+        self._memo: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def key_for(self, generator: Callable, params: Dict[str, Any],
+                depends_on: Sequence[Callable] = ()) -> str:
+        """(생성기, 매개변수, 코드 버전) 캐시 키 계산
+
+        depends_on에는 결과에 영향을 주는 다른 함수들을 넘겨 코드 버전에 포함한다.
+        """
+        spec = {
+            'generator': _generator_name(generator),
+            'params': _bind_params(generator, params),
+            'code_version': [_code_version(f) for f in (generator, *depends_on)],
+            'format': STORE_FORMAT_VERSION
+        }
+        payload = json.dumps(spec, sort_keys=True, default=repr)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """키에 해당하는 데이터셋 디렉토리"""
+        return os.path.join(self.root, key)
+
+    def contains(self, key: str) -> bool:
+        """저장된 데이터셋 존재 여부"""
+        return os.path.exists(os.path.join(self.path_for(key), 'manifest.json'))
+
+    def find(self, prefix: str) -> Optional[str]:
+        """키 앞부분(스냅샷 ID 등)으로 게시된 데이터셋 키 조회 (없거나 여러 개면 None)"""
+        if len(prefix) < 8 or not os.path.isdir(self.root):
+            return None
+        keys = [name for name in os.listdir(self.root)
+                if name.startswith(prefix) and self.contains(name)]
+        return keys[0] if len(keys) == 1 else None
+
+    def generated_by(self, key: str, generator: Callable) -> bool:
+        """게시된 데이터셋이 load_or_generate로 generator에서 만들어졌는지"""
+        with open(os.path.join(self.path_for(key), 'manifest.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f).get('meta', {})
+        return meta.get('generator') == _generator_name(generator)
+
+    def load_or_generate(self, generator: Callable, **params) -> Any:
+        """캐시된 데이터셋을 로드하거나, 없으면 생성 후 저장 (호출자 전용 사본 반환)"""
+        key = self.key_for(generator, params)
+
+        cached = self._memo.get(key)
+        if cached is not None:
+            return _private_copy(cached)
+
+        if not self.contains(key):
+            result = generator(**params)
+            self.save(key, result, meta={'generator': _generator_name(generator)})
+            with self._lock:
+                return _private_copy(self._memo.setdefault(key, result))
+
+        return self.load_cached(key)
+
+    def load_cached(self, key: str) -> Any:
+        """프로세스 내 메모이즈를 거쳐 저장된 데이터셋 로드 (호출자 전용 사본 반환)"""
+        cached = self._memo.get(key)
+        if cached is None:
+            result = self.load(key)
+            with self._lock:
+                cached = self._memo.setdefault(key, result)
+        return _private_copy(cached)
+
+    def begin_frame(self, key: str, template: pd.DataFrame, n_rows: int,
+                    categories: Optional[Dict[Any, list]] = None) -> Tuple[str, ColumnarFrameWriter]:
+        """template과 같은 컬럼 구성의 n_rows행 DataFrame을 구간 단위로 기록할 작성기 생성
+
+        문자열 컬럼의 범주 목록은 categories로 고정해야 여러 샤드의 코드가 일치한다.
+        """
+        categories = categories or {}
+        staging = self._staging_dir(key)
+        columns = [
+            _column_spec(col, template[col], f'{i:04d}.npy', categories.get(col))
+            for i, col in enumerate(template.columns)
+        ]
+        writer = ColumnarFrameWriter(os.path.join(staging, 'part0'), columns, n_rows)
+        writer.allocate()
+        return staging, writer
+
+    def commit_frame(self, key: str, staging: str, writer: ColumnarFrameWriter,
+                     meta: Optional[Dict[str, Any]] = None):
+        """작성기로 채운 DataFrame을 게시"""
+        manifest = {
+            'format': STORE_FORMAT_VERSION,
+            'container': 'single',
+            'parts': [writer.manifest_part('part0')],
+            'meta': meta or {}
+        }
+        self.commit(key, staging, manifest)
+
+    def save(self, key: str, result: Any, meta: Optional[Dict[str, Any]] = None):
+        """데이터셋을 임시 디렉토리에 기록한 뒤 원자적으로 게시"""
+        staging = self._staging_dir(key)
+        parts = result if isinstance(result, tuple) else (result,)
+
+        try:
+            manifest = {
+                'format': STORE_FORMAT_VERSION,
+                'container': 'tuple' if isinstance(result, tuple) else 'single',
+                'parts': [self._write_part(staging, f'part{i}', part) for i, part in enumerate(parts)],
+                'meta': meta or {}
+            }
+        except BaseException:
+            self.discard(staging)
+            raise
+        self.commit(key, staging, manifest)
+
+    def load(self, key: str) -> Any:
+        """메모리 매핑으로 데이터셋 로드"""
+        directory = self.path_for(key)
+        with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        parts = tuple(self._read_part(directory, part) for part in manifest['parts'])
+        return parts if manifest['container'] == 'tuple' else parts[0]
+
+    def discard(self, staging: str):
+        """게시하지 않을 임시 디렉토리 삭제 (생성이 실패한 경우)"""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def clear_memory(self):
+        """프로세스 내 메모이즈된 데이터셋 해제 (디스크 캐시는 유지)"""
+        with self._lock:
+            self._memo.clear()
+
+    def _staging_dir(self, key: str) -> str:
+        """쓰기용 임시 디렉토리 생성"""
+        staging = os.path.join(self.root, f'.{key}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp')
+        os.makedirs(staging)
+        return staging
+
+    def commit(self, key: str, staging: str, manifest: Dict[str, Any]):
+        """매니페스트를 기록하고 임시 디렉토리를 최종 경로로 이동"""
+        with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+        try:
+            os.rename(staging, self.path_for(key))
+        except OSError:
+            # 다른 프로세스가 먼저 같은 데이터셋을 게시한 경우
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _write_part(self, staging: str, name: str, part: Any) -> Dict[str, Any]:
+        """DataFrame, ndarray 또는 희소 행렬 하나를 기록"""
+        if isinstance(part, pd.DataFrame):
+            return {'type': 'frame', 'name': name, **self._write_frame(staging, name, part)}
+        if isinstance(part, np.ndarray):
+            np.save(os.path.join(staging, f'{name}.npy'), part)
+            return {'type': 'array', 'name': name}
+        if sp.issparse(part):
+            csr = sp.csr_matrix(part)
+            for attr in ('data', 'indices', 'indptr'):
+                np.save(os.path.join(staging, f'{name}.{attr}.npy'), getattr(csr, attr))
+            return {'type': 'sparse', 'name': name, 'shape': list(csr.shape)}
+        raise TypeError(f"저장할 수 없는 결과 유형입니다: {type(part).__name__}")
+
+    def _write_frame(self, staging: str, name: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """DataFrame을 컬럼별 .npy 파일로 기록"""
+        if not isinstance(df.index, pd.RangeIndex):
+            raise ValueError("RangeIndex를 가진 DataFrame만 저장할 수 있습니다")
+
+        frame_dir = os.path.join(staging, name)
+        os.makedirs(frame_dir)
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            spec = _column_spec(col, df[col], f'{i:04d}.npy')
+            np.save(os.path.join(frame_dir, spec['file']), _encode_column(df[col], spec))
+            columns.append(spec)
+
+        index = df.index
+        return {
+            'columns': columns,
+            'index': [index.start, index.stop, index.step]
+        }
+
+    def _read_part(self, directory: str, part: Dict[str, Any]) -> Any:
+        """매니페스트 항목 하나를 로드"""
+        if part['type'] == 'array':
+            return np.load(os.path.join(directory, f"{part['name']}.npy"), mmap_mode='c').view(np.ndarray)
+        if part['type'] == 'sparse':
+            arrays = [
+                np.load(os.path.join(directory, f"{part['name']}.{attr}.npy"), mmap_mode='c').view(np.ndarray)
+                for attr in ('data', 'indices', 'indptr')
+            ]
+            return sp.csr_matrix(tuple(arrays), shape=tuple(part['shape']), copy=False)
+
+        frame_dir = os.path.join(directory, part['name'])
+        data = {}
+        for spec in part['columns']:
+            # mmap_mode='c': 페이지는 프로세스 간 공유되고, 쓰기 시에만 사본이 생김
+            values = np.load(os.path.join(frame_dir, spec['file']), mmap_mode='c').view(np.ndarray)
+
+            if spec['kind'] == 'categorical':
+                data[spec['name']] = pd.Categorical.from_codes(
+                    values, categories=spec['categories'], ordered=spec['ordered'])
+            elif spec['kind'] == 'string':
+                categorical = pd.Categorical.from_codes(values, categories=spec['categories'])
+                data[spec['name']] = pd.Series(categorical).astype(spec['dtype']).array
+            else:
+                data[spec['name']] = values
+
+        return pd.DataFrame(data, index=pd.RangeIndex(*part['index']), copy=False)
+
+
+# 전역 데이터셋 저장소
+dataset_store = DatasetStore()
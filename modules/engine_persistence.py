@@ -0,0 +1,607 @@
+"""
+적응형 학습 엔진 상태 보존 모듈
+- 엔진이 받아들인 상호작용만 같은 잠금 안에서 로그(WAL)에 추가 (거부된 상호작용은 기록하지 않음)
+- 로그 레코드는 길이 + CRC32 헤더를 가진 고정 레이아웃 바이너리 (배치는 컬럼 단위)
+- fsync는 레코드 수 또는 시간 간격 단위로 묶어서 수행
+- 주기적으로 프로필과 집계만 스냅샷으로 저장하고, 상호작용 기록 컬럼은 추가 전용 파일에 이어 씀
+- 새 스냅샷을 검증한 뒤에만 이전 스냅샷 하나와 그 이후 로그를 남기고 나머지 삭제
+- 재시작 시 최신 스냅샷을 읽고 그 이후 로그만 재생 (재시작 시간은 스냅샷 간격에 비례)
+"""
+
+import glob
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .adaptive_learning_engine import (
+    AdaptiveLearningEngine, INTERACTION_TYPES, InteractionStore, InteractionType,
+    LearningInteraction, _INTERACTION_TYPE_CODES, validate_interaction
+)
+
+
+# 저장 형식이 바뀌면 올려서 이전 파일과 구분
+# (1: 엔진 전체 pickle, 2: 상호작용 기록을 제외한 엔진 상태 + 기록 파일 범위)
+ENGINE_STATE_FORMAT_VERSION = 2
+
+DEFAULT_STATE_DIR = os.environ.get(
+    'ENGINE_STATE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.engine_state')
+)
+
+DEFAULT_SNAPSHOT_EVERY = 100_000  # 스냅샷 사이 최대 상호작용 수
+DEFAULT_SYNC_EVERY = 256          # fsync 사이 최대 레코드 수
+DEFAULT_SYNC_INTERVAL = 0.05      # 기록 후 fsync까지 최대 지연 (초)
+
+# 레코드 헤더: 본문 길이, CRC32(종류 + LSN + 본문), 레코드 종류, LSN
+_HEADER = struct.Struct('<IIBQ')
+_RECORD_INTERACTION = 1  # 상호작용 한 건 (track_interaction)
+_RECORD_BATCH = 2        # 상호작용 배치 (track_interactions_batch)
+
+# 상호작용 한 건: 시각(ns), UTC 오프셋(분), 유형, 소요 시간, 성공, 난이도, 힌트, 시도, 신뢰도,
+# 사용자 ID 길이, 콘텐츠 ID 길이 (뒤에 UTF-8 ID 문자열)
+_INTERACTION = struct.Struct('<qhBibb?hbHH')
+_NAIVE_OFFSET = -32768  # 시간대 없는 시각
+
+# 배치 컬럼 (이름, dtype) 순서 = 본문 배치 순서
+_BATCH_COLUMNS = [
+    ('timestamp', np.int64), ('utc_offset', np.int16), ('interaction_type', np.int8),
+    ('duration', np.int32), ('success', np.int8), ('difficulty_level', np.int8),
+    ('hint_used', np.bool_), ('attempts', np.int16), ('confidence_level', np.int8),
+    ('user', np.int32), ('content', np.int32)
+]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _timestamp_fields(timestamp: datetime) -> Tuple[int, int]:
+    """시각을 (UTC 기준 epoch ns, UTC 오프셋 분)으로 변환"""
+    if timestamp.tzinfo is None:
+        return (timestamp - _EPOCH) // timedelta(microseconds=1) * 1000, _NAIVE_OFFSET
+    offset = timestamp.utcoffset() // timedelta(minutes=1)
+    utc = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (utc - _EPOCH) // timedelta(microseconds=1) * 1000, offset
+
+
+def _to_datetime(timestamp_ns: int, offset: int) -> datetime:
+    """_timestamp_fields의 역변환"""
+    timestamp = _EPOCH + timedelta(microseconds=int(timestamp_ns) // 1000)
+    if offset == _NAIVE_OFFSET:
+        return timestamp
+    return timestamp.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(minutes=int(offset))))
+
+
+def encode_interaction(interaction: LearningInteraction) -> bytes:
+    """상호작용 한 건을 레코드 본문으로 직렬화"""
+    timestamp_ns, offset = _timestamp_fields(interaction.timestamp)
+    user_id = interaction.user_id.encode('utf-8')
+    content_id = interaction.content_id.encode('utf-8')
+    return _INTERACTION.pack(
+        timestamp_ns, offset, _INTERACTION_TYPE_CODES[interaction.interaction_type],
+        interaction.duration, -1 if interaction.success is None else int(interaction.success),
+        interaction.difficulty_level, interaction.hint_used, interaction.attempts,
+        -1 if interaction.confidence_level is None else interaction.confidence_level,
+        len(user_id), len(content_id)
+    ) + user_id + content_id
+
+
+def decode_interaction(body: bytes) -> LearningInteraction:
+    """encode_interaction의 역변환"""
+    (timestamp_ns, offset, type_code, duration, success, difficulty, hint_used, attempts,
+     confidence, user_len, content_len) = _INTERACTION.unpack_from(body)
+    start = _INTERACTION.size
+    return LearningInteraction(
+        user_id=body[start:start + user_len].decode('utf-8'),
+        timestamp=_to_datetime(timestamp_ns, offset),
+        interaction_type=INTERACTION_TYPES[type_code],
+        content_id=body[start + user_len:start + user_len + content_len].decode('utf-8'),
+        duration=duration,
+        success=None if success < 0 else bool(success),
+        difficulty_level=difficulty,
+        hint_used=hint_used,
+        attempts=attempts,
+        confidence_level=None if confidence < 0 else confidence
+    )
+
+
+def encode_batch(frame: pd.DataFrame) -> bytes:
+    """LearningInteraction 필드명 컬럼의 DataFrame을 컬럼 단위 레코드 본문으로 직렬화"""
+    n = len(frame)
+    timestamps = frame['timestamp']
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        utc = timestamps.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64)
+        local = timestamps.dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64)
+        offsets = (local - utc) // 60_000_000_000
+    elif timestamps.dtype.kind == 'M':
+        utc = timestamps.to_numpy('datetime64[ns]').view(np.int64)
+        offsets = np.full(n, _NAIVE_OFFSET)
+    else:
+        fields = [_timestamp_fields(timestamp) for timestamp in timestamps]
+        utc = np.array([field[0] for field in fields], dtype=np.int64)
+        offsets = np.array([field[1] for field in fields], dtype=np.int64)
+
+    type_codes, type_values = pd.factorize(frame['interaction_type'])
+    user_codes, user_ids = pd.factorize(frame['user_id'])
+    content_codes, content_ids = pd.factorize(frame['content_id'])
+    columns = {
+        'timestamp': utc,
+        'utc_offset': offsets,
+        'interaction_type': np.array([_INTERACTION_TYPE_CODES[InteractionType(t)]
+                                      for t in type_values], dtype=np.int8)[type_codes],
+        'duration': frame['duration'].to_numpy(),
+        'success': InteractionStore._encode_optional(frame['success'], bool),
+        'difficulty_level': frame['difficulty_level'].to_numpy(),
+        'hint_used': frame['hint_used'].to_numpy() if 'hint_used' in frame else np.zeros(n, bool),
+        'attempts': frame['attempts'].to_numpy() if 'attempts' in frame else np.ones(n),
+        'confidence_level': (InteractionStore._encode_optional(frame['confidence_level'], int)
+                             if 'confidence_level' in frame else np.full(n, -1)),
+        'user': user_codes,
+        'content': content_codes
+    }
+
+    parts = [struct.pack('<I', n)]
+    parts.extend(np.ascontiguousarray(columns[name], dtype).tobytes() for name, dtype in _BATCH_COLUMNS)
+    for ids in (user_ids, content_ids):
+        table = '\0'.join(str(value) for value in ids).encode('utf-8')
+        parts.append(struct.pack('<II', len(ids), len(table)))
+        parts.append(table)
+    return b''.join(parts)
+
+
+def decode_batch(body: bytes) -> pd.DataFrame:
+    """encode_batch의 역변환 (track_interactions_batch 입력 형식)"""
+    n, = struct.unpack_from('<I', body)
+    offset = 4
+    columns = {}
+    for name, dtype in _BATCH_COLUMNS:
+        columns[name] = np.frombuffer(body, dtype, n, offset)
+        offset += n * np.dtype(dtype).itemsize
+    tables = []
+    for _ in range(2):
+        count, size = struct.unpack_from('<II', body, offset)
+        offset += 8
+        table = body[offset:offset + size].decode('utf-8')
+        tables.append(np.array(table.split('\0') if count else [], dtype=object))
+        offset += size
+
+    utc_offsets = columns['utc_offset']
+    if (utc_offsets == _NAIVE_OFFSET).all():
+        timestamps = columns['timestamp'].view('datetime64[ns]')
+    else:
+        timestamps = [_to_datetime(ts, off) for ts, off in zip(columns['timestamp'].tolist(),
+                                                               utc_offsets.tolist())]
+    success = columns['success']
+    confidence = columns['confidence_level']
+    return pd.DataFrame({
+        'user_id': tables[0][columns['user']],
+        'timestamp': timestamps,
+        'interaction_type': np.array(INTERACTION_TYPES, dtype=object)[columns['interaction_type']],
+        'content_id': tables[1][columns['content']],
+        'duration': columns['duration'],
+        'success': np.where(success < 0, np.nan, success),
+        'difficulty_level': columns['difficulty_level'],
+        'hint_used': columns['hint_used'],
+        'attempts': columns['attempts'],
+        'confidence_level': np.where(confidence < 0, np.nan, confidence)
+    })
+
+
+def _fsync_directory(directory: str):
+    """디렉토리 항목(생성/이름 변경/삭제)을 디스크에 반영"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class InteractionLog:
+    """추가 전용 상호작용 로그 (세그먼트 파일 단위)
+
+    세그먼트 파일 이름은 첫 LSN을 담은 wal-<LSN>.log이다. 기록은 버퍼에 쓰고, 마지막
+    fsync 이후 sync_every개 레코드가 쌓이거나 sync_interval초가 지나면 한 번에 fsync한다.
+    읽을 때는 길이나 CRC가 맞지 않거나 LSN이 이어지지 않는 첫 레코드에서 멈춘다. 그 뒤의
+    레코드는 재생할 수 없으므로 .corrupt 파일로 옮겨 두고 이후 기록이 이어지도록 한다.
+    """
+
+    def __init__(self, directory: str, sync_every: int = DEFAULT_SYNC_EVERY,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        self.directory = directory
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self.next_lsn = 1
+        self._file = None
+        self._pending = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self.syncs = 0
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """(첫 LSN, 경로) 세그먼트 목록 (LSN 순)"""
+        paths = glob.glob(os.path.join(self.directory, 'wal-*.log'))
+        return sorted((int(os.path.basename(path)[4:-4]), path) for path in paths)
+
+    def read(self, after_lsn: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+        """after_lsn 이후 레코드 (LSN, 종류, 본문)
+
+        손상되었거나 LSN이 건너뛴 첫 레코드에서 멈춘다. 해당 세그먼트는 그 위치에서 잘라
+        내고, 잘린 꼬리와 이후 세그먼트는 <세그먼트>.corrupt로 옮긴다.
+        """
+        segments = self.segments()
+        expected = after_lsn + 1
+        for index, (_, path) in enumerate(segments):
+            if index + 1 < len(segments) and segments[index + 1][0] <= expected:
+                continue  # 모든 레코드가 after_lsn 이전인 세그먼트
+            with open(path, 'rb') as f:
+                data = f.read()
+            offset = 0
+            while offset + _HEADER.size <= len(data):
+                length, crc, kind, lsn = _HEADER.unpack_from(data, offset)
+                end = offset + _HEADER.size + length
+                if end > len(data) or zlib.crc32(data[offset + 8:end]) != crc:
+                    break
+                if lsn > after_lsn:
+                    if lsn != expected:
+                        break
+                    expected += 1
+                    yield lsn, kind, data[offset + _HEADER.size:end]
+                self.next_lsn = max(self.next_lsn, lsn + 1)
+                offset = end
+            if offset < len(data):
+                self._set_aside(path, data[offset:], [later for _, later in segments[index + 1:]])
+                return
+
+    def append(self, kind: int, body: bytes) -> int:
+        """레코드 추가 후 LSN 반환 (fsync는 묶어서 수행)"""
+        with self._lock:
+            lsn = self.next_lsn
+            header = _HEADER.pack(len(body), 0, kind, lsn)
+            crc = zlib.crc32(body, zlib.crc32(header[8:]))
+            if self._file is None:
+                self._open_segment(lsn)
+            self._file.write(_HEADER.pack(len(body), crc, kind, lsn))
+            self._file.write(body)
+            self.next_lsn = lsn + 1
+            self._pending += 1
+
+            if self._pending >= self.sync_every:
+                self.sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+            return lsn
+
+    def sync(self):
+        """버퍼에 쌓인 레코드를 디스크에 반영"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._file is None or self._pending == 0:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+            self.syncs += 1
+
+    def rotate(self) -> int:
+        """현재 세그먼트를 닫고 다음 기록부터 새 세그먼트 사용 (마지막 LSN 반환)"""
+        with self._lock:
+            self.sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            return self.next_lsn - 1
+
+    def remove_segments_before(self, lsn: int):
+        """lsn 이전에 시작한 (스냅샷에 포함된) 세그먼트 삭제"""
+        with self._lock:
+            for start, path in self.segments():
+                if start < lsn and (self._file is None or path != self._file.name):
+                    os.remove(path)
+            _fsync_directory(self.directory)
+
+    def close(self):
+        """남은 레코드를 반영하고 세그먼트 닫기"""
+        self.rotate()
+
+    def _set_aside(self, path: str, tail: bytes, later: List[str]):
+        """재생할 수 없는 꼬리와 이후 세그먼트를 .corrupt 파일로 옮김"""
+        with open(f'{path}.corrupt', 'wb') as f:
+            f.write(tail)
+            os.fsync(f.fileno())
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - len(tail))
+            os.fsync(f.fileno())
+        for later_path in later:
+            os.replace(later_path, f'{later_path}.corrupt')
+        _fsync_directory(self.directory)
+
+    def _open_segment(self, lsn: int):
+        path = os.path.join(self.directory, f'wal-{lsn:020d}.log')
+        self._file = open(path, 'ab')
+        _fsync_directory(self.directory)
+
+
+class HistoryStore:
+    """상호작용 기록 컬럼의 추가 전용 파일 저장소
+
+    InteractionStore의 컬럼마다 history/<컬럼>.bin에 원시 배열을, 사용자/콘텐츠 ID는
+    NUL로 끝나는 UTF-8 문자열로 이어 쓴다. 스냅샷은 자신이 포함하는 행 수와 ID 파일 길이
+    (manifest)만 기록하므로, 파일 끝에 더 쓰인 내용이 있어도 각 스냅샷은 자기 범위만 읽는다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.join(directory, 'history')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, store: InteractionStore, manifest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """manifest 이후에 추가된 행과 ID를 이어 쓰고 새 manifest 반환"""
+        manifest = manifest or {'rows': 0, 'user_ids': (0, 0), 'content_ids': (0, 0)}
+        for name, dtype in InteractionStore.COLUMNS.items():
+            itemsize = np.dtype(dtype).itemsize
+            column = store.column(name)
+            self._append(self._path(name), manifest['rows'] * itemsize,
+                         lambda start: column[start // itemsize:].tobytes())
+        result = {'rows': len(store), 'aware': store.aware, 'tzinfo': store.tzinfo}
+        for name, ids in (('user_ids', store.user_ids), ('content_ids', store.content_ids)):
+            count, size = manifest[name]
+            size = self._append(self._path(name), size,
+                                lambda start: self._encode_ids(ids[count if start else 0:]))
+            result[name] = (len(ids), size)
+        return result
+
+    def load(self, manifest: Dict[str, Any]) -> InteractionStore:
+        """manifest 범위의 기록으로 InteractionStore 복원 (파일이 짧으면 ValueError)"""
+        rows = manifest['rows']
+        columns = {}
+        for name, dtype in InteractionStore.COLUMNS.items():
+            columns[name] = np.fromfile(self._path(name), dtype=dtype, count=rows)
+            if len(columns[name]) != rows:
+                raise ValueError(f"상호작용 기록 파일이 짧습니다: {name}")
+        ids = []
+        for name in ('user_ids', 'content_ids'):
+            count, size = manifest[name]
+            with open(self._path(name), 'rb') as f:
+                data = f.read(size)
+            values = data.decode('utf-8').split('\0')[:-1] if size else []
+            if len(data) != size or len(values) != count:
+                raise ValueError(f"상호작용 기록 파일이 짧습니다: {name}")
+            ids.append(values)
+        return InteractionStore.from_columns(columns, ids[0], ids[1], manifest['aware'], manifest['tzinfo'])
+
+    def check(self, manifest: Dict[str, Any]) -> bool:
+        """manifest 범위가 모두 파일에 있는지"""
+        sizes = [(name, manifest['rows'] * np.dtype(dtype).itemsize)
+                 for name, dtype in InteractionStore.COLUMNS.items()]
+        sizes += [(name, manifest[name][1]) for name in ('user_ids', 'content_ids')]
+        return all(os.path.exists(self._path(name)) and os.path.getsize(self._path(name)) >= size
+                   for name, size in sizes)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.bin')
+
+    @staticmethod
+    def _encode_ids(ids: List[str]) -> bytes:
+        return b''.join(value.encode('utf-8') + b'\0' for value in ids)
+
+    @staticmethod
+    def _append(path: str, size: int, payload: Callable[[int], bytes]) -> int:
+        """파일을 size 바이트로 맞춘 뒤 payload(시작 위치)를 이어 쓰고 fsync
+
+        이전 스냅샷 이후에 쓰인 내용(검증되지 않은 스냅샷의 기록)은 잘라 내고, 파일이
+        size보다 짧으면 처음부터 다시 쓴다. 쓴 뒤의 파일 크기를 반환한다.
+        """
+        with open(path, 'a+b') as f:
+            start = size if os.path.getsize(path) >= size else 0
+            f.truncate(start)
+            f.write(payload(start))
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+
+class PersistentLearningEngine:
+    """로그 선행 기록과 스냅샷으로 상태를 보존하는 적응형 학습 엔진
+
+    상호작용은 로그 레코드로 변환한 뒤 엔진에 반영하고, 엔진이 받아들인 경우에만 같은 잠금
+    안에서 로그에 추가한다. 따라서 엔진이 거부한 상호작용(예: 저장소와 시간대 방식이 다른
+    시각)은 로그에 남지 않아 재시작을 막지 않는다. 이전 버전이 남긴 로그에 그런 레코드가
+    있으면 재생 중 건너뛰고 recovery["rejected_records"]에 센다.
+
+    snapshot_every개의 상호작용마다 상호작용 기록 컬럼을 HistoryStore에 이어 쓰고, 기록을
+    제외한 엔진 상태(프로필, 집계, 지식 상태)를 스냅샷으로 저장한다. 스냅샷 크기는 기록 길이가 아니라 사용자/주제 수에
+    비례한다. 새 스냅샷을 다시 읽어 검증한 뒤에야 직전 스냅샷 하나와 그 이후 로그 세그먼트만
+    남기고 나머지를 삭제하므로, 최신 스냅샷이 손상되면 직전 스냅샷과 로그로 복원한다.
+    추천 등 나머지 호출은 내부 엔진에 그대로 위임한다.
+
+    fsync를 묶어서 하므로 프로세스가 아니라 장비가 중단되면 마지막 sync_interval초
+    이내의 기록은 잃을 수 있다. 즉시 보존이 필요하면 sync()를 호출한다.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STATE_DIR,
+                 engine_factory: Callable[[], AdaptiveLearningEngine] = AdaptiveLearningEngine,
+                 snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+                 sync_every: int = DEFAULT_SYNC_EVERY,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.log = InteractionLog(directory, sync_every, sync_interval)
+        self.history = HistoryStore(directory)
+        self._lock = threading.RLock()
+        self._since_snapshot = 0
+        self.snapshot_lsn = 0
+        self._manifest: Optional[Dict[str, Any]] = None  # 최신 스냅샷이 포함하는 기록 범위
+        self.recovery: Dict[str, Any] = {}
+        self.engine = self._recover(engine_factory)
+
+    def __getattr__(self, name: str) -> Any:
+        # 읽기 전용 호출(추천, 예측, 분석)은 내부 엔진에 위임
+        if name == 'engine':
+            raise AttributeError(name)
+        return getattr(self.engine, name)
+
+    def track_interaction(self, interaction: LearningInteraction):
+        """상호작용을 엔진에 반영하고, 반영되면 로그에 기록"""
+        interaction = validate_interaction(interaction)
+        body = encode_interaction(interaction)
+        with self._lock:
+            self.engine.track_interaction(interaction)
+            self.log.append(_RECORD_INTERACTION, body)
+            self._after_write(1)
+
+    def track_interactions_batch(self, interactions) -> Dict[str, Any]:
+        """상호작용 배치를 엔진에 일괄 반영하고, 반영되면 로그에 한 레코드로 기록
+
+        엔진의 일괄 경로는 저장소에 쓰기 전에 배치 전체를 변환하므로, 거부된 배치는
+        엔진에도 로그에도 남지 않는다.
+        """
+        frame = self.engine._interaction_frame(interactions)
+        body = encode_batch(frame)
+        with self._lock:
+            metrics = self.engine.track_interactions_batch(frame)
+            self.log.append(_RECORD_BATCH, body)
+            self._after_write(len(frame))
+        return metrics
+
+    def sync(self):
+        """기록된 상호작용을 즉시 디스크에 반영"""
+        self.log.sync()
+
+    def snapshot(self) -> str:
+        """상호작용 기록을 이어 쓰고 엔진 상태 스냅샷 저장
+
+        새 스냅샷을 다시 읽어 검증한 뒤, 직전 스냅샷 하나와 그 이후 로그 세그먼트만 남긴다.
+        검증에 실패하면 새 스냅샷을 지우고 예외를 일으키며 기존 파일은 그대로 둔다.
+        """
+        with self._lock:
+            lsn = self.log.rotate()
+            manifest = self.history.write(self.engine.interaction_history, self._manifest)
+            _fsync_directory(self.history.directory)
+            state = self.engine.__getstate__()
+            state.pop('interaction_history')
+
+            path = os.path.join(self.directory, f'snapshot-{lsn:020d}.pkl')
+            staging = f'{path}.{os.getpid()}.tmp'
+            with open(staging, 'wb') as f:
+                pickle.dump({'format': ENGINE_STATE_FORMAT_VERSION, 'lsn': lsn,
+                             'engine_class': type(self.engine), 'engine': state, 'history': manifest},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(staging, path)
+            _fsync_directory(self.directory)
+
+            try:
+                written = self._read_snapshot(path)
+                if written['lsn'] != lsn or not self.history.check(written['history']):
+                    raise ValueError(f"스냅샷 검증 실패: {path}")
+            except BaseException:
+                os.remove(path)
+                _fsync_directory(self.directory)
+                raise
+
+            previous = [(old_lsn, old_path) for old_lsn, old_path in self._snapshots() if old_lsn < lsn]
+            for _, old_path in previous[:-1]:
+                os.remove(old_path)
+            # 첫 스냅샷이면 로그를 처음부터 유지 (스냅샷이 손상되어도 전체 재생 가능)
+            self.log.remove_segments_before((previous[-1][0] if previous else 0) + 1)
+            self.snapshot_lsn = lsn
+            self._manifest = manifest
+            self._since_snapshot = 0
+            return path
+
+    def close(self):
+        """남은 로그를 반영하고 닫기"""
+        with self._lock:
+            self.log.close()
+
+    def _after_write(self, n_events: int):
+        self._since_snapshot += n_events
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _snapshots(self) -> List[Tuple[int, str]]:
+        """(LSN, 경로) 스냅샷 목록 (LSN 순)"""
+        paths = glob.glob(os.path.join(self.directory, 'snapshot-*.pkl'))
+        return sorted((int(os.path.basename(path)[9:-4]), path) for path in paths)
+
+    @staticmethod
+    def _read_snapshot(path: str) -> Dict[str, Any]:
+        """스냅샷 파일 읽기"""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _restore(self, state: Dict[str, Any]) -> AdaptiveLearningEngine:
+        """스냅샷 상태와 기록 파일로 엔진 복원"""
+        if state.get('format') == 1:
+            return state['engine']  # 엔진 전체를 저장한 이전 형식
+        if state.get('format') != ENGINE_STATE_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식: {state.get('format')}")
+        engine_class = state['engine_class']
+        engine = engine_class.__new__(engine_class)
+        engine.__setstate__(dict(state['engine'], interaction_history=self.history.load(state['history'])))
+        return engine
+
+    def _recover(self, engine_factory: Callable[[], AdaptiveLearningEngine]) -> AdaptiveLearningEngine:
+        """최신 스냅샷 로드 후 로그 꼬리 재생
+
+        읽을 수 없는 스냅샷은 <스냅샷>.corrupt로 옮기고 직전 스냅샷으로 복원한다.
+        """
+        started = time.perf_counter()
+        engine, lsn = None, 0
+        for _, path in reversed(self._snapshots()):
+            try:
+                state = self._read_snapshot(path)
+                engine = self._restore(state)
+            except Exception:
+                # 손상된 스냅샷은 옮겨 두고 직전 스냅샷 사용
+                os.replace(path, f'{path}.corrupt')
+                continue
+            lsn = state['lsn']
+            self._manifest = state.get('history')
+            break
+        if engine is None:
+            engine = engine_factory()
+        loaded = time.perf_counter()
+
+        replayed = rejected = 0
+        for _, kind, body in self.log.read(after_lsn=lsn):
+            try:
+                if kind == _RECORD_INTERACTION:
+                    engine.track_interaction(decode_interaction(body))
+                    replayed += 1
+                elif kind == _RECORD_BATCH:
+                    frame = decode_batch(body)
+                    engine.track_interactions_batch(frame)
+                    replayed += len(frame)
+            except (TypeError, ValueError):
+                # 엔진이 거부하는 레코드 (이전 버전이 반영 전에 기록한 것)는 건너뜀
+                rejected += 1
+        self.log.next_lsn = max(self.log.next_lsn, lsn + 1)
+
+        self.snapshot_lsn = lsn
+        self._since_snapshot = replayed
+        self.recovery = {
+            "snapshot_lsn": lsn,
+            "replayed_events": replayed,
+            "rejected_records": rejected,
+            "snapshot_seconds": loaded - started,
+            "replay_seconds": time.perf_counter() - loaded
+        }
+        return engine
@@ -0,0 +1,283 @@
+"""
+샤딩된 적응형 학습 엔진 모듈
+- 사용자 ID의 안정적인 해시(crc32)로 사용자를 작업 프로세스(샤드)에 분배
+- 각 샤드 프로세스가 AdaptiveLearningEngine 하나를 소유 (상태 디렉토리를 주면 WAL로 보존)
+- 라우터가 사용자 단위 호출을 해당 샤드로 전달하고, 전체 사용자 분석은 scatter/gather로 수집
+- 상호작용 추적은 라우터에서 검증한 뒤 샤드별로 모아서 전송 (같은 샤드에 대한 이후 호출은
+  먼저 보낸 기록을 반영)
+- 샤드에서 실패한 상호작용은 건별로 건너뛰고 샤드 지표에 집계 (다른 호출에 오류를 전달하지 않음)
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .adaptive_learning_engine import (
+    AdaptiveLearningEngine, ContentRecommendation, LearningInteraction, validate_interaction
+)
+
+
+DEFAULT_MAX_PENDING = 512  # 샤드별로 모아서 보낼 최대 상호작용 수
+
+
+def shard_for(user_id: str, n_shards: int) -> int:
+    """사용자 ID의 샤드 번호 (프로세스/실행과 무관하게 고정)"""
+    return zlib.crc32(user_id.encode('utf-8')) % n_shards
+
+
+def _shard_worker(conn, state_dir: Optional[str]):
+    """샤드 프로세스 본체: 요청을 순서대로 처리
+
+    메시지는 (종류, 메서드, args, kwargs)이다. 'call'은 결과나 그 호출의 예외를 응답하고
+    'cast'는 응답하지 않는다. cast로 보낸 상호작용은 건별로 반영하므로 한 건이 실패해도
+    나머지는 반영되며, 실패는 stats의 errors/last_error로만 드러나고 이후 호출에는 영향이 없다.
+    """
+    if state_dir:
+        from .engine_persistence import PersistentLearningEngine
+        engine = PersistentLearningEngine(state_dir)
+    else:
+        engine = AdaptiveLearningEngine()
+    errors = {"errors": 0, "last_error": None}
+
+    def record_error(exc: BaseException):
+        errors["errors"] += 1
+        errors["last_error"] = f"{type(exc).__name__}: {exc}"
+
+    def track_many(interactions: List[LearningInteraction]):
+        for interaction in interactions:
+            try:
+                engine.track_interaction(interaction)
+            except Exception as exc:
+                record_error(exc)
+
+    def stats() -> Dict[str, Any]:
+        return {"learners": len(engine.learner_profiles), "interactions": len(engine.interaction_history),
+                **errors}
+
+    handlers = {"track_many": track_many, "stats": stats}
+    while True:
+        try:
+            kind, method, args, kwargs = conn.recv()
+        except EOFError:
+            break
+        if kind == 'stop':
+            break
+        try:
+            handler = handlers.get(method) or getattr(engine, method)
+            result = handler(*args, **kwargs)
+        except Exception as exc:
+            if kind == 'call':
+                conn.send(('error', exc))
+            else:
+                record_error(exc)
+            continue
+        if kind == 'call':
+            conn.send(('ok', result))
+
+    if state_dir:
+        engine.close()
+    conn.close()
+
+
+class ShardedLearningEngine:
+    """사용자 해시로 분할된 다중 프로세스 적응형 학습 엔진 라우터
+
+    사용자별 상태는 한 샤드에만 있으므로 사용자 단위 호출 결과는 단일 엔진과 같다.
+    track_interaction은 상호작용을 검증해 잘못된 입력은 호출자에게 바로 예외로 알리고,
+    샤드별 버퍼에 모았다가 max_pending개마다(또는 그 샤드에 대한 다음 호출 전에) 한 메시지로
+    보낸다. 파이프는 순서를 보장하므로 기록 직후의 추천 요청도 기록을 반영한 결과를 받는다.
+    검증을 통과했지만 샤드에서 실패한 상호작용(예: 시간대 방식이 다른 시각)은 그 건만
+    건너뛰며 shard_metrics()의 errors로 확인한다.
+    """
+
+    def __init__(self, n_shards: Optional[int] = None, state_dir: Optional[str] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        self.n_shards = n_shards or os.cpu_count() or 1
+        self.max_pending = max_pending
+        # 스레드가 있는 부모 프로세스를 fork하지 않도록 spawn 사용
+        context = multiprocessing.get_context('spawn')
+        self._connections = []
+        self._processes = []
+        for shard in range(self.n_shards):
+            parent, child = context.Pipe()
+            shard_dir = os.path.join(state_dir, f'shard-{shard:03d}') if state_dir else None
+            process = context.Process(target=_shard_worker, args=(child, shard_dir),
+                                      name=f'engine-shard-{shard}', daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self._pending: List[List[LearningInteraction]] = [[] for _ in range(self.n_shards)]
+        self._locks = [threading.Lock() for _ in range(self.n_shards)]
+
+    def __enter__(self) -> 'ShardedLearningEngine':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def shard_of(self, user_id: str) -> int:
+        """사용자의 샤드 번호"""
+        return shard_for(user_id, self.n_shards)
+
+    # 사용자 단위 호출
+    def track_interaction(self, interaction: LearningInteraction):
+        """학습 상호작용 추적 (검증 후 샤드별로 모아서 전송, 잘못된 입력은 ValueError/TypeError)"""
+        interaction = validate_interaction(interaction)
+        shard = self.shard_of(interaction.user_id)
+        with self._locks[shard]:
+            pending = self._pending[shard]
+            pending.append(interaction)
+            if len(pending) >= self.max_pending:
+                self._send_pending(shard)
+
+    def generate_content_recommendations(self, user_id: str,
+                                         num_recommendations: int = 5) -> List[ContentRecommendation]:
+        """개인화된 콘텐츠 추천 생성 (사용자 샤드에서 계산)"""
+        return self._call(self.shard_of(user_id), 'generate_content_recommendations',
+                          user_id, num_recommendations)
+
+    def predict_learning_outcome(self, user_id: str, content_id: str) -> Dict[str, Any]:
+        """학습 결과 예측 (사용자 샤드에서 계산)"""
+        return self._call(self.shard_of(user_id), 'predict_learning_outcome', user_id, content_id)
+
+    # 여러 샤드에 걸친 호출
+    def track_interactions_batch(self, interactions) -> Dict[str, Any]:
+        """상호작용 배치를 샤드별로 나눠 동시에 일괄 추적"""
+        started = time.perf_counter()
+        frame = AdaptiveLearningEngine._interaction_frame(interactions)
+        user_ids, inverse = np.unique(frame['user_id'].to_numpy(dtype=object), return_inverse=True)
+        shards = np.array([self.shard_of(user_id) for user_id in user_ids], dtype=np.intp)[inverse]
+        parts = {shard: frame[shards == shard] for shard in np.unique(shards).tolist()}
+
+        results = self._scatter('track_interactions_batch', {shard: (part,) for shard, part in parts.items()})
+        elapsed = time.perf_counter() - started
+        return {
+            "events": len(frame),
+            "users": sum(result["users"] for result in results.values()),
+            "sequential_users": sum(result["sequential_users"] for result in results.values()),
+            "shards": len(results),
+            "seconds": elapsed,
+            "events_per_second": len(frame) / elapsed if elapsed > 0 else float('inf')
+        }
+
+    def generate_recommendations_batch(self, user_ids: Optional[Sequence[str]] = None,
+                                       num_recommendations: int = 5) -> Dict[str, List[ContentRecommendation]]:
+        """여러 사용자의 추천을 샤드별로 동시에 생성 (기본값: 전체 사용자)"""
+        if user_ids is None:
+            requests = {shard: (None, num_recommendations) for shard in range(self.n_shards)}
+        else:
+            by_shard: Dict[int, List[str]] = {}
+            for user_id in user_ids:
+                by_shard.setdefault(self.shard_of(user_id), []).append(user_id)
+            requests = {shard: (ids, num_recommendations) for shard, ids in by_shard.items()}
+
+        recommendations = {}
+        for result in self._scatter('generate_recommendations_batch', requests).values():
+            recommendations.update(result)
+        return recommendations
+
+    def get_interaction_analytics(self) -> pd.DataFrame:
+        """사용자별 상호작용 요약 (모든 샤드 결과를 합침)"""
+        frames = self._scatter('get_interaction_analytics',
+                               {shard: () for shard in range(self.n_shards)})
+        return pd.concat([frames[shard] for shard in range(self.n_shards)])
+
+    def shard_metrics(self) -> List[Dict[str, Any]]:
+        """샤드별 학습자 수, 상호작용 수, 반영하지 못한 상호작용 수와 마지막 오류"""
+        stats = self._scatter('stats', {shard: () for shard in range(self.n_shards)})
+        return [stats[shard] for shard in range(self.n_shards)]
+
+    def flush(self):
+        """모아 둔 상호작용을 모두 전송하고 반영될 때까지 대기"""
+        self._scatter('stats', {shard: () for shard in range(self.n_shards)})
+
+    def close(self):
+        """모아 둔 상호작용을 반영하고 샤드 프로세스 종료"""
+        if not self._processes:
+            return
+        self.flush()
+        for conn in self._connections:
+            conn.send(('stop', None, (), {}))
+        for process in self._processes:
+            process.join()
+        for conn in self._connections:
+            conn.close()
+        self._processes = []
+
+    # 내부 통신
+    def _send_pending(self, shard: int):
+        """샤드 버퍼의 상호작용을 한 메시지로 전송 (샤드 잠금 안에서 호출)"""
+        pending = self._pending[shard]
+        if pending:
+            self._connections[shard].send(('cast', 'track_many', (pending,), {}))
+            self._pending[shard] = []
+
+    def _call(self, shard: int, method: str, *args, **kwargs) -> Any:
+        """샤드 메서드 호출 후 결과 대기"""
+        with self._locks[shard]:
+            self._send_pending(shard)
+            self._connections[shard].send(('call', method, args, kwargs))
+            return self._result(self._connections[shard].recv())
+
+    def _scatter(self, method: str, requests: Dict[int, tuple]) -> Dict[int, Any]:
+        """여러 샤드에 요청을 먼저 모두 보낸 뒤 결과 수집 (샤드들이 동시에 처리)"""
+        shards = sorted(requests)
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._send_pending(shard)
+                self._connections[shard].send(('call', method, requests[shard], {}))
+            # 오류가 있어도 모든 응답을 읽어 파이프 순서를 유지
+            replies = {shard: self._connections[shard].recv() for shard in shards}
+            return {shard: self._result(reply) for shard, reply in replies.items()}
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+
+    @staticmethod
+    def _result(reply: tuple) -> Any:
+        """샤드 응답의 결과 (오류 응답이면 예외 발생)"""
+        status, result = reply
+        if status == 'error':
+            raise result
+        return result
+
+
+def benchmark_sharded_engine(interactions: Sequence[LearningInteraction], shard_counts=(1, 2, 4),
+                             max_pending: int = DEFAULT_MAX_PENDING) -> pd.DataFrame:
+    """샤드 수별 track_interaction 처리량 비교 보고서
+
+    n_shards=0 행은 같은 상호작용을 프로세스 안의 단일 엔진으로 추적한 기준값이다. 샤드
+    프로세스 시작 시간은 제외하고, 모든 상호작용을 보내고 반영될 때까지(flush)의 시간을 잰다.
+    속도 향상은 사용 가능한 코어 수(cpu_count 컬럼)를 넘지 않으므로 실제 배포 환경에서
+    측정해야 한다.
+    """
+    interactions = list(interactions)
+    engine = AdaptiveLearningEngine()
+    start = time.perf_counter()
+    for interaction in interactions:
+        engine.track_interaction(interaction)
+    rows = [{'n_shards': 0, 'seconds': time.perf_counter() - start}]
+
+    for n_shards in shard_counts:
+        with ShardedLearningEngine(n_shards, max_pending=max_pending) as sharded:
+            sharded.flush()  # 샤드 프로세스 시작 대기
+            start = time.perf_counter()
+            for interaction in interactions:
+                sharded.track_interaction(interaction)
+            sharded.flush()
+            rows.append({'n_shards': n_shards, 'seconds': time.perf_counter() - start})
+
+    report = pd.DataFrame(rows).set_index('n_shards')
+    report['cpu_count'] = os.cpu_count()
+    report['events_per_second'] = len(interactions) / report['seconds']
+    report['speedup'] = report['seconds'].iloc[0] / report['seconds']
+    return report
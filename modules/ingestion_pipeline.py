@@ -0,0 +1,273 @@
+"""
+학습 상호작용 비동기 수집 모듈
+- 요청 경로는 상호작용을 제한된 크기의 큐에 넣기만 하고 바로 반환
+- 백그라운드 스레드가 큐를 마이크로 배치로 꺼내 엔진에 일괄 반영
+- 큐가 가득 찼을 때의 정책(대기/가장 오래된 항목 버림/새 항목 버림/거부)을 설정으로 선택
+- 잘못된 상호작용은 submit()에서 바로 거부하고, 엔진에서 실패한 배치는 한 건씩 다시 반영
+- 추천/예측 요청 전에 해당 사용자의 대기 중인 상호작용을 먼저 반영 (read-your-writes)
+- 큐 깊이, 대기 지연(lag), 처리량, 버려진 항목 수 등 지표 제공
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .adaptive_learning_engine import ContentRecommendation, LearningInteraction, validate_interaction
+
+
+DEFAULT_MAX_QUEUE = 10_000   # 큐에 대기할 수 있는 최대 상호작용 수
+DEFAULT_MAX_BATCH = 512      # 한 번에 반영할 최대 상호작용 수
+DEFAULT_MAX_WAIT = 0.01      # 마이크로 배치를 채우기 위해 기다리는 최대 시간 (초)
+
+# 큐가 가득 찼을 때의 정책
+BACKPRESSURE_POLICIES = ('block', 'drop_oldest', 'drop_newest', 'reject')
+
+
+class IngestionRejected(RuntimeError):
+    """큐가 가득 차서 상호작용을 받지 못함 ('reject' 정책 또는 'block' 대기 시간 초과)"""
+
+
+class IngestionPipeline:
+    """적응형 학습 엔진 앞단의 비동기 상호작용 수집 큐
+
+    submit()은 상호작용을 큐에 넣고 순번을 반환한다. 소비 스레드는 큐에서 최대
+    max_batch개를 꺼내(처음 항목 이후 최대 max_wait초 동안 더 모아서) 엔진의
+    track_interactions_batch로 반영한다. 한 마이크로 배치 안의 상호작용은 시각 순으로
+    반영되므로, 도착 순서와 시각 순서가 같은 일반적인 경우 결과는 동기 추적과 같다.
+
+    상호작용은 submit()에서 검증하므로 형식이 잘못된 항목은 호출자에게 바로 예외로
+    돌아간다. 그래도 엔진이 배치를 거부하면(예: 저장소와 시간대가 다른 시각) 배치의
+    항목을 한 건씩 다시 반영해 실패한 항목만 버린다.
+
+    엔진 호출은 하나의 잠금으로 직렬화한다. 추천/예측 메서드는 해당 사용자의 마지막
+    상호작용이 반영될 때까지 기다린 뒤 계산하므로 방금 제출한 답안이 결과에 반영된다.
+    """
+
+    def __init__(self, engine, max_queue: int = DEFAULT_MAX_QUEUE, policy: str = 'block',
+                 block_timeout: Optional[float] = None, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait: float = DEFAULT_MAX_WAIT):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"지원하지 않는 정책: {policy} (가능한 값: {', '.join(BACKPRESSURE_POLICIES)})")
+        self.engine = engine
+        self.max_queue = max_queue
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        # (순번, 큐에 넣은 시각, 상호작용)
+        self._queue: Deque[Tuple[int, float, LearningInteraction]] = deque()
+        self._condition = threading.Condition()
+        self._engine_lock = threading.RLock()
+        self._next_seq = 1
+        self._inflight_first = 0  # 반영 중인 배치의 첫 순번 (없으면 0)
+        self._last_seq: Dict[str, int] = {}  # 사용자별 마지막으로 제출한 순번
+        self._failed_seq: Dict[str, int] = {}  # 사용자별 아직 보고하지 않은 첫 실패 순번
+        self._flush_waiters = 0  # 반영을 기다리는 호출 수 (있으면 배치를 채우지 않고 바로 반영)
+        self._stopping = False
+        self._stats = {
+            "submitted": 0, "applied": 0, "dropped": 0, "rejected": 0, "errors": 0,
+            "batches": 0, "apply_seconds": 0.0, "max_lag": 0.0, "last_lag": 0.0
+        }
+        self.last_error: Optional[BaseException] = None
+        self._worker = threading.Thread(target=self._run, name="interaction-ingestion", daemon=True)
+        self._worker.start()
+
+    def __enter__(self) -> 'IngestionPipeline':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # 요청 경로
+    def submit(self, interaction: LearningInteraction) -> int:
+        """상호작용을 큐에 추가하고 순번 반환 ('drop_newest' 정책으로 버려지면 0)
+
+        잘못된 상호작용은 큐에 넣지 않고 TypeError/ValueError를 발생시킨다.
+        """
+        interaction = validate_interaction(interaction)
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("수집 파이프라인이 종료되었습니다")
+            self._stats["submitted"] += 1
+            if len(self._queue) >= self.max_queue and not self._make_room():
+                return 0
+            seq = self._next_seq
+            self._next_seq += 1
+            self._queue.append((seq, time.monotonic(), interaction))
+            self._last_seq[interaction.user_id] = seq
+            self._condition.notify_all()
+            return seq
+
+    track_interaction = submit
+
+    def flush(self, user_id: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """대기 중인 상호작용이 반영될 때까지 대기 (user_id를 주면 그 사용자의 것만)
+
+        제한 시간 안에 모두 반영되면 True를 반환한다. 대상 상호작용 중 엔진 반영에
+        실패한 것이 있으면 False를 반환한다 (실패는 한 번만 보고되며 원인은 last_error).
+        """
+        with self._condition:
+            target = self._next_seq - 1 if user_id is None else self._last_seq.get(user_id, 0)
+            if not self._is_done(target):
+                self._flush_waiters += 1
+                self._condition.notify_all()
+                try:
+                    if not self._condition.wait_for(lambda: self._is_done(target), timeout):
+                        return False
+                finally:
+                    self._flush_waiters -= 1
+            return not self._pop_failures(user_id, target)
+
+    def generate_content_recommendations(self, user_id: str,
+                                         num_recommendations: int = 5) -> List[ContentRecommendation]:
+        """사용자의 대기 중인 상호작용을 반영한 뒤 추천 생성"""
+        self.flush(user_id)
+        with self._engine_lock:
+            return self.engine.generate_content_recommendations(user_id, num_recommendations)
+
+    def predict_learning_outcome(self, user_id: str, content_id: str) -> Dict[str, Any]:
+        """사용자의 대기 중인 상호작용을 반영한 뒤 학습 결과 예측"""
+        self.flush(user_id)
+        with self._engine_lock:
+            return self.engine.predict_learning_outcome(user_id, content_id)
+
+    def generate_adaptive_feedback(self, user_id: str, interaction: LearningInteraction) -> Dict[str, Any]:
+        """사용자의 대기 중인 상호작용을 반영한 뒤 적응형 피드백 생성"""
+        self.flush(user_id)
+        with self._engine_lock:
+            return self.engine.generate_adaptive_feedback(user_id, interaction)
+
+    def metrics(self) -> Dict[str, Any]:
+        """큐 지표 (깊이, 가장 오래된 항목의 대기 시간, 반영 지연, 처리량, 버려진 수)"""
+        with self._condition:
+            stats = dict(self._stats)
+            depth = len(self._queue)
+            oldest_age = time.monotonic() - self._queue[0][1] if self._queue else 0.0
+        apply_seconds = stats.pop("apply_seconds")
+        return {
+            "queue_depth": depth,
+            "queue_capacity": self.max_queue,
+            "policy": self.policy,
+            "oldest_pending_seconds": oldest_age,
+            **stats,
+            "pending": stats["submitted"] - stats["applied"] - stats["dropped"]
+                       - stats["rejected"] - stats["errors"],
+            "avg_batch_size": stats["applied"] / stats["batches"] if stats["batches"] else 0.0,
+            "events_per_second": stats["applied"] / apply_seconds if apply_seconds > 0 else 0.0
+        }
+
+    def close(self, timeout: Optional[float] = None):
+        """남은 상호작용을 모두 반영하고 소비 스레드 종료"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+
+    # 큐 관리
+    def _make_room(self) -> bool:
+        """가득 찬 큐에 자리 확보 (조건 잠금 안에서 호출, 새 항목을 받지 않으면 False)"""
+        if self.policy == 'drop_oldest':
+            self._queue.popleft()
+            self._stats["dropped"] += 1
+            self._condition.notify_all()
+            return True
+        if self.policy == 'drop_newest':
+            self._stats["dropped"] += 1
+            return False
+        if self.policy == 'block':
+            has_room = self._condition.wait_for(
+                lambda: len(self._queue) < self.max_queue or self._stopping, self.block_timeout)
+            if has_room and not self._stopping:
+                return True
+        self._stats["rejected"] += 1
+        raise IngestionRejected(f"수집 큐가 가득 찼습니다 ({self.max_queue}건)")
+
+    def _is_done(self, seq: int) -> bool:
+        """seq 이하 순번이 모두 반영(또는 버려짐)되었는지 (조건 잠금 안에서 호출)
+
+        큐는 순번 순이므로 반영 중인 배치와 큐 맨 앞의 순번만 보면 된다.
+        """
+        if self._inflight_first and self._inflight_first <= seq:
+            return False
+        return not self._queue or self._queue[0][0] > seq
+
+    def _pop_failures(self, user_id: Optional[str], seq: int) -> bool:
+        """seq 이하 순번에서 실패한 상호작용이 있었는지 확인하고 보고된 것으로 표시 (조건 잠금 안에서 호출)"""
+        users = list(self._failed_seq) if user_id is None else [user_id]
+        failed = [user for user in users if self._failed_seq.get(user, seq + 1) <= seq]
+        for user in failed:
+            del self._failed_seq[user]
+        return bool(failed)
+
+    # 소비 스레드
+    def _take_batch(self) -> List[Tuple[int, float, LearningInteraction]]:
+        """다음 마이크로 배치를 큐에서 꺼냄 (종료 중이고 큐가 비었으면 빈 목록)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._queue or self._stopping)
+            if self._queue and len(self._queue) < self.max_batch:
+                # 첫 항목이 들어온 뒤 max_wait초까지 배치를 더 채움
+                deadline = self._queue[0][1] + self.max_wait
+                self._condition.wait_for(
+                    lambda: len(self._queue) >= self.max_batch or self._stopping or self._flush_waiters,
+                    max(0.0, deadline - time.monotonic()))
+            batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+            if batch:
+                self._inflight_first = batch[0][0]
+                self._condition.notify_all()  # 'block' 정책으로 기다리는 생산자 깨우기
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                break
+            started = time.perf_counter()
+            failed, error = self._apply(batch)
+            elapsed = time.perf_counter() - started
+
+            lag = time.monotonic() - batch[0][1]
+            with self._condition:
+                stats = self._stats
+                stats["applied"] += len(batch) - len(failed)
+                if failed:
+                    # 실패한 상호작용만 버리고 계속 진행 (마지막 오류는 last_error로 확인)
+                    stats["errors"] += len(failed)
+                    self.last_error = error
+                    for seq, interaction in failed:
+                        self._failed_seq.setdefault(interaction.user_id, seq)
+                stats["batches"] += 1
+                stats["apply_seconds"] += elapsed
+                stats["last_lag"] = lag
+                stats["max_lag"] = max(stats["max_lag"], lag)
+                self._inflight_first = 0
+                self._condition.notify_all()
+
+    def _apply(self, batch) -> Tuple[List[Tuple[int, LearningInteraction]], Optional[BaseException]]:
+        """배치를 엔진에 반영하고 (실패한 (순번, 상호작용) 목록, 마지막 오류) 반환
+
+        엔진의 일괄 경로는 저장소에 쓰기 전에 배치 전체를 변환하므로, 일괄 반영이
+        실패하면 아무것도 반영되지 않은 상태에서 제출 순서대로 한 건씩 다시 반영한다.
+        """
+        interactions = [interaction for _, _, interaction in batch]
+        with self._engine_lock:
+            try:
+                if len(interactions) == 1:
+                    self.engine.track_interaction(interactions[0])
+                else:
+                    self.engine.track_interactions_batch(interactions)
+                return [], None
+            except Exception as exc:
+                error = exc
+            failed = []
+            if len(interactions) > 1:
+                for seq, _, interaction in batch:
+                    try:
+                        self.engine.track_interaction(interaction)
+                    except Exception as exc:
+                        failed.append((seq, interaction))
+                        error = exc
+            else:
+                failed.append((batch[0][0], interactions[0]))
+        return failed, error
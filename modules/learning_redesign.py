@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from .content_catalog import ContentCatalog
+
 
 class LearningStyle(Enum):
     """학습 스타일 분류"""
@@ -59,6 +61,7 @@ class LearningPathRedesigner:
     
     def __init__(self):
         self.redesigned_structure = self._create_optimal_structure()
+        self.content_catalog = self._create_content_catalog()
         self.assessment_framework = self._create_assessment_framework()
         self.scaffolding_system = self._create_scaffolding_system()
     
@@ -245,6 +248,28 @@ class LearningPathRedesigner:
             }
         }
     
+    def _create_content_catalog(self) -> ContentCatalog:
+        """모듈 색인 (레벨, 예상 시간, 인지부하, 선수 개념)"""
+        catalog = ContentCatalog()
+        for level, stage in self.redesigned_structure.items():
+            for module in stage["modules"]:
+                catalog.register(
+                    module.id,
+                    title=module.title,
+                    level=level,
+                    expected_duration=sum(objective.estimated_time for objective in module.objectives) * 60,
+                    difficulty=module.cognitive_load_score,
+                    prerequisites=module.prerequisite_concepts
+                )
+        return catalog
+    
+    def get_module_sequence(self, module_id: str, completed_modules: Optional[List[str]] = None) -> List[str]:
+        """목표 모듈까지 학습할 모듈 순서 (완료하지 않은 선수 모듈을 전제조건 순으로 포함)"""
+        if module_id not in self.content_catalog:
+            return []
+        completed = self.content_catalog.mask(completed_modules or [])
+        return self.content_catalog.missing_prerequisites(module_id, completed) + [module_id]
+    
     def _create_assessment_framework(self) -> Dict[str, Any]:
         """종합적 평가 체계 생성"""
         return {
@@ -323,6 +348,7 @@ class LearningPathRedesigner:
         prior_knowledge = student_profile.get('prior_knowledge', 'none')
         available_time = student_profile.get('weekly_hours', 5)
         goals = student_profile.get('goals', ['basic_understanding'])
+        target_module = student_profile.get('target_module')
         
         # 개인화된 학습 경로 생성
         pathway = {
@@ -332,6 +358,9 @@ class LearningPathRedesigner:
             "assessment_schedule": self._schedule_assessments(available_time),
             "support_resources": self._select_resources(learning_style, prior_knowledge)
         }
+        if target_module:
+            pathway["module_sequence"] = self.get_module_sequence(
+                target_module, student_profile.get('completed_modules'))
         
         return pathway
     
@@ -0,0 +1,145 @@
+"""
+공개 데이터셋 레지스트리
+- Iris, Titanic 데이터셋을 로컬 바이너리 저장소에서 로드
+- 프로세스 내 메모이즈로 반복 호출 시 파싱 생략 (호출자에게는 Copy-on-Write 사본 반환)
+- 사전 계산된 층화 순서로 복사 없이 표본 추출
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .dataset_store import DatasetStore, dataset_store
+
+
+# 저장 형식이나 로더가 바뀌면 올려서 캐시를 무효화
+REGISTRY_VERSION = 1
+
+
+def _is_offline() -> bool:
+    """운영 환경 여부 (네트워크 다운로드 금지)"""
+    return os.environ.get('PUBLIC_DATASETS_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+def _load_iris() -> pd.DataFrame:
+    """scikit-learn에 내장된 Iris 데이터를 seaborn과 같은 컬럼 구성으로 변환 (네트워크 불필요)
+
+    값은 scikit-learn 사본을 따른다. 이 사본은 UCI 원본의 35, 38번 행을 정정한 것이라
+    다른 출처의 Iris 파일과 해당 행이 다를 수 있다.
+    """
+    from sklearn.datasets import load_iris
+
+    bunch = load_iris()
+    df = pd.DataFrame(bunch.data, columns=['sepal_length', 'sepal_width',
+                                           'petal_length', 'petal_width'])
+    df['species'] = np.asarray(bunch.target_names)[bunch.target]
+    return df
+
+
+def _load_titanic() -> pd.DataFrame:
+    """Seaborn 데이터 저장소에서 Titanic 데이터 다운로드"""
+    import seaborn as sns
+    return sns.load_dataset('titanic')
+
+
+class PublicDatasetRegistry:
+    """공개 데이터셋 로컬 레지스트리"""
+
+    def __init__(self, store: Optional[DatasetStore] = None, random_state: int = 42):
+        self.store = store or dataset_store
+        self.random_state = random_state
+        self._loaders: Dict[str, Callable[[], pd.DataFrame]] = {}
+        self._requires_network: Dict[str, bool] = {}
+        self._strata: Dict[str, Optional[str]] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._sample_orders: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], pd.DataFrame],
+                 strata: Optional[str] = None, requires_network: bool = False):
+        """데이터셋 로더 등록"""
+        self._loaders[name] = loader
+        self._strata[name] = strata
+        self._requires_network[name] = requires_network
+
+    def names(self) -> List[str]:
+        """등록된 데이터셋 이름 목록"""
+        return list(self._loaders)
+
+    def load(self, name: str) -> pd.DataFrame:
+        """데이터셋 로드 (메모이즈된 프레임의 호출자 전용 얕은 사본)"""
+        frame = self._frames.get(name)
+        if frame is None:
+            with self._lock:
+                if name not in self._frames:
+                    self._frames[name] = self._load_from_store(name)
+                frame = self._frames[name]
+        return frame.copy(deep=False)
+
+    def sample(self, name: str, size: int) -> pd.DataFrame:
+        """사전 계산된 층화 순서의 앞부분으로 표본 추출"""
+        df = self.load(name)
+        order = self._sample_order(name)
+        size = min(size, len(df))
+        return df.take(order[:size]).reset_index(drop=True)
+
+    def prefetch(self, names: Optional[List[str]] = None):
+        """배포 단계에서 데이터셋을 미리 받아 저장소에 기록"""
+        for name in names or self.names():
+            self.load(name)
+
+    def _store_key(self, name: str) -> str:
+        """저장소 키"""
+        return f'public-{name}-v{REGISTRY_VERSION}'
+
+    def _load_from_store(self, name: str) -> pd.DataFrame:
+        """저장소에서 로드하거나, 없으면 로더로 받아 저장"""
+        if name not in self._loaders:
+            raise KeyError(f"등록되지 않은 데이터셋입니다: {name}")
+
+        key = self._store_key(name)
+        if self.store.contains(key):
+            return self.store.load(key)
+
+        if self._requires_network[name] and _is_offline():
+            raise FileNotFoundError(
+                f"'{name}' 데이터셋이 로컬 저장소에 없습니다. "
+                f"배포 전에 public_datasets.prefetch()를 실행하세요."
+            )
+
+        df = self._loaders[name]()
+        self.store.save(key, df, meta={'public_dataset': name})
+        return self.store.load(key)
+
+    def _sample_order(self, name: str) -> np.ndarray:
+        """어떤 앞부분을 잘라도 층별 비율이 유지되는 행 순서"""
+        order = self._sample_orders.get(name)
+        if order is not None:
+            return order
+
+        df = self.load(name)
+        rng = np.random.default_rng(self.random_state)
+        strata = self._strata[name]
+
+        if strata is None or strata not in df.columns:
+            order = rng.permutation(len(df))
+        else:
+            codes = pd.factorize(df[strata], use_na_sentinel=False)[0]
+            keys = np.empty(len(df))
+            for code in np.unique(codes):
+                members = np.flatnonzero(codes == code)
+                # 층 내 무작위 순위를 (0, 1) 구간에 균등 배치해 층 간에 교차
+                keys[rng.permutation(members)] = (np.arange(len(members)) + 0.5) / len(members)
+            order = np.lexsort((rng.random(len(df)), keys))
+
+        self._sample_orders[name] = order
+        return order
+
+
+# 전역 공개 데이터셋 레지스트리
+public_datasets = PublicDatasetRegistry()
+public_datasets.register('iris', _load_iris, strata='species')
+public_datasets.register('titanic', _load_titanic, strata='survived', requires_network=True)
@@ -12,6 +12,11 @@ import math
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    from .content_catalog import ContentCatalog
+except ImportError:
+    from content_catalog import ContentCatalog
+
 # 시각화 모듈 임포트
 try:
     from .enhanced_visualization import visualizer, create_statistics_visualization
@@ -32,7 +37,9 @@ class SimpleLearningSystem:
     def __init__(self):
         self.learners = {}
         self.content_library = self._create_content_library()
+        self.content_catalog = self._create_content_catalog()
         self.interaction_log = []
+        self._mastered_masks: Dict[str, int] = {}  # 학습자별 숙달 콘텐츠 비트셋
         
     def _create_content_library(self) -> Dict[str, Any]:
         """콘텐츠 라이브러리 생성"""
@@ -302,6 +309,29 @@ class SimpleLearningSystem:
             }
         }
     
+    def _create_content_catalog(self) -> ContentCatalog:
+        """콘텐츠 라이브러리 색인 (레벨, 주제, 난이도, 전제조건)"""
+        catalog = ContentCatalog()
+        for level, level_content in self.content_library.items():
+            for content_id, content in level_content.items():
+                catalog.register(
+                    content_id,
+                    title=content.get("title"),
+                    topic=content.get("category"),
+                    level=level,
+                    expected_duration=content["difficulty"] * 5 * 60,
+                    difficulty=content["difficulty"],
+                    prerequisites=content.get("prerequisites", [])
+                )
+        return catalog
+    
+    def _find_content(self, content_id: str) -> Optional[Dict[str, Any]]:
+        """콘텐츠 ID로 라이브러리 항목 찾기"""
+        level = self.content_catalog.level(content_id)
+        if level is None:
+            return None
+        return self.content_library[level].get(content_id)
+    
     def register_learner(self, user_id: str, profile: Dict[str, Any]) -> Dict[str, str]:
         """학습자 등록"""
         self.learners[user_id] = {
@@ -316,6 +346,7 @@ class SimpleLearningSystem:
             },
             "created_at": datetime.now().isoformat()
         }
+        self._mastered_masks[user_id] = 0
         return {"status": "success", "message": f"학습자 {user_id} 등록 완료"}
     
     def get_personalized_content(self, user_id: str) -> Dict[str, Any]:
@@ -393,16 +424,8 @@ class SimpleLearningSystem:
         return available
     
     def _check_prerequisites(self, user_id: str, content_id: str) -> bool:
-        """전제조건 확인"""
-        # 현재 레벨의 콘텐츠 찾기
-        for level_content in self.content_library.values():
-            if content_id in level_content:
-                prerequisites = level_content[content_id].get("prerequisites", [])
-                for prereq in prerequisites:
-                    if not self._is_content_mastered(user_id, prereq):
-                        return False
-                return True
-        return True
+        """전제조건 확인 (숙달 콘텐츠 비트셋과 비교)"""
+        return self.content_catalog.prerequisites_met(content_id, self._mastered_masks.get(user_id, 0))
     
     def _is_content_mastered(self, user_id: str, content_id: str) -> bool:
         """콘텐츠 숙달 여부 확인"""
@@ -423,14 +446,21 @@ class SimpleLearningSystem:
         success_count = sum(1 for attempt in recent_attempts if attempt["correct"])
         return success_count >= 2  # 3번 중 2번 이상 성공
     
+    def _update_mastery(self, user_id: str, content_id: str):
+        """답안 제출 후 해당 콘텐츠의 숙달 비트 갱신"""
+        index = self.content_catalog.index(content_id)
+        if index is None:
+            return
+        mask = self._mastered_masks.get(user_id, 0)
+        if self._is_content_mastered(user_id, content_id):
+            mask |= 1 << index
+        else:
+            mask &= ~(1 << index)
+        self._mastered_masks[user_id] = mask
+    
     def _generate_learning_path(self, user_id: str, content_id: str) -> List[str]:
         """개인화된 학습 경로 생성"""
-        # 현재 콘텐츠 찾기
-        current_content = None
-        for level_content in self.content_library.values():
-            if content_id in level_content:
-                current_content = level_content[content_id]
-                break
+        current_content = self._find_content(content_id)
         
         if not current_content:
             return []
@@ -486,14 +516,8 @@ class SimpleLearningSystem:
     def _suggest_next_topics(self, user_id: str, current_content_id: str) -> List[str]:
         """다음 학습 주제 제안"""
         # 현재 콘텐츠의 카테고리와 난이도 파악
-        current_content = None
-        current_level = None
-        
-        for level, level_content in self.content_library.items():
-            if current_content_id in level_content:
-                current_content = level_content[current_content_id]
-                current_level = level
-                break
+        current_content = self._find_content(current_content_id)
+        current_level = self.content_catalog.level(current_content_id)
         
         if not current_content:
             return []
@@ -520,11 +544,9 @@ class SimpleLearningSystem:
         
         if current_level in level_progression:
             next_level = level_progression[current_level]
-            if next_level in self.content_library:
-                next_level_content = self.content_library[next_level]
-                for content_id, content in next_level_content.items():
-                    if current_content_id in content.get("prerequisites", []):
-                        next_topics.append(f"[다음 단계] {content['title']}")
+            for content_id in self.content_catalog.dependents(current_content_id):
+                if self.content_catalog.level(content_id) == next_level:
+                    next_topics.append(f"[다음 단계] {self.content_catalog.title(content_id)}")
         
         return next_topics[:3]  # 최대 3개만 반환
     
@@ -538,11 +560,7 @@ class SimpleLearningSystem:
         current_level = learner["current_level"]
         
         # 콘텐츠와 문제 찾기
-        content = None
-        for level_name, level_content in self.content_library.items():
-            if content_id in level_content:
-                content = level_content[content_id]
-                break
+        content = self._find_content(content_id)
         
         if not content or question_idx >= len(content["questions"]):
             return {"error": "문제를 찾을 수 없습니다"}
@@ -560,6 +578,8 @@ class SimpleLearningSystem:
             "timestamp": datetime.now().isoformat()
         })
         
+        self._update_mastery(user_id, content_id)
+        
         # 적응형 설정 업데이트
         self._update_adaptive_settings(user_id, is_correct)
         
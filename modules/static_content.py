@@ -0,0 +1,131 @@
+"""
+정적 콘텐츠 캐시 모듈
+- 로드맵, 기술 매트릭스 등 요청마다 같은 콘텐츠를 한 번만 생성
+- 생성된 콘텐츠는 변경할 수 없도록 동결 (dict/list 타입은 그대로 유지)
+- JSON 직렬화 결과와 렌더링된 페이지를 바이트로 캐시 (렌더링 결과는 LRU로 개수 제한)
+- 캐시 키에 버전을 포함하며, 버전을 올리면 모든 캐시가 무효화
+"""
+
+import functools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+# 정적 콘텐츠 내용이 바뀌면 올려서 캐시를 무효화
+STATIC_CONTENT_VERSION = 1
+
+# 보관할 렌더링 결과 최대 개수 (스냅샷별 페이지 등)
+DEFAULT_MAX_RENDERED = 64
+
+
+class FrozenDict(dict):
+    """변경이 금지된 딕셔너리 (JSON 직렬화와 템플릿 사용은 일반 dict와 동일)"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("정적 콘텐츠는 변경할 수 없습니다. 복사본(dict(...))을 사용하세요.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """변경이 금지된 리스트 (list로 취급되며 JSON 직렬화와 템플릿 사용은 일반 list와 동일)"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("정적 콘텐츠는 변경할 수 없습니다. 복사본(list(...))을 사용하세요.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """중첩된 dict/list/tuple을 FrozenDict/FrozenList/tuple로 변환 (원래 타입 유지)"""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class StaticContentCache:
+    """버전 단위로 무효화되는 동결 콘텐츠 / JSON / 렌더링 결과 캐시
+
+    모든 항목은 (버전, 키)로 저장하므로 무효화 도중 이전 버전으로 만든 결과가 새
+    버전의 항목으로 남지 않는다. 렌더링 결과는 키가 스냅샷마다 늘어날 수 있으므로
+    가장 오래 사용하지 않은 것부터 max_rendered개까지만 보관한다.
+    """
+
+    def __init__(self, version: int = STATIC_CONTENT_VERSION,
+                 max_rendered: int = DEFAULT_MAX_RENDERED):
+        self.version = version
+        self.max_rendered = max_rendered
+        self._values: Dict[Tuple[int, Hashable], Any] = {}
+        self._json: Dict[Tuple[int, Hashable], bytes] = {}
+        self._rendered: 'OrderedDict[Tuple[int, Hashable], bytes]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """동결된 콘텐츠 (처음 요청 시 builder로 생성)"""
+        versioned = (self.version, key)
+        value = self._values.get(versioned)
+        if value is None:
+            with self._lock:
+                value = self._values.get(versioned)
+                if value is None:
+                    value = freeze(builder())
+                    self._values[versioned] = value
+        return value
+
+    def json_bytes(self, key: Hashable, builder: Callable[[], Any]) -> bytes:
+        """미리 직렬화된 JSON 바이트"""
+        versioned = (self.version, key)
+        data = self._json.get(versioned)
+        if data is None:
+            value = self.get(key, builder)
+            data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+            self._json[versioned] = data
+        return data
+
+    def rendered(self, key: Hashable, render: Callable[[], str]) -> bytes:
+        """렌더링된 페이지 바이트 (render는 보관 중이 아닐 때만 호출)"""
+        versioned = (self.version, key)
+        with self._lock:
+            data = self._rendered.get(versioned)
+            if data is not None:
+                self._rendered.move_to_end(versioned)
+                return data
+        data = render().encode('utf-8')
+        with self._lock:
+            self._rendered[versioned] = data
+            self._rendered.move_to_end(versioned)
+            while len(self._rendered) > self.max_rendered:
+                self._rendered.popitem(last=False)
+        return data
+
+    def invalidate(self, version: int = None):
+        """캐시 비우기 (version을 주면 해당 버전으로 변경)"""
+        with self._lock:
+            self.version = self.version + 1 if version is None else version
+            self._values.clear()
+            self._json.clear()
+            self._rendered.clear()
+
+
+def static_content(method: Callable) -> Callable:
+    """인자별로 한 번만 생성해 동결하는 메서드 데코레이터 (self.static_content 사용)"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        return self.static_content.get((method.__name__, *args), lambda: method(self, *args))
+    return wrapper
@@ -0,0 +1,267 @@
+"""
+요약 통계 엔진
+- 수치형 컬럼의 적률과 상관행렬을 이동(shift)된 교차곱 누적으로 한 번에 계산
+  (평균/표준편차/상관행렬을 처음 요청할 때 누적)
+- 빈도표(value_counts)는 컬럼별로 한 번만 코드 bincount로 계산해 캐시
+- 행이 추가되면 누적값만 갱신 (전체 재계산 없음)
+- 같은 데이터셋 객체에 대해서는 모든 소비자가 같은 통계 객체를 공유
+- 컬럼/인덱스가 바뀌거나 mark_modified()로 수정을 알리면 캐시된 통계를 버리고 다시 계산
+"""
+
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _value_counts(series: pd.Series) -> pd.Series:
+    """series.value_counts()와 같은 빈도표 (정수 코드의 bincount로 계산)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        categories = series.cat.categories
+        uniques = pd.CategoricalIndex(categories, categories=categories,
+                                      ordered=series.cat.ordered, name=series.name)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Index(uniques, name=series.name)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return pd.Series(counts, index=uniques, name='count').sort_values(ascending=False, kind='stable')
+
+
+class SummaryStatistics:
+    """데이터셋 하나의 요약 통계 (평균, 표준편차, 상관행렬, 빈도표)
+
+    결측값은 pandas와 같이 컬럼별/쌍별로 제외한다. 누적값은 첫 배치의 평균을
+    기준점으로 이동한 합과 교차곱이므로 배치를 더해도 그대로 합산된다.
+    교차곱 누적은 평균/표준편차/상관행렬을 처음 요청할 때 수행하므로 빈도표만
+    필요한 경우에는 계산하지 않는다.
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        self.columns: Optional[pd.Index] = None
+        self.n_rows = 0
+        self._shift: Optional[np.ndarray] = None
+        self._pair_counts: Optional[np.ndarray] = None   # 쌍별 유효 행 수
+        self._pair_sums: Optional[np.ndarray] = None     # [i, j]: j가 유효한 행에서 i의 합
+        self._pair_squares: Optional[np.ndarray] = None  # [i, j]: j가 유효한 행에서 i 제곱합
+        self._cross: Optional[np.ndarray] = None         # 교차곱
+        self._pending: List[pd.DataFrame] = []           # 아직 누적하지 않은 수치형 배치
+        self._value_counts: Dict[str, pd.Series] = {}
+        self._derived: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        if df is not None:
+            self.append(df)
+
+    def append(self, df: pd.DataFrame) -> 'SummaryStatistics':
+        """행 추가 (캐시된 빈도표는 증분 갱신, 적률 누적은 다음 요청 시 수행)"""
+        numeric = df.select_dtypes(include=[np.number])
+        with self._lock:
+            if self.columns is None:
+                self.columns = numeric.columns
+            elif not numeric.columns.equals(self.columns):
+                raise ValueError("추가하는 데이터의 수치형 컬럼 구성이 기존 데이터와 다릅니다.")
+
+            self._pending.append(numeric)
+            self.n_rows += len(df)
+            for column, counts in self._value_counts.items():
+                merged = counts.add(_value_counts(df[column]), fill_value=0).astype(np.int64)
+                self._value_counts[column] = merged.sort_values(ascending=False, kind='stable')
+            self._derived.clear()
+        return self
+
+    def _accumulate(self):
+        """대기 중인 배치를 적률 누적값에 반영 (잠금 안에서 호출)"""
+        for numeric in self._pending:
+            self._accumulate_batch(numeric.to_numpy(dtype=np.float64))
+        self._pending = []
+
+    def _accumulate_batch(self, values: np.ndarray):
+        """수치형 배치 하나를 누적"""
+        mask = ~np.isnan(values)
+        if self._shift is None:
+            with np.errstate(invalid='ignore'):
+                counts = mask.sum(axis=0)
+                shift = np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0)
+            self._shift = shift
+            k = len(self.columns)
+            self._pair_counts = np.zeros((k, k))
+            self._pair_sums = np.zeros((k, k))
+            self._pair_squares = np.zeros((k, k))
+            self._cross = np.zeros((k, k))
+
+        shifted = values - self._shift
+        complete = bool(mask.all())
+        if complete:
+            # 결측이 없으면 쌍별 값이 컬럼별 값의 브로드캐스트
+            sums = shifted.sum(axis=0)
+            pair_counts = float(len(values))
+            pair_sums = sums[:, None]
+            pair_squares = np.einsum('ij,ij->j', shifted, shifted)[:, None]
+        else:
+            # 결측을 0으로 두면 쌍별 합이 행렬곱으로 계산됨
+            shifted[~mask] = 0.0
+            weights = mask.astype(np.float64)
+            pair_counts = weights.T @ weights
+            pair_sums = shifted.T @ weights
+            pair_squares = (shifted * shifted).T @ weights
+        cross = shifted.T @ shifted
+
+        self._pair_counts += pair_counts
+        self._pair_sums += pair_sums
+        self._pair_squares += pair_squares
+        self._cross += cross
+
+    def copy(self) -> 'SummaryStatistics':
+        """누적값을 복사한 독립 통계 객체"""
+        other = SummaryStatistics()
+        with self._lock:
+            other.columns = self.columns
+            other.n_rows = self.n_rows
+            other._shift = self._shift
+            if self._shift is not None:
+                other._pair_counts = self._pair_counts.copy()
+                other._pair_sums = self._pair_sums.copy()
+                other._pair_squares = self._pair_squares.copy()
+                other._cross = self._cross.copy()
+            other._pending = list(self._pending)
+            other._value_counts = dict(self._value_counts)
+        return other
+
+    def mean(self) -> pd.Series:
+        """컬럼별 평균"""
+        return self._cached('mean', self._compute_mean)
+
+    def std(self) -> pd.Series:
+        """컬럼별 표본 표준편차 (ddof=1)"""
+        return self._cached('std', self._compute_std)
+
+    def corr(self) -> pd.DataFrame:
+        """피어슨 상관행렬 (쌍별 결측 제외)"""
+        return self._cached('corr', self._compute_corr)
+
+    def value_counts(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """컬럼 빈도표 (처음 요청 시 df에서 계산해 캐시)"""
+        counts = self._value_counts.get(column)
+        if counts is None:
+            counts = _value_counts(df[column])
+            with self._lock:
+                counts = self._value_counts.setdefault(column, counts)
+        return counts
+
+    def _cached(self, name: str, compute):
+        """파생 통계 캐시 (행 추가 시 무효화)"""
+        result = self._derived.get(name)
+        if result is None:
+            with self._lock:
+                self._accumulate()
+                result = compute()
+                self._derived[name] = result
+        return result
+
+    def _diagonal(self):
+        """컬럼별 (유효 행 수, 이동된 합, 이동된 제곱합)"""
+        if self._shift is None:
+            empty = np.zeros(0)
+            return empty, empty, empty
+        return (np.diag(self._pair_counts), np.diag(self._pair_sums),
+                np.diag(self._pair_squares))
+
+    def _compute_mean(self) -> pd.Series:
+        counts, sums, _ = self._diagonal()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self._shift + sums / counts if len(counts) else counts
+        return pd.Series(mean, index=self.columns, dtype=np.float64)
+
+    def _compute_std(self) -> pd.Series:
+        counts, sums, squares = self._diagonal()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (squares - sums * sums / counts) / (counts - 1)
+            std = np.sqrt(np.clip(variance, 0, None))
+        std[counts < 2] = np.nan
+        return pd.Series(std, index=self.columns, dtype=np.float64)
+
+    def _compute_corr(self) -> pd.DataFrame:
+        if self._shift is None:
+            return pd.DataFrame(index=self.columns, columns=self.columns, dtype=np.float64)
+        n = self._pair_counts
+        sums = self._pair_sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = self._cross - sums * sums.T / n
+            variance = self._pair_squares - sums * sums / n
+            corr = covariance / np.sqrt(variance * variance.T)
+        corr = np.clip(corr, -1, 1)
+        corr[(n < 1) | (variance <= 0) | (variance.T <= 0)] = np.nan
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class _Registration:
+    """데이터셋 객체에 연결된 통계와, 통계를 계산한 시점의 축(인덱스, 컬럼) 객체
+
+    컬럼 추가/삭제나 행 변경은 축 객체가 바뀌므로 자동으로 감지한다. 값만 제자리에서
+    바꾼 경우는 호출자가 mark_modified()로 알려야 한다.
+    """
+
+    __slots__ = ('stats', 'axes')
+
+    def __init__(self, df: pd.DataFrame, stats: SummaryStatistics):
+        self.stats = stats
+        self.axes: Optional[tuple] = tuple(df.axes)  # mark_modified() 후에는 None
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """등록 이후 df의 축이 바뀌지 않았고 수정 알림도 없었는지"""
+        return self.axes is not None and all(a is b for a, b in zip(df.axes, self.axes))
+
+
+# 데이터셋 객체별 통계 (데이터셋이 해제되면 함께 제거)
+_registry: Dict[int, _Registration] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(df: pd.DataFrame, stats: SummaryStatistics) -> SummaryStatistics:
+    """데이터셋 객체에 통계 연결 (수정된 데이터셋이면 기존 연결을 교체)"""
+    key = id(df)
+    with _registry_lock:
+        existing = _registry.get(key)
+        if existing is not None:
+            if existing.matches(df):
+                return existing.stats
+        else:
+            weakref.finalize(df, _registry.pop, key, None)
+        _registry[key] = _Registration(df, stats)
+    return stats
+
+
+def summary_statistics(df: pd.DataFrame) -> SummaryStatistics:
+    """데이터셋의 공유 요약 통계
+
+    통계는 등록 시점의 데이터셋 객체와 축에 묶여 있다. 컬럼이나 행이 바뀌면 다음 호출에서
+    새로 계산하며, 값을 제자리에서 수정했다면 mark_modified(df)를 호출해야 한다.
+    """
+    registration = _registry.get(id(df))
+    if registration is not None and registration.matches(df):
+        return registration.stats
+    return _register(df, SummaryStatistics(df))
+
+
+def mark_modified(df: pd.DataFrame):
+    """df를 제자리에서 수정했음을 알림 (다음 summary_statistics 호출에서 다시 계산)"""
+    with _registry_lock:
+        registration = _registry.get(id(df))
+        if registration is not None:
+            registration.axes = None
+
+
+def append_rows(df: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """df에 rows를 이어 붙인 새 데이터셋을 만들고, 기존 통계를 증분 갱신해 연결"""
+    combined = pd.concat([df, rows], ignore_index=True)
+    _register(combined, summary_statistics(df).copy().append(rows))
+    return combined
+
+
+def high_correlation_pairs(df: pd.DataFrame, threshold: float = 0.7) -> List[tuple]:
+    """상관계수 절댓값이 threshold를 넘는 (컬럼1, 컬럼2, 상관계수) 목록"""
+    corr = summary_statistics(df).corr()
+    rows, cols = np.where(np.abs(corr.to_numpy()) > threshold)
+    return [(corr.index[i], corr.columns[j], corr.iat[i, j]) for i, j in zip(rows, cols) if i < j]
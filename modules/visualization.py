@@ -9,6 +9,7 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.manifold import TSNE
 from . import data_processing
+from .summary_statistics import high_correlation_pairs, summary_statistics
 
 # Plotly import with error handling
 try:
@@ -491,11 +492,12 @@ def generate_visualization_report(df, level='all'):
     
     # 기본 통계
     numeric_cols = df.select_dtypes(include=[np.number]).columns
+    stats = summary_statistics(df)
     if len(numeric_cols) > 0:
         report['basic_stats'] = {
-            'mean': df[numeric_cols].mean().to_dict(),
-            'std': df[numeric_cols].std().to_dict(),
-            'correlation': df[numeric_cols].corr().to_dict()
+            'mean': stats.mean().to_dict(),
+            'std': stats.std().to_dict(),
+            'correlation': stats.corr().to_dict()
         }
     
     # 시각화 생성
@@ -511,12 +513,9 @@ def generate_visualization_report(df, level='all'):
     # 인사이트 생성
     if len(numeric_cols) > 0:
         # 상관관계 인사이트
-        corr_matrix = df[numeric_cols].corr()
-        high_corr = np.where(np.abs(corr_matrix) > 0.7)
-        for i, j in zip(high_corr[0], high_corr[1]):
-            if i < j:
-                report['insights'].append(
-                    f"{corr_matrix.index[i]}와 {corr_matrix.columns[j]} 간에 강한 상관관계 ({corr_matrix.iloc[i,j]:.3f})"
-                )
+        for col1, col2, value in high_correlation_pairs(df):
+            report['insights'].append(
+                f"{col1}와 {col2} 간에 강한 상관관계 ({value:.3f})"
+            )
     
     return report
\ No newline at end of file
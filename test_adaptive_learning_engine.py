@@ -0,0 +1,720 @@
+#!/usr/bin/env python3
+"""
+적응형 학습 엔진 일괄 추적 테스트
+"""
+
+import dataclasses
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from modules.adaptive_learning_engine import (
+    LEARNING_STYLE_COMPATIBILITY, AdaptiveLearningEngine, InteractionType, LearningInteraction
+)
+from modules.engine_persistence import _RECORD_INTERACTION, PersistentLearningEngine, encode_interaction
+from modules.engine_sharding import ShardedLearningEngine, benchmark_sharded_engine
+from modules.ingestion_pipeline import IngestionPipeline
+
+
+def make_interactions(n=2000, n_users=20, seed=0):
+    """시각이 일부 어긋나고 겹치는 상호작용 생성"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    contents = ["stats_basics", "probability", "hypothesis_testing", "regression", "misc"]
+    interactions = []
+    for i in range(n):
+        timestamp = start + timedelta(seconds=30 * i - (rng.randint(0, 600) if rng.random() < 0.1 else 0))
+        interactions.append(LearningInteraction(
+            user_id=f"user_{rng.randrange(n_users)}",
+            timestamp=timestamp,
+            interaction_type=rng.choice(list(InteractionType)),
+            content_id=rng.choice(contents),
+            duration=rng.randint(30, 2000),
+            success=rng.choice([True, False, None]),
+            difficulty_level=rng.randint(1, 10),
+            hint_used=rng.random() < 0.3,
+            attempts=rng.randint(1, 4),
+            confidence_level=rng.choice([None, 1, 3, 5])
+        ))
+    return interactions
+
+
+def engine_state(engine):
+    """비교용 엔진 상태 (프로필, 최근 기록, 지식 상태)"""
+    profiles = {user_id: dict(vars(profile)) for user_id, profile in engine.learner_profiles.items()}
+    recent = {user_id: [(i.timestamp, i.duration) for i in engine._get_recent_interactions(user_id, 10)]
+              for user_id in engine.learner_profiles}
+    knowledge = {key: (state.p_known, state.last_update) for key, state in engine._knowledge.items()}
+    return profiles, recent, knowledge
+
+
+def test_batch_matches_sequential():
+    """일괄 추적 결과가 시각 순 순차 추적과 동일한지 확인"""
+    interactions = make_interactions()
+    history, batches = interactions[:500], [interactions[500:1200], interactions[1200:]]
+
+    sequential = AdaptiveLearningEngine()
+    batched = AdaptiveLearningEngine()
+    for interaction in history:
+        sequential.track_interaction(interaction)
+        batched.track_interaction(interaction)
+
+    for batch in batches:
+        for interaction in sorted(batch, key=lambda i: i.timestamp):
+            sequential.track_interaction(interaction)
+        metrics = batched.track_interactions_batch(batch)
+        assert metrics["events"] == len(batch) and metrics["events_per_second"] > 0
+
+    assert engine_state(sequential) == engine_state(batched)
+    assert sequential.get_interaction_analytics().equals(batched.get_interaction_analytics())
+
+
+def test_interaction_store_sequence_and_time_zones():
+    """상호작용 저장소가 읽기 전용 시퀀스로 동작하고 시간대 방식을 섞지 않는지 확인"""
+    interactions = make_interactions(n=50, seed=6)
+    engine = AdaptiveLearningEngine()
+    engine.track_interactions_batch(interactions[:30])
+    for interaction in interactions[30:]:
+        engine.track_interaction(interaction)
+
+    history = engine.interaction_history
+    ordered = sorted(interactions[:30], key=lambda i: i.timestamp) + interactions[30:]
+    assert len(history) == 50 and list(history) == ordered
+    assert history[-1] == ordered[-1] and history[10:13] == ordered[10:13]
+    assert list(reversed(history)) == ordered[::-1]
+    assert ordered[5] in history and history.index(ordered[40]) == 40
+    try:
+        history[0] = ordered[1]
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("저장소 행이 수정되었습니다")
+
+    # naive로 시작한 엔진에 aware 시각을 넣으면 상태를 바꾸지 않고 거부
+    state = engine_state(engine)
+    aware = LearningInteraction(user_id="user_0", timestamp=datetime(2024, 6, 1, tzinfo=timezone.utc),
+                                interaction_type=InteractionType.EXERCISE_ATTEMPT, content_id="probability",
+                                duration=60, success=True, difficulty_level=3)
+    for track in (engine.track_interaction, lambda i: engine.track_interactions_batch([i])):
+        try:
+            track(aware)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("시간대 방식이 다른 시각이 저장되었습니다")
+    assert len(history) == 50 and engine_state(engine) == state
+
+    # aware로 시작한 저장소는 첫 시각의 시간대로 반환하고 naive 시각을 거부
+    kst = timezone(timedelta(hours=9))
+    aware_engine = AdaptiveLearningEngine()
+    aware_engine.track_interaction(LearningInteraction(**{**vars(aware), "timestamp": datetime(2024, 6, 1, 9, tzinfo=kst)}))
+    later = LearningInteraction(**{**vars(aware), "timestamp": datetime(2024, 6, 1, 1, 30, tzinfo=timezone.utc)})
+    aware_engine.track_interactions_batch([later])
+    assert aware_engine.interaction_history.aware
+    assert aware_engine.interaction_history[1].timestamp == later.timestamp
+    assert aware_engine.interaction_history[1].timestamp.utcoffset() == timedelta(hours=9)
+    mixed = [LearningInteraction(**{**vars(aware), "timestamp": datetime(2024, 6, 2)}), later]
+    try:
+        aware_engine.track_interactions_batch(mixed)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("시간대 없는 시각이 저장되었습니다")
+    assert len(aware_engine.interaction_history) == 2
+
+
+def naive_recent(interactions, user_id, count):
+    """전체 기록을 시각 역순으로 안정 정렬한 최근 상호작용 (기록 순서가 같으면 먼저 기록된 것 우선)"""
+    own = [i for i in interactions if i.user_id == user_id]
+    return sorted(own, key=lambda i: i.timestamp, reverse=True)[:count]
+
+
+def test_recent_window_matches_full_scan():
+    """사용자별 최근 상호작용 인덱스가 순서가 어긋난 입력에서도 전체 탐색과 같은지 확인"""
+    interactions = make_interactions(n=1500, n_users=8, seed=4)
+    sequential = AdaptiveLearningEngine()
+    for interaction in interactions:
+        sequential.track_interaction(interaction)
+    batched = AdaptiveLearningEngine()
+    batched.track_interactions_batch(interactions)
+
+    window = sequential.adaptation_parameters["recent_interaction_window"]
+    for engine in (sequential, batched):
+        for user_id in engine.learner_profiles:
+            for count in (1, 3, window, window + 15):
+                expected = [(i.timestamp, i.content_id, i.duration)
+                            for i in naive_recent(interactions, user_id, count)]
+                recent = [(i.timestamp, i.content_id, i.duration)
+                          for i in engine._get_recent_interactions(user_id, count)]
+                assert recent == expected
+            assert len(engine._recent_by_user[user_id]) <= window
+
+    # 윈도우보다 오래된 늦은 상호작용은 인덱스를 바꾸지 않음
+    user_id = interactions[0].user_id
+    before = list(sequential._recent_by_user[user_id])
+    stale = LearningInteraction(user_id=user_id, timestamp=datetime(2023, 1, 1),
+                                interaction_type=InteractionType.EXERCISE_ATTEMPT, content_id="probability",
+                                duration=60, success=True, difficulty_level=3)
+    sequential.track_interaction(stale)
+    assert list(sequential._recent_by_user[user_id]) == before
+
+
+def test_running_success_counters_match_recount():
+    """누적 성공 집계(최근 윈도우, 주제별)가 전체 기록을 다시 센 값과 같은지 확인"""
+    interactions = make_interactions(n=1500, n_users=8, seed=5)
+    engine = AdaptiveLearningEngine()
+    for interaction in interactions[:700]:
+        engine.track_interaction(interaction)
+    engine.track_interactions_batch(interactions[700:])
+
+    window = engine.adaptation_parameters["recent_interaction_window"]
+    for user_id in engine.learner_profiles:
+        for size in (1, 5, window, window + 10):
+            recent = naive_recent(interactions, user_id, size)
+            expected = sum(i.success is True for i in recent) / len(recent)
+            assert abs(engine._calculate_success_rate(user_id, size) - expected) < 1e-12
+
+        own = [i for i in interactions if i.user_id == user_id]
+        for topic in {engine._get_content_topic(i.content_id) for i in own}:
+            in_topic = [i for i in own if engine._get_content_topic(i.content_id) == topic]
+            expected = sum(i.success is True for i in in_topic) / len(in_topic)
+            assert abs(engine._calculate_topic_success_rate(user_id, topic) - expected) < 1e-12
+
+    assert engine._calculate_success_rate("nobody") == 0.5
+    assert engine._calculate_topic_success_rate("nobody", "statistics") == 0.5
+
+
+def reference_score(engine, user_id, content_id):
+    """콘텐츠 한 건의 추천 점수 요소를 정의대로 직접 계산"""
+    profile = engine.learner_profiles[user_id]
+    difficulty = engine.content_catalog.difficulty(content_id)
+    difficulty_match = max(0.0, 1.0 - abs(profile.preferred_difficulty - difficulty) / 10.0)
+    prerequisites = engine.content_catalog.prerequisites(content_id)
+    mastered = [engine._is_content_mastered(user_id, prereq) for prereq in prerequisites]
+    readiness = sum(mastered) / len(mastered) if mastered else 1.0
+    style = engine.content_catalog.learning_style(content_id, "visual")
+    style_match = LEARNING_STYLE_COMPATIBILITY.get(profile.learning_style, {}).get(style, 0.5)
+    topic = engine._get_content_topic(content_id)
+    if topic in profile.strengths:
+        interest = 0.8
+    elif topic in profile.weaknesses and topic in profile.goals:
+        interest = 0.9
+    elif topic in profile.goals:
+        interest = 0.7
+    else:
+        interest = 0.5
+    score = min(1.0, max(0.0, 0.3 * difficulty_match + 0.3 * readiness + 0.2 * style_match + 0.2 * interest))
+    return score, (difficulty_match, readiness, style_match, interest)
+
+
+def test_recommendation_matrix_matches_item_scores():
+    """행렬 점수와 상위 k개 추천이 콘텐츠별 정의대로 계산한 결과와 같은지 확인"""
+    engine = AdaptiveLearningEngine()
+    interactions = make_interactions(n=3000, n_users=12, seed=7)
+    engine.track_interactions_batch(interactions)
+    # 일부 사용자가 전제 콘텐츠를 숙달하도록 성공 기록 추가
+    start = max(i.timestamp for i in interactions)
+    for user_id, content_ids in (("user_1", ["stats_basics"]), ("user_2", ["stats_basics", "probability"])):
+        for content_id in content_ids:
+            engine.track_interactions_batch([
+                LearningInteraction(user_id=user_id, timestamp=start + timedelta(minutes=n),
+                                    interaction_type=InteractionType.EXERCISE_ATTEMPT, content_id=content_id,
+                                    duration=300, success=True, difficulty_level=3)
+                for n in range(1, 200)])
+            start += timedelta(days=1)
+    profile = engine.learner_profiles["user_0"]
+    profile.goals, profile.weaknesses = ["probability_theory", "regression_analysis"], ["regression_analysis"]
+
+    user_ids = sorted(engine.learner_profiles)
+    matrix = engine.score_content_matrix(user_ids)
+    content_ids = matrix["content_ids"]
+    assert matrix["mastered"].any() and ((matrix["prerequisite_readiness"] % 1) > 0).any()
+    for i, user_id in enumerate(user_ids):
+        references = {content_id: reference_score(engine, user_id, content_id) for content_id in content_ids}
+        for j, content_id in enumerate(content_ids):
+            assert abs(matrix["score"][i, j] - references[content_id][0]) < 1e-12
+            assert matrix["mastered"][i, j] == engine._is_content_mastered(user_id, content_id)
+
+        candidates = [content_id for content_id in content_ids
+                      if not engine._is_content_mastered(user_id, content_id) and references[content_id][0] > 0.3]
+        expected = sorted(candidates, key=lambda content_id: -references[content_id][0])[:3]
+        recommendations = engine.generate_content_recommendations(user_id, 3)
+        assert [r.content_id for r in recommendations] == expected
+        for recommendation in recommendations:
+            assert recommendation.reasoning == engine._describe_recommendation(
+                *references[recommendation.content_id][1])
+
+
+def test_catalog_difficulty_and_mastered_bitsets():
+    """난이도는 카탈로그에서 읽고, 사용자별 숙달 비트셋이 집계와 일치하는지 확인"""
+    interactions = make_interactions(n=3000, n_users=8, seed=11)
+    start = max(i.timestamp for i in interactions)
+    interactions += [dataclasses.replace(interactions[0], timestamp=start + timedelta(minutes=n),
+                                         content_id="stats_basics", success=True)
+                     for n in range(1, 300)]
+    sequential = AdaptiveLearningEngine()
+    for interaction in sorted(interactions, key=lambda i: i.timestamp):
+        sequential.track_interaction(interaction)
+    batched = AdaptiveLearningEngine()
+    batched.track_interactions_batch(interactions)
+
+    def recount(engine, user_id):
+        return engine.content_catalog.mask(content_id for content_id in engine.content_catalog
+                                           if engine._is_content_mastered(user_id, content_id))
+
+    for engine in (sequential, batched):
+        for user_id in engine.learner_profiles:
+            assert engine._mastered_mask(user_id) == recount(engine, user_id)
+    assert any(batched._mastered_mask(user_id) for user_id in batched.learner_profiles)
+
+    # 숙달 임계값이 바뀌면 다음 조회에서 다시 계산
+    batched.adaptation_parameters["mastery_threshold"] = 0.0
+    for user_id in batched.learner_profiles:
+        assert batched._mastered_mask(user_id) == recount(batched, user_id)
+
+    # 난이도 등록은 카탈로그 버전을 바꿔 캐시된 추천을 무효화
+    user_id = interactions[0].user_id
+    sequential.generate_content_recommendations(user_id)
+    before = sequential.score_content_matrix([user_id])
+    sequential.register_content("regression", difficulty=10)
+    assert sequential.recommendation_cache.get(user_id, 5, sequential._catalog_token()) is None
+    after = sequential.score_content_matrix([user_id])
+    column = after["content_ids"].index("regression")
+    preferred = sequential.learner_profiles[user_id].preferred_difficulty
+    assert after["difficulty_match"][0, column] == max(0.0, 1.0 - abs(preferred - 10) / 10.0)
+    assert after["difficulty_match"][0, column] != before["difficulty_match"][0, column]
+
+    # 이전 형식 상태의 난이도 사전은 복원할 때 카탈로그로 옮겨짐
+    state = sequential.__getstate__()
+    state.pop("_mastered")
+    state["content_difficulty_map"] = {"probability": 2}
+    restored = AdaptiveLearningEngine.__new__(AdaptiveLearningEngine)
+    restored.__setstate__(state)
+    assert restored.content_catalog.difficulty("probability") == 2
+    assert restored._mastered_mask(user_id) == recount(restored, user_id)
+
+
+def test_background_refresh_shares_ingestion_lock():
+    """백그라운드 추천 갱신이 상호작용 반영과 같은 잠금을 쓰고, 캐시된 추천은 수정할 수 없는지 확인"""
+    interactions = sorted(make_interactions(n=2000, seed=8), key=lambda i: i.timestamp)
+    engine = AdaptiveLearningEngine()
+    engine.track_interactions_batch(interactions[:200])
+
+    errors = []
+    previous_hook = threading.excepthook
+    threading.excepthook = lambda args: errors.append(args.exc_value)
+    try:
+        engine.start_recommendation_refresh(interval=0.001)
+        for start in range(200, len(interactions), 50):
+            engine.track_interactions_batch(interactions[start:start + 25])
+            for interaction in interactions[start + 25:start + 50]:
+                engine.track_interaction(interaction)
+        engine.stop_recommendation_refresh()
+    finally:
+        threading.excepthook = previous_hook
+    assert errors == []
+
+    # 반영 중에는 갱신이 기다림
+    with engine._lock:
+        refresh = threading.Thread(target=engine.refresh_recommendations)
+        refresh.start()
+        refresh.join(0.2)
+        assert refresh.is_alive()
+    refresh.join()
+
+    expected = engine.generate_recommendations_batch(None, engine.recommendation_depth)
+    for user_id, recommendations in expected.items():
+        assert engine.generate_content_recommendations(user_id, engine.recommendation_depth) == recommendations
+
+    user_id = interactions[-1].user_id
+    served = engine.generate_content_recommendations(user_id)
+    try:
+        served[0].recommendation_score = 0.0
+    except dataclasses.FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("캐시된 추천이 수정되었습니다")
+    served.clear()
+    assert engine.generate_content_recommendations(user_id) == expected[user_id]
+
+
+def test_persistent_engine_recovery():
+    """스냅샷 + 로그 꼬리 재생으로 재시작 후 같은 상태가 복원되는지 확인"""
+    interactions = make_interactions(n=1500, seed=1)
+    reference = AdaptiveLearningEngine()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = PersistentLearningEngine(directory, snapshot_every=900)
+        for interaction in interactions[:1000]:
+            engine.track_interaction(interaction)
+            reference.track_interaction(interaction)
+        engine.track_interactions_batch(interactions[1000:])
+        reference.track_interactions_batch(interactions[1000:])
+        engine.close()
+
+        restored = PersistentLearningEngine(directory, snapshot_every=900)
+        restored.close()
+        assert restored.recovery["snapshot_lsn"] > 0
+        assert 0 < restored.recovery["replayed_events"] < len(interactions)
+        assert engine_state(restored.engine) == engine_state(reference)
+
+
+def test_rejected_events_do_not_break_restart():
+    """엔진이 거부한 상호작용은 로그에 남지 않고, 이전 로그의 거부 레코드는 재생 중 건너뛰는지 확인"""
+    interactions = sorted(make_interactions(n=200, seed=4), key=lambda i: i.timestamp)
+    aware = [dataclasses.replace(i, timestamp=i.timestamp.replace(tzinfo=timezone.utc))
+             for i in interactions[100:110]]
+    reference = AdaptiveLearningEngine()
+    reference.track_interactions_batch(interactions)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = PersistentLearningEngine(directory)
+        engine.track_interactions_batch(interactions[:100])
+        for rejected in (lambda: engine.track_interaction(aware[0]),
+                         lambda: engine.track_interactions_batch(aware)):
+            try:
+                rejected()
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("시간대가 다른 상호작용이 반영되었습니다")
+        engine.track_interactions_batch(interactions[100:])
+        lsn = engine.log.next_lsn
+        engine.close()
+
+        restored = PersistentLearningEngine(directory)
+        assert restored.log.next_lsn == lsn == 3  # 거부된 상호작용은 기록되지 않음
+        assert restored.recovery["rejected_records"] == 0
+        assert engine_state(restored.engine) == engine_state(reference)
+
+        # 반영 전에 기록하던 이전 버전의 로그: 거부 레코드를 건너뛰고 나머지는 재생
+        restored.log.append(_RECORD_INTERACTION, encode_interaction(aware[0]))
+        restored.close()
+        reopened = PersistentLearningEngine(directory)
+        reopened.close()
+        assert reopened.recovery["rejected_records"] == 1
+        assert engine_state(reopened.engine) == engine_state(reference)
+
+
+def test_snapshots_exclude_history_and_fall_back():
+    """스냅샷 크기가 기록 길이와 무관하고, 최신 스냅샷이 손상되면 직전 스냅샷으로 복원되는지 확인"""
+    interactions = make_interactions(n=6000, seed=9)
+    reference = AdaptiveLearningEngine()
+    with tempfile.TemporaryDirectory() as directory:
+        engine = PersistentLearningEngine(directory, snapshot_every=10 ** 9)
+        for chunk in (interactions[:1000], interactions[1000:5000], interactions[5000:5500]):
+            engine.track_interactions_batch(chunk)
+            reference.track_interactions_batch(chunk)
+            if len(chunk) > 500:
+                engine.snapshot()
+        first, latest = engine._snapshots()
+        assert os.path.getsize(latest[1]) < 1.1 * os.path.getsize(first[1])
+        assert os.path.getsize(latest[1]) < engine.interaction_history.memory_usage()
+        for interaction in interactions[5500:]:
+            engine.track_interaction(interaction)
+            reference.track_interaction(interaction)
+        engine.close()
+
+        with open(latest[1], 'r+b') as f:
+            f.seek(os.path.getsize(latest[1]) // 2)
+            f.write(b'\xff' * 64)
+        restored = PersistentLearningEngine(directory, snapshot_every=10 ** 9)
+        assert restored.recovery["snapshot_lsn"] == first[0]
+        assert restored.recovery["replayed_events"] == 5000
+        assert os.path.exists(latest[1] + '.corrupt')
+        assert engine_state(restored.engine) == engine_state(reference)
+        assert list(restored.interaction_history) == list(reference.interaction_history)
+
+        # 복원 후 새 스냅샷도 기록 파일의 이전 범위를 이어서 사용
+        restored.snapshot()
+        restored.close()
+        again = PersistentLearningEngine(directory, snapshot_every=10 ** 9)
+        again.close()
+        assert again.recovery["replayed_events"] == 0
+        assert engine_state(again.engine) == engine_state(reference)
+
+
+def test_log_replay_stops_at_first_corrupt_record():
+    """로그 중간 세그먼트가 손상되면 그 앞까지만 재생하고 이후 기록이 이어지는지 확인"""
+    interactions = sorted(make_interactions(n=40, seed=10), key=lambda i: i.timestamp)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = PersistentLearningEngine(directory, snapshot_every=10 ** 9)
+        for index, interaction in enumerate(interactions[:30]):
+            engine.track_interaction(interaction)
+            if index in (9, 19):
+                engine.log.rotate()
+        engine.close()
+
+        segments = engine.log.segments()
+        assert len(segments) == 3
+        with open(segments[1][1], 'r+b') as f:
+            f.seek(os.path.getsize(segments[1][1]) // 2)
+            f.write(b'\x00' * 8)
+
+        restored = PersistentLearningEngine(directory, snapshot_every=10 ** 9)
+        replayed = restored.recovery["replayed_events"]
+        assert 10 <= replayed < 20
+        assert os.path.exists(segments[2][1] + '.corrupt')
+        for interaction in interactions[30:]:
+            restored.track_interaction(interaction)
+        restored.close()
+
+        reference = AdaptiveLearningEngine()
+        for interaction in interactions[:replayed] + interactions[30:]:
+            reference.track_interaction(interaction)
+        again = PersistentLearningEngine(directory, snapshot_every=10 ** 9)
+        again.close()
+        assert again.recovery["replayed_events"] == replayed + 10
+        assert engine_state(again.engine) == engine_state(reference)
+
+
+def test_sharded_engine_matches_single_engine():
+    """샤드 라우터 결과가 단일 엔진과 같고, 잘못된 상호작용이 다른 기록이나 호출에 영향이 없는지 확인"""
+    interactions = sorted(make_interactions(n=1500, n_users=30, seed=11), key=lambda i: i.timestamp)
+    reference = AdaptiveLearningEngine()
+    for interaction in interactions:
+        reference.track_interaction(interaction)
+
+    first = interactions[0]
+    malformed = dataclasses.replace(first, interaction_type="nope")
+    # 검증은 통과하지만 naive 시각을 저장한 샤드에서 거부되는 상호작용
+    aware = dataclasses.replace(first, timestamp=first.timestamp.replace(tzinfo=timezone.utc))
+    with ShardedLearningEngine(n_shards=2, max_pending=64) as sharded:
+        for index, interaction in enumerate(interactions):
+            sharded.track_interaction(interaction)
+            if index == 700:
+                try:
+                    sharded.track_interaction(malformed)
+                except ValueError:
+                    pass
+                else:
+                    raise AssertionError("잘못된 상호작용 유형이 전송되었습니다")
+                sharded.track_interaction(aware)
+
+        for user_id in reference.learner_profiles:
+            assert (sharded.generate_content_recommendations(user_id)
+                    == reference.generate_content_recommendations(user_id))
+        assert (sharded.predict_learning_outcome(first.user_id, "regression")
+                == reference.predict_learning_outcome(first.user_id, "regression"))
+        assert sharded.get_interaction_analytics().sort_index().equals(
+            reference.get_interaction_analytics().sort_index())
+
+        metrics = sharded.shard_metrics()
+        assert sum(shard["interactions"] for shard in metrics) == len(interactions)
+        assert sum(shard["errors"] for shard in metrics) == 1
+        assert any("ValueError" in (shard["last_error"] or "") for shard in metrics)
+
+    report = benchmark_sharded_engine(interactions[:300], shard_counts=(1, 2))
+    assert report.index.tolist() == [0, 1, 2] and (report["events_per_second"] > 0).all()
+
+
+def test_ingestion_pipeline_read_your_writes():
+    """비동기 수집 후 추천이 방금 제출한 상호작용까지 반영하는지 확인"""
+    interactions = sorted(make_interactions(n=1000, seed=2), key=lambda i: i.timestamp)
+    reference = AdaptiveLearningEngine()
+    for interaction in interactions:
+        reference.track_interaction(interaction)
+
+    engine = AdaptiveLearningEngine()
+    with IngestionPipeline(engine, max_queue=200, max_batch=64, max_wait=1.0) as pipeline:
+        for interaction in interactions:
+            pipeline.submit(interaction)
+        user_id = interactions[-1].user_id
+        recommendations = pipeline.generate_content_recommendations(user_id)
+        expected = reference.generate_content_recommendations(user_id)
+        assert [r.content_id for r in recommendations] == [r.content_id for r in expected]
+        assert pipeline.flush(timeout=10)
+        metrics = pipeline.metrics()
+        assert metrics["applied"] == len(interactions) and metrics["pending"] == 0
+
+    assert engine_state(engine) == engine_state(reference)
+
+
+def test_ingestion_pipeline_isolates_bad_events():
+    """잘못된 상호작용은 제출 시 거부되고, 엔진에서 실패한 항목만 버려지는지 확인"""
+    start = datetime(2024, 1, 1, 9, 0)
+    valid = [LearningInteraction(user_id="a", content_id="stats_basics",
+                                 interaction_type=InteractionType.EXERCISE_ATTEMPT,
+                                 timestamp=start + timedelta(minutes=i), duration=60,
+                                 success=True, attempts=1, hint_used=False,
+                                 difficulty_level=3, confidence_level=4)
+             for i in range(10)]
+    bad_type = dataclasses.replace(valid[0], user_id="b", interaction_type="nope")
+    # 검증은 통과하지만 시간대가 없는 저장소에 들어갈 수 없는 상호작용
+    aware = dataclasses.replace(valid[5], user_id="c", timestamp=valid[5].timestamp.replace(tzinfo=timezone.utc))
+
+    reference = AdaptiveLearningEngine()
+    for interaction in valid:
+        reference.track_interaction(interaction)
+
+    engine = AdaptiveLearningEngine()
+    with IngestionPipeline(engine, max_batch=64, max_wait=1.0) as pipeline:
+        try:
+            pipeline.submit(bad_type)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("잘못된 상호작용 유형이 큐에 들어갔습니다")
+        for interaction in valid[:5]:
+            pipeline.submit(interaction)
+        assert pipeline.flush("a", timeout=10)
+        for interaction in [aware] + valid[5:]:
+            pipeline.submit(interaction)
+        assert pipeline.flush("a", timeout=10)
+        assert not pipeline.flush("c", timeout=10)
+        assert pipeline.flush("c", timeout=10)  # 실패는 한 번만 보고됨
+        metrics = pipeline.metrics()
+
+    assert metrics["submitted"] == 11 and metrics["applied"] == 10 and metrics["errors"] == 1
+    assert metrics["pending"] == 0 and isinstance(pipeline.last_error, ValueError)
+    assert len(engine.interaction_history) == 10
+    assert engine_state(engine) == engine_state(reference)
+
+
+def test_success_prediction_uses_knowledge_difficulty_and_readiness():
+    """지식 추적 갱신과, 어렵거나 전제조건이 준비되지 않은 콘텐츠의 성공 확률이 더 낮은지 확인"""
+    engine = AdaptiveLearningEngine()
+    params = engine.adaptation_parameters
+    slip, guess, alpha = params["slip_probability"], params["guess_probability"], params["learning_rate_alpha"]
+    start = datetime(2024, 3, 1, 9, 0)
+
+    def answer(user_id, content_id, success, minutes):
+        engine.track_interaction(LearningInteraction(
+            user_id=user_id, timestamp=start + timedelta(minutes=minutes),
+            interaction_type=InteractionType.EXERCISE_ATTEMPT, content_id=content_id,
+            duration=120, success=success, difficulty_level=5))
+
+    # 같은 날의 첫 관측은 베이즈 갱신 후 학습 전이 (망각 없음)
+    answer("learner", "stats_basics", True, 0)
+    p = params["initial_knowledge"]
+    posterior = p * (1 - slip) / (p * (1 - slip) + (1 - p) * guess)
+    expected = posterior + (1 - posterior) * alpha
+    state = engine._knowledge[("learner", "descriptive_statistics")]
+    assert abs(state.p_known - expected) < 1e-12
+    answer("learner", "stats_basics", False, 1)
+    assert engine._knowledge[("learner", "descriptive_statistics")].p_known < expected
+    for minute in range(2, 40):
+        answer("learner", "stats_basics", True, minute)
+    answer("novice", "stats_basics", True, 0)
+    assert engine._is_content_mastered("learner", "stats_basics")
+
+    # 같은 주제, 같은 전제조건에서 난이도만 다른 콘텐츠
+    engine.register_content("probability_easy", topic="probability_theory", difficulty=2,
+                            prerequisites=["stats_basics"])
+    engine.register_content("probability_hard", topic="probability_theory", difficulty=9,
+                            prerequisites=["stats_basics"])
+    easy, hard = engine.predict_success_batch(["learner", "learner"], ["probability_easy", "probability_hard"])
+    assert guess < hard < easy < 1 - slip
+
+    # 전제조건을 숙달하지 않은 학습자는 추측 확률에 가까움
+    ready, unready = engine.predict_success_batch(["learner", "novice"], ["probability", "probability"])
+    assert ready > unready == guess
+    assert engine._predict_success_probability("novice", "factor_analysis") == guess
+    assert engine._predict_success_probability("novice", "stats_basics") > guess
+    assert engine.predict_learning_outcome("novice", "factor_analysis")["required_help_level"] == "high"
+
+    pairs = [(user_id, content_id) for user_id in ("learner", "novice") for content_id in engine.content_catalog]
+    batch = engine.predict_success_batch(*map(list, zip(*pairs)))
+    assert [engine._predict_success_probability(*pair) for pair in pairs] == batch.tolist()
+
+
+def test_content_catalog_prerequisites():
+    """전이적 전제조건 비트셋과 숙달 비트셋 기반 준비도 확인"""
+    catalog = AdaptiveLearningEngine().content_catalog
+    assert catalog.missing_prerequisites("factor_analysis") == [
+        "stats_basics", "probability", "hypothesis_testing", "regression"]
+    mastered = catalog.mask(["stats_basics"])
+    assert catalog.readiness("hypothesis_testing", mastered) == 0.5
+    assert catalog.prerequisites_met("probability", mastered)
+    assert not catalog.prerequisites_met("regression", catalog.mask(["hypothesis_testing"]), transitive=True)
+    assert catalog.dependents("probability") == ["hypothesis_testing"]
+
+
+def test_decayed_skill_estimates():
+    """시간 감쇠 주제별 추정치가 일괄/순차 추적에서 같고 읽는 시점에 감쇠되는지 확인"""
+    interactions = make_interactions(n=1500, seed=3)
+    sequential = AdaptiveLearningEngine()
+    batched = AdaptiveLearningEngine()
+    for interaction in sorted(interactions, key=lambda i: i.timestamp):
+        sequential.track_interaction(interaction)
+    batched.track_interactions_batch(interactions)
+
+    user_id = interactions[-1].user_id
+    as_of = max(i.timestamp for i in interactions)
+    expected = sequential.get_skill_estimates(user_id, as_of)
+    estimates = batched.get_skill_estimates(user_id, as_of)
+    assert expected.keys() == estimates.keys()
+    for topic, values in expected.items():
+        for name, value in values.items():
+            assert abs(estimates[topic][name] - value) < 1e-9
+
+    later = sequential.get_skill_estimates(user_id, as_of + timedelta(days=30))
+    initial = sequential.adaptation_parameters["initial_knowledge"]
+    for topic, values in expected.items():
+        assert later[topic]["evidence"] < values["evidence"]
+        assert abs(later[topic]["proficiency"] - initial) <= abs(values["proficiency"] - initial)
+        assert later[topic]["success_rate"] == values["success_rate"]
+
+
+def test_success_decay_and_as_of_follow_store_rules():
+    """성공 집계 감쇠가 망각 계수와 분리되고, as_of가 저장소의 시간대 규칙을 따르는지 확인"""
+    interactions = make_interactions(n=1500, seed=5)
+    engine = AdaptiveLearningEngine()
+    engine.adaptation_parameters.update(success_decay_per_day=1.0, forgetting_factor=0.5)
+    engine.track_interactions_batch(interactions)
+
+    user_id = interactions[0].user_id
+    as_of = max(i.timestamp for i in interactions)
+    now = engine.get_skill_estimates(user_id, as_of)
+    later = engine.get_skill_estimates(user_id, as_of + timedelta(days=30))
+    for topic, values in now.items():
+        counts = engine._topic_counts[(user_id, topic)]
+        assert abs(values["success_rate"] - counts.successes / counts.graded) < 1e-12
+        assert abs(values["evidence"] - counts.graded) < 1e-9
+        assert later[topic]["evidence"] == values["evidence"]
+        initial = engine.adaptation_parameters["initial_knowledge"]
+        assert abs(later[topic]["proficiency"] - initial) <= abs(values["proficiency"] - initial)
+
+    aware_engine = AdaptiveLearningEngine()
+    aware_engine.track_interactions_batch([dataclasses.replace(i, timestamp=i.timestamp.replace(tzinfo=timezone.utc))
+                                           for i in interactions])
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "Asia/Seoul"
+    time.tzset()
+    try:
+        # 시간대 없는 저장소: aware as_of는 같은 순간의 로컬 시각으로 비교
+        assert engine.get_skill_estimates(user_id, as_of.astimezone()) == now
+        # aware 저장소: naive as_of는 로컬 시각으로 해석 (UTC 벽시계 시각이 아님)
+        expected = aware_engine.get_skill_estimates(user_id, as_of.astimezone())
+        assert aware_engine.get_skill_estimates(user_id, as_of) == expected
+        assert aware_engine.get_skill_estimates(user_id, as_of.replace(tzinfo=timezone.utc)) != expected
+    finally:
+        if previous is None:
+            os.environ.pop("TZ")
+        else:
+            os.environ["TZ"] = previous
+        time.tzset()
+
+
+if __name__ == "__main__":
+    test_batch_matches_sequential()
+    test_interaction_store_sequence_and_time_zones()
+    test_recent_window_matches_full_scan()
+    test_running_success_counters_match_recount()
+    test_recommendation_matrix_matches_item_scores()
+    test_catalog_difficulty_and_mastered_bitsets()
+    test_background_refresh_shares_ingestion_lock()
+    test_persistent_engine_recovery()
+    test_rejected_events_do_not_break_restart()
+    test_snapshots_exclude_history_and_fall_back()
+    test_log_replay_stops_at_first_corrupt_record()
+    test_sharded_engine_matches_single_engine()
+    test_ingestion_pipeline_read_your_writes()
+    test_ingestion_pipeline_isolates_bad_events()
+    test_success_prediction_uses_knowledge_difficulty_and_readiness()
+    test_content_catalog_prerequisites()
+    test_decayed_skill_estimates()
+    test_success_decay_and_as_of_follow_store_rules()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+데이터셋 생성/저장소/통계 모듈 테스트
+"""
+
+import gc
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from modules.data_processing import (
+    CLASSIC_LOADINGS, build_chart_payload, build_factor_loadings, generate_factor_analysis_data, generate_ml_dataset,
+    generate_research_dataset, generate_sharded_dataset, get_unified_dataset, prepare_visualization_data
+)
+from modules.dataset_snapshot import DatasetSnapshot, SnapshotHolder
+from modules.dataset_store import ColumnarFrameWriter, DatasetStore
+from modules.public_datasets import PublicDatasetRegistry, _load_iris
+from modules.summary_statistics import append_rows, mark_modified, summary_statistics
+
+
+def test_compact_dtypes_keep_values():
+    """compact 모드가 값은 유지하면서 작은 dtype을 사용하는지 확인"""
+    default = generate_research_dataset(500)
+    compact = generate_research_dataset(500, compact=True)
+    assert isinstance(compact['group'].dtype, pd.CategoricalDtype)
+    assert compact['Q1_1'].dtype == np.int8 and compact['performance_score'].dtype == np.float32
+    assert (compact['group'].astype(str).to_numpy() == default['group'].to_numpy()).all()
+    assert (compact['Q3_2'].to_numpy() == default['Q3_2'].to_numpy()).all()
+    assert np.allclose(compact['performance_score'], default['performance_score'], atol=1e-5)
+    assert compact.memory_usage(deep=True).sum() * 2 < default.memory_usage(deep=True).sum()
+
+    ml = generate_ml_dataset(200, compact=True)
+    assert ml['Feature_01'].dtype == np.float32
+    assert list(ml['target'].cat.categories) == ['Class_A', 'Class_B', 'Class_C']
+
+
+def test_store_returns_private_copies():
+    """메모이즈된 데이터셋을 수정해도 다른 호출자에게 영향이 없는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = DatasetStore(directory)
+        first = store.load_or_generate(generate_research_dataset, n_subjects=50)
+        expected = first.copy()
+        first.loc[0, 'age'] = -1
+        first['extra'] = 1
+        assert store.load_or_generate(generate_research_dataset, n_subjects=50).equals(expected)
+
+        # 디스크에서 메모리 매핑으로 읽은 결과도 마찬가지
+        store.clear_memory()
+        data, _, loadings = store.load_or_generate(generate_factor_analysis_data, n_subjects=50)
+        data.iloc[0, 0] = 99
+        loadings[0, 0] = 99
+        data2, _, loadings2 = store.load_or_generate(generate_factor_analysis_data, n_subjects=50)
+        assert data2.iloc[0, 0] != 99 and loadings2[0, 0] != 99
+
+
+def _mixed_objects():
+    return pd.DataFrame({'label': ['a', 'b', 'a'], 'mixed': pd.Series([1, 'a', 2.5], dtype=object)})
+
+
+def test_store_refuses_mixed_object_columns():
+    """문자열이 아닌 값이 섞인 object 컬럼은 값을 잃은 채 저장되지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = DatasetStore(directory)
+        try:
+            store.load_or_generate(_mixed_objects)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("섞인 object 컬럼이 저장되었습니다")
+        assert os.listdir(directory) == []
+
+        store.save('labels', _mixed_objects()[['label']])
+        store.clear_memory()
+        assert store.load_cached('labels')['label'].tolist() == ['a', 'b', 'a']
+
+
+def test_factor_loadings_are_not_shared():
+    """기본 로딩 행렬을 수정해도 상수와 이후 결과가 바뀌지 않는지 확인"""
+    _, _, loadings = generate_factor_analysis_data(100)
+    loadings[:] = 0
+    assert generate_factor_analysis_data(100)[2].sum() == CLASSIC_LOADINGS.sum() > 0
+
+    sparse = build_factor_loadings(200, 8, cross_loading_density=0.1)
+    assert sparse.shape == (200, 8)
+    assert (np.asarray((sparse >= 0.6).sum(axis=1)).ravel() == 1).all()
+    data, _, _ = generate_factor_analysis_data(300, n_factors=8, n_items=200, compact=True, block_rows=64)
+    assert data.shape == (300, 200) and data.dtypes.eq(np.int8).all()
+    assert data.equals(generate_factor_analysis_data(300, n_factors=8, n_items=200, compact=True)[0])
+
+
+class _FailingWriter(ColumnarFrameWriter):
+    def write(self, start, df):
+        raise RuntimeError("기록 실패")
+
+
+class _FailingStore(DatasetStore):
+    def begin_frame(self, *args, **kwargs):
+        staging, writer = super().begin_frame(*args, **kwargs)
+        writer.__class__ = _FailingWriter
+        return staging, writer
+
+
+def test_sharded_generation_is_deterministic_and_local():
+    """샤드 생성이 작업자 수와 무관하고 전역 난수 상태와 임시 파일을 남기지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        np.random.seed(123)
+        expected_draw = np.random.random()
+        np.random.seed(123)
+        single = generate_sharded_dataset('research', 5000, n_jobs=1, shard_rows=1500,
+                                          store=DatasetStore(first))
+        assert np.random.random() == expected_draw
+        parallel = generate_sharded_dataset('research', 5000, n_jobs=2, shard_rows=1500,
+                                            store=DatasetStore(second))
+        assert single.equals(parallel)
+        assert single['subject_id'].tolist() == list(range(1, 5001))
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            generate_sharded_dataset('ml', 1000, n_jobs=1, shard_rows=500, store=_FailingStore(directory))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("기록 실패가 전달되지 않았습니다")
+        assert os.listdir(directory) == []
+
+
+def test_chart_payload_with_cached_group_codes():
+    """스냅샷에 캐시된 그룹 코드로 만든 차트 데이터가 factorize 결과와 같은지 확인"""
+    snapshot = DatasetSnapshot(generate_research_dataset(300))
+    codes = snapshot.group_codes('group')
+    assert snapshot.group_codes('group') is codes
+    assert snapshot.group_codes('missing') is None
+
+    view = snapshot.view('advanced')
+    expected = build_chart_payload(view, 'performance_score', 'age', None, 'group')
+    assert build_chart_payload(view, 'performance_score', 'age', None, 'group', group_codes=codes) == expected
+    assert sum(len(dataset['x']) for dataset in expected) == 300
+    assert [dataset['label'] for dataset in expected] == list(pd.unique(view['group']))
+
+
+def test_summary_statistics_follow_in_place_edits():
+    """요약 통계가 pandas 결과와 같고, 수정을 알리거나 컬럼이 바뀌면 다시 계산되는지 확인"""
+    df = generate_research_dataset(400)
+    df.loc[::7, 'performance_score'] = np.nan
+    stats = summary_statistics(df)
+    assert summary_statistics(df) is stats
+    assert np.allclose(stats.mean(), df.mean(numeric_only=True))
+    assert np.allclose(stats.corr(), df.corr(numeric_only=True), equal_nan=True)
+
+    df.loc[0, 'age'] = 500
+    mark_modified(df)
+    updated = summary_statistics(df)
+    assert updated is not stats
+    assert np.isclose(updated.mean()['age'], df['age'].mean())
+
+    df['extra'] = 1.0  # 컬럼 추가는 축이 바뀌므로 자동으로 다시 계산
+    assert 'extra' in summary_statistics(df).mean().index
+    del df['extra']
+
+    combined = append_rows(df, generate_research_dataset(100, random_state=1))
+    assert np.allclose(summary_statistics(combined).std(), combined.std(numeric_only=True))
+
+    # 빈도표만 요청하면 교차곱을 누적하지 않음
+    fresh = generate_research_dataset(200)
+    histogram = prepare_visualization_data(fresh, 'histogram', x_col='education')
+    counts = fresh['education'].value_counts()
+    assert histogram['labels'] == counts.index.tolist() and histogram['counts'] == counts.tolist()
+    assert summary_statistics(fresh)._shift is None
+
+
+def test_unified_dataset_levels_share_snapshot_columns():
+    """통합 데이터셋 레벨 뷰가 스냅샷 컬럼 정의를 따르고 호출자별 사본인지 확인"""
+    full = get_unified_dataset('all')
+    snapshot = DatasetSnapshot(full)
+    for level in ('beginner', 'intermediate', 'advanced'):
+        assert get_unified_dataset(level).columns.tolist() == snapshot.columns_for(level)
+
+    beginner = get_unified_dataset('beginner')
+    beginner.loc[0, 'age'] = -1
+    beginner['extra'] = 1
+    assert get_unified_dataset('beginner').equals(snapshot.view('beginner'))
+
+    view = snapshot.view('beginner', 'demographics')
+    assert 'performance_score' in view.columns
+    view.loc[0, 'age'] = -1
+    assert snapshot.view('beginner', 'demographics').loc[0, 'age'] != -1
+    assert snapshot.handle('beginner').n_rows == len(full)
+
+
+def test_snapshot_holder_swaps_and_releases():
+    """스냅샷 교체 후에도 고정한 스냅샷은 유지되고, 참조가 사라지면 해제되는지 확인"""
+    holder = SnapshotHolder()
+    pinned = holder.publish(DatasetSnapshot(generate_research_dataset(50), 'old'))
+    assert holder.publish(DatasetSnapshot(generate_research_dataset(60), 'old')) is pinned
+
+    holder.publish(DatasetSnapshot(generate_research_dataset(80), 'new'))
+    assert holder.current().snapshot_id == 'new' and holder.current().n_rows == 80
+    assert holder.get('old') is pinned and pinned.n_rows == 50
+
+    del pinned
+    gc.collect()
+    assert holder.get('old') is None and holder.get('new') is holder.current()
+
+
+def test_public_registry_copies_and_stratified_sample():
+    """공개 데이터셋 레지스트리가 사본을 반환하고 층화 표본을 추출하는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = PublicDatasetRegistry(DatasetStore(directory))
+        registry.register('iris', _load_iris, strata='species')
+        iris = registry.load('iris')
+        iris['species'] = 'poisoned'
+        assert set(registry.load('iris')['species']) == {'setosa', 'versicolor', 'virginica'}
+
+        sample = registry.sample('iris', 30)
+        assert len(sample) == 30
+        assert sample['species'].value_counts().tolist() == [10, 10, 10]
+
+
+if __name__ == "__main__":
+    test_compact_dtypes_keep_values()
+    test_store_returns_private_copies()
+    test_store_refuses_mixed_object_columns()
+    test_factor_loadings_are_not_shared()
+    test_sharded_generation_is_deterministic_and_local()
+    test_chart_payload_with_cached_group_codes()
+    test_summary_statistics_follow_in_place_edits()
+    test_unified_dataset_levels_share_snapshot_columns()
+    test_snapshot_holder_swaps_and_releases()
+    test_public_registry_copies_and_stratified_sample()
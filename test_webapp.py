@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+웹 애플리케이션과 통합 콘텐츠 캐시 테스트
+"""
+
+import json
+import pickle
+
+import webapp
+from modules import content_integration
+from modules.content_integration import ContentIntegrator
+from modules.static_content import StaticContentCache
+
+
+def test_handle_href_resolves_in_fresh_app():
+    """다른 작업자가 만든 데이터 핸들 주소를 새 프로세스 상태에서도 조회할 수 있는지 확인"""
+    integrator = content_integration.content_integrator
+    handle = integrator.create_bridge_content('beginner', 'intermediate')['dataset']
+    expected = integrator.get_level_specific_data('beginner', 'demographics')
+
+    # 아무 스냅샷도 게시하지 않은 새 작업자와 같은 상태
+    content_integration.content_integrator = ContentIntegrator()
+    try:
+        client = webapp.app.test_client()
+        response = client.get(handle['href'])
+        expired = client.get('/api/data/beginner?snapshot=000000000000')
+    finally:
+        content_integration.content_integrator = integrator
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['columns'] == handle['columns'] == expected.columns.tolist()
+    assert body['shape'] == [handle['n_rows'], len(handle['columns'])]
+    assert expired.status_code == 410
+
+
+def test_cohorts_from_config_share_memory_budget():
+    """설정 파일로 등록한 코호트를 제공하고, 통합 데이터셋도 메모리 한도에 포함되는지 확인"""
+    try:
+        ContentIntegrator(cohort_config={'bad': {'n_rows': 10}})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("알 수 없는 코호트 매개변수가 허용되었습니다")
+
+    integrator = ContentIntegrator(cohort_memory_mb=0.01,
+                                   cohort_config={'class-a': {'n_subjects': 120, 'random_state': 7}})
+    default = integrator.generate_unified_dataset()
+    metrics = integrator.cohorts.metrics()
+    assert metrics['pinned'] == ['default'] and metrics['resident'] == ['default']
+    assert metrics['memory_bytes'] == default.memory_usage(deep=True).sum() > 0
+
+    original = content_integration.content_integrator
+    content_integration.content_integrator = integrator
+    try:
+        client = webapp.app.test_client()
+        response = client.get('/api/data/beginner?cohort=class-a')
+        missing = client.get('/api/data/beginner?cohort=class-z')
+        listed = client.get('/api/cohorts').get_json()
+    finally:
+        content_integration.content_integrator = original
+
+    assert response.status_code == 200 and response.get_json()['shape'][0] == 120
+    assert missing.status_code == 404
+    # 한도를 넘으면 고정되지 않은 코호트만 방출되고 통합 데이터셋은 유지됨
+    assert listed['cohorts'] == ['default', 'class-a']
+    assert listed['metrics']['resident'] == ['default']
+    assert listed['metrics']['cohorts']['class-a']['evictions'] == 1
+    assert integrator.unified_dataset is default
+
+    # 다른 크기로 다시 게시하면 이전 통합 코호트는 고정이 풀려 방출 대상이 됨
+    integrator.generate_unified_dataset(n_subjects=150)
+    metrics = integrator.cohorts.metrics()
+    assert metrics['pinned'] == ['unified-150'] and metrics['resident'] == ['unified-150']
+
+
+def test_static_content_keeps_lists_and_bounds_pages():
+    """동결된 콘텐츠가 list/dict로 유지되고 렌더링 캐시가 LRU로 제한되는지 확인"""
+    integrator = ContentIntegrator()
+    roadmap = integrator.generate_content_roadmap()
+    path = roadmap['learning_path']
+    assert isinstance(path, list) and isinstance(path[0]['objectives'], list)
+    for mutate in (lambda: path.append({}), lambda: path[0].update(stage=9), lambda: path.sort()):
+        try:
+            mutate()
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("동결된 콘텐츠가 수정되었습니다")
+    assert integrator.generate_content_roadmap() is roadmap
+    assert pickle.loads(pickle.dumps(roadmap)) == roadmap
+    assert json.loads(integrator.static_content.json_bytes('roadmap.json', lambda: roadmap)) == roadmap
+
+    cache = StaticContentCache(max_rendered=2)
+    renders = []
+    for key in ('a', 'b', 'a', 'c', 'a', 'b'):
+        cache.rendered(key, lambda: renders.append(key) or key)
+    assert renders == ['a', 'b', 'c', 'b']
+    cache.invalidate()
+    assert cache.rendered('a', lambda: 'new') == b'new'
+
+
+if __name__ == "__main__":
+    test_handle_href_resolves_in_fresh_app()
+    test_cohorts_from_config_share_memory_budget()
+    test_static_content_keeps_lists_and_bounds_pages()
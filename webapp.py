@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, abort, g, render_template, request, jsonify
 import markdown
 import os
 from docs.docs_index import book_structure
@@ -19,6 +19,42 @@ COLORS = {
 app = Flask(__name__)
 
 
+def pinned_snapshot():
+    """요청 동안 고정된 통합 데이터셋 스냅샷 (도중에 교체되어도 같은 데이터 사용)
+
+    ?snapshot=<id>가 주어지면 데이터 핸들이 가리키는 스냅샷을 사용한다. 이 프로세스에
+    없는 스냅샷은 코호트 등록 정보나 저장소에서 다시 만들고, 다시 만들 수 없을 때만
+    410을 반환한다. ?cohort=<이름>이면 해당 코호트의 스냅샷을 사용한다
+    (등록되지 않은 코호트는 404).
+    """
+    if 'snapshot' not in g:
+        integrator = content_integration.content_integrator
+        snapshot_id = request.args.get('snapshot')
+        cohort = request.args.get('cohort')
+        if snapshot_id is None:
+            if cohort is not None and cohort not in integrator.cohorts.cohorts:
+                abort(404, description=f"등록되지 않은 코호트입니다: {cohort}")
+            g.snapshot = integrator.pin(cohort)
+        else:
+            g.snapshot = integrator.resolve(snapshot_id)
+            if g.snapshot is None:
+                abort(410, description=f"만료된 데이터셋 스냅샷입니다: {snapshot_id}")
+    return g.snapshot
+
+
+@app.errorhandler(410)
+def snapshot_expired(error):
+    """만료된 스냅샷 요청 응답"""
+    return jsonify({'error': error.description}), 410
+
+
+@app.route('/api/cohorts')
+def get_cohorts():
+    """코호트 목록과 캐시 지표 API"""
+    cohorts = content_integration.content_integrator.cohorts
+    return jsonify({'cohorts': cohorts.names(), 'metrics': cohorts.metrics()})
+
+
 def load_markdown(path):
     """마크다운 파일을 읽어 HTML과 코드 블록을 반환"""
     with open(os.path.join('docs', path), 'r', encoding='utf-8') as f:
@@ -37,20 +73,21 @@ def index():
     # 통합 데이터셋 생성
     integrator = content_integration.content_integrator
     integrator.generate_unified_dataset()
+    snapshot = pinned_snapshot()
     
     books = {}
     
     # 레벨별 데이터셋 및 시각화 매핑
     level_mapping = {
-        '통합 개요': {'level': 'overview', 'data_func': lambda: integrator.get_level_specific_data('advanced')},
-        '연구방법론': {'level': 'beginner', 'data_func': lambda: integrator.get_level_specific_data('beginner')},
-        '요인분석 이론': {'level': 'intermediate', 'data_func': lambda: integrator.get_level_specific_data('intermediate')},
-        '통계학습': {'level': 'advanced', 'data_func': lambda: integrator.get_level_specific_data('advanced')}
+        '통합 개요': {'level': 'overview', 'data_func': lambda: integrator.get_level_specific_data('advanced', snapshot=snapshot)},
+        '연구방법론': {'level': 'beginner', 'data_func': lambda: integrator.get_level_specific_data('beginner', snapshot=snapshot)},
+        '요인분석 이론': {'level': 'intermediate', 'data_func': lambda: integrator.get_level_specific_data('intermediate', snapshot=snapshot)},
+        '통계학습': {'level': 'advanced', 'data_func': lambda: integrator.get_level_specific_data('advanced', snapshot=snapshot)}
     }
     
     for key, sections in book_structure.items():
         books[key] = []
-        level_info = level_mapping.get(key, {'level': 'beginner', 'data_func': lambda: integrator.get_level_specific_data('beginner')})
+        level_info = level_mapping.get(key, {'level': 'beginner', 'data_func': lambda: integrator.get_level_specific_data('beginner', snapshot=snapshot)})
         level_data = level_info['data_func']()
         
         for sec in sections:
@@ -59,9 +96,10 @@ def index():
             # 레벨별 적절한 시각화 데이터 생성
             if level_info['level'] == 'beginner':
                 # 연구방법론: 인구통계 데이터 시각화
-                if 'age' in level_data.columns and 'group' in level_data.columns:
-                    chart_data = data_processing.prepare_scatter_datasets(
-                        level_data, 'age', 'performance_score', COLORS, 'group'
+                if {'age', 'performance_score', 'group'} <= set(level_data.columns):
+                    chart_data = data_processing.build_chart_payload(
+                        level_data, 'age', 'performance_score', COLORS, 'group',
+                        group_codes=snapshot.group_codes('group')
                     )
                     x_col, y_col = 'age', 'performance_score'
                 else:
@@ -73,7 +111,7 @@ def index():
                 numeric_cols = level_data.select_dtypes(include=['number']).columns
                 if len(numeric_cols) >= 2:
                     x_col, y_col = numeric_cols[0], numeric_cols[1] if len(numeric_cols) > 1 else numeric_cols[0]
-                    chart_data = data_processing.prepare_scatter_datasets(
+                    chart_data = data_processing.build_chart_payload(
                         level_data, x_col, y_col, COLORS, None
                     )
                 else:
@@ -83,8 +121,9 @@ def index():
             elif level_info['level'] == 'advanced':
                 # 고급 분석: 머신러닝 특성 시각화
                 if 'performance_score' in level_data.columns and 'success' in level_data.columns:
-                    chart_data = data_processing.prepare_scatter_datasets(
-                        level_data, 'performance_score', 'age', COLORS, 'group'
+                    chart_data = data_processing.build_chart_payload(
+                        level_data, 'performance_score', 'age', COLORS, 'group',
+                        group_codes=snapshot.group_codes('group')
                     )
                     x_col, y_col = 'performance_score', 'age'
                 else:
@@ -113,10 +152,8 @@ def index():
 def get_data(level):
     """레벨별 데이터 API"""
     integrator = content_integration.content_integrator
-    if integrator.unified_dataset is None:
-        integrator.generate_unified_dataset()
-    
-    data = integrator.get_level_specific_data(level)
+    data = integrator.get_level_specific_data(level, request.args.get('focus'),
+                                              snapshot=pinned_snapshot())
     return jsonify({
         'data': data.to_dict(orient='records'),
         'columns': data.columns.tolist(),
@@ -128,10 +165,7 @@ def get_data(level):
 def get_visualization(level):
     """레벨별 시각화 API"""
     integrator = content_integration.content_integrator
-    if integrator.unified_dataset is None:
-        integrator.generate_unified_dataset()
-    
-    data = integrator.get_level_specific_data(level)
+    data = integrator.get_level_specific_data(level, snapshot=pinned_snapshot())
     
     if level == 'beginner':
         viz_b64 = visualization.plot_research_methodology(data)
@@ -152,24 +186,49 @@ def get_visualization(level):
 def get_bridge_content(from_level, to_level):
     """레벨 간 연결 콘텐츠 API"""
     integrator = content_integration.content_integrator
-    bridge_content = integrator.create_bridge_content(from_level, to_level)
+    bridge_content = integrator.create_bridge_content(from_level, to_level, pinned_snapshot())
     return jsonify(bridge_content)
 
 
 @app.route('/comprehensive')
 def comprehensive_example():
-    """종합 예시 페이지"""
+    """종합 예시 페이지 (스냅샷별로 한 번만 렌더링)"""
     integrator = content_integration.content_integrator
-    example = integrator.create_comprehensive_example()
-    return render_template('comprehensive.html', example=example)
+    snapshot = pinned_snapshot()
+    page = integrator.static_content.rendered(
+        ('comprehensive', snapshot.snapshot_id),
+        lambda: render_template('comprehensive.html',
+                                example=integrator.create_comprehensive_example(snapshot))
+    )
+    return Response(page, mimetype='text/html')
 
 
 @app.route('/roadmap')
 def learning_roadmap():
-    """학습 로드맵 페이지"""
+    """학습 로드맵 페이지 (한 번만 렌더링)"""
+    integrator = content_integration.content_integrator
+    page = integrator.static_content.rendered(
+        'roadmap',
+        lambda: render_template('roadmap.html', roadmap=integrator.generate_content_roadmap())
+    )
+    return Response(page, mimetype='text/html')
+
+
+@app.route('/api/roadmap')
+def get_roadmap():
+    """학습 로드맵 API (미리 직렬화된 JSON)"""
+    integrator = content_integration.content_integrator
+    body = integrator.static_content.json_bytes('roadmap.json', integrator.generate_content_roadmap)
+    return Response(body, mimetype='application/json')
+
+
+@app.route('/api/content/consolidated')
+def get_consolidated_content():
+    """통합 콘텐츠 API (미리 직렬화된 JSON)"""
     integrator = content_integration.content_integrator
-    roadmap = integrator.generate_content_roadmap()
-    return render_template('roadmap.html', roadmap=roadmap)
+    body = integrator.static_content.json_bytes('consolidated.json',
+                                                integrator.consolidate_duplicate_content)
+    return Response(body, mimetype='application/json')
 
 
 if __name__ == '__main__':